@@ -1,18 +1,155 @@
-from flask import Flask
-from backend.new_game import GameState
+"""
+JSON API to play isolation against the computer player. The games live in an in-process SessionStore, see
+backend.sessions. The moves of the computer player are searched as jobs on worker processes, see backend.jobs, so a
+request never waits for a search.
 
-app = Flask(__name__)
+    POST   /games                  create a game: {"board": "small" | "medium" | "standard" | "large" | "xlarge" |
+                                   "12x12", "first": "human" | "computer", "player_name": "..."}, or
+                                   {"width": 7, "height": 7, ...}. Boards are at most 16x16
+    GET    /games/<game_id>        the state of a game
+    POST   /games/<game_id>/moves  move of the human player: {"move": [y, x]}
+    POST   /games/<game_id>/ai-move  start the search of the computer move: {"depth": 4, "time_limit_ms": 500},
+                                   returns the job
+    GET    /jobs/<job_id>?wait=5   the job, waits up to wait seconds for the job to finish (long-poll)
+    GET    /jobs/<job_id>/events   server-sent events with the status of the job, until it's finished
+    DELETE /jobs/<job_id>          cancel the job
+    DELETE /games/<game_id>        end a game
+    GET    /stats                  number of games, their estimated memory, the evictions, the pending jobs and the
+                                   ponder hits, see backend.pondering
+"""
+import json
 
+from flask import Flask, Response, jsonify, request
 
-@app.route('/')
-def hello_world():  # put application's code here
-    # new_game = GameState(6, 8, "Frank", "Hugo")
-    new_game = GameState(2, 3, "Computer", "Frank")
-    print_statement = f"This is an isolation game, where {new_game.player_1} plays against {new_game.player_2} " \
+from backend.jobs import JobManager, JobNotFound, QueueFull
+from backend.sessions import SessionStore, GameNotFound, TurnError
 
-    return 'Hello World!' + print_statement
+# A long-poll waits at most this long for a job
+MAX_WAIT_SECONDS = 30
 
 
+def create_app(store=None, jobs=None):
+    """
+    Creates the Flask app
+    Args:
+        store: The SessionStore of the games, a new store if None
+        jobs: The JobManager that searches the computer moves, a new manager that ponders if None
+
+    Returns: The Flask app
+    """
+    app = Flask(__name__)
+    app.config["SESSION_STORE"] = store if store is not None else SessionStore()
+    store = app.config["SESSION_STORE"]
+    app.config["JOB_MANAGER"] = jobs if jobs is not None else JobManager(store, ponder=True)
+    jobs = app.config["JOB_MANAGER"]
+
+    @app.errorhandler(GameNotFound)
+    def game_not_found(error):
+        return jsonify(error="Game not found."), 404
+
+    @app.errorhandler(JobNotFound)
+    def job_not_found(error):
+        return jsonify(error="Job not found."), 404
+
+    @app.errorhandler(QueueFull)
+    def queue_full(error):
+        return jsonify(error=str(error)), 503, {"Retry-After": "1"}
+
+    @app.errorhandler(TurnError)
+    def turn_error(error):
+        return jsonify(error=str(error)), 409
+
+    @app.errorhandler(ValueError)
+    def invalid_request(error):
+        return jsonify(error=str(error)), 400
+
+    @app.route("/")
+    def hello_world():
+        return jsonify(name="isolation", games=len(store))
+
+    @app.post("/games")
+    def create_game():
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            raise ValueError("Invalid request. Must be a JSON object.")
+        if "width" in data or "height" in data:
+            board = (data.get("width"), data.get("height"))
+            if not all(isinstance(value, int) for value in board):
+                raise ValueError("Invalid board. width and height must both be integers.")
+        else:
+            board = data.get("board", "standard")
+            if not isinstance(board, str):
+                raise ValueError("Invalid board. Must be the name of a board or <width>x<height>.")
+        first = data.get("first", "human")
+        if first not in ("human", "computer"):
+            raise ValueError("Invalid first. Must be 'human' or 'computer'.")
+        session = store.create(board, first == "human", str(data.get("player_name", "Human")))
+        return jsonify(session.to_dict()), 201
+
+    @app.get("/games/<game_id>")
+    def get_game(game_id):
+        return jsonify(store.get(game_id).to_dict())
+
+    @app.post("/games/<game_id>/moves")
+    def human_move(game_id):
+        session = store.get(game_id)
+        move = (request.get_json(silent=True) or {}).get("move")
+        if not isinstance(move, list) or len(move) != 2 or not all(isinstance(value, int) for value in move):
+            raise ValueError("Invalid move. Must be [y, x].")
+        session.human_move(move)
+        return jsonify(session.to_dict())
+
+    @app.post("/games/<game_id>/ai-move")
+    def computer_move(game_id):
+        session = store.get(game_id)
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            raise ValueError("Invalid request. Must be a JSON object.")
+        depth = data.get("depth")
+        if depth is not None and (not isinstance(depth, int) or depth < 1):
+            raise ValueError("Invalid depth. Must be an integer of at least 1.")
+        time_limit_ms = data.get("time_limit_ms")
+        if time_limit_ms is not None and not isinstance(time_limit_ms, int):
+            raise ValueError("Invalid time_limit_ms. Must be an integer.")
+        job = jobs.submit(session, depth, time_limit_ms)
+        return jsonify(job.to_dict()), 202, {"Location": f"/jobs/{job.job_id}"}
+
+    @app.get("/jobs/<job_id>")
+    def get_job(job_id):
+        wait = min(float(request.args.get("wait", 0)), MAX_WAIT_SECONDS)
+        job = jobs.wait(job_id, wait) if wait > 0 else jobs.get(job_id)
+        return jsonify(job.to_dict())
+
+    @app.get("/jobs/<job_id>/events")
+    def job_events(job_id):
+        job = jobs.get(job_id)
+
+        def events():
+            # The status is sent every second until the job is finished
+            while not job.done_event.wait(1):
+                yield f"event: status\ndata: {json.dumps(job.to_dict())}\n\n"
+            yield f"event: finished\ndata: {json.dumps(job.to_dict())}\n\n"
+
+        return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    @app.delete("/jobs/<job_id>")
+    def cancel_job(job_id):
+        return jsonify(jobs.cancel(job_id).to_dict())
+
+    @app.delete("/games/<game_id>")
+    def delete_game(game_id):
+        store.delete(game_id)
+        return "", 204
+
+    @app.get("/stats")
+    def stats():
+        return jsonify(dict(store.stats(), pending_jobs=jobs.pending(), pondering=jobs.ponder_stats.to_dict()))
+
+    return app
+
+
+app = create_app()
+
 
 if __name__ == '__main__':
-    app.run()
+    app.run(threaded=True)
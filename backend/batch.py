@@ -0,0 +1,170 @@
+"""
+Vectorized move generation for many boards of the same size at once, for self-play and for evaluating a whole ply of
+children. A BoardBatch holds N boards as NumPy arrays and computes legal moves, mobility and terminal flags of all
+boards with array operations, one step along the eight directions at a time, instead of one board at a time.
+
+This module needs NumPy, the rest of the engine doesn't.
+"""
+import numpy as np
+
+from backend.geometry import DIRECTIONS
+from backend.new_game import GameBoard
+
+
+class BoardBatch:
+    """
+    N isolation boards of the same size.
+    - blocked: bool array (N, height, width), True for blocked cells
+    - positions: int array (N, 2, 2), positions[i, slot] is the [y, x] of player 1 (slot 0) or player 2 (slot 1) on
+      board i, [-1, -1] if the player hasn't been placed yet
+    - active: int array (N,), the slot of the player that has initiative on each board
+    """
+
+    def __init__(self, x_length, y_length, size):
+        """
+        Constructor for the BoardBatch class, creates size empty boards where player 1 has initiative
+        Args:
+            x_length: width of the boards
+            y_length: height of the boards
+            size: number of boards
+        """
+        self.x_length = x_length
+        self.y_length = y_length
+        self.blocked = np.zeros((size, y_length, x_length), dtype=bool)
+        self.positions = np.full((size, 2, 2), -1, dtype=np.int64)
+        self.active = np.zeros(size, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.active)
+
+    @classmethod
+    def from_boards(cls, boards):
+        """
+        Creates a batch from GameBoards of the same size
+        Args:
+            boards: list of GameBoard
+
+        Returns: The BoardBatch
+        """
+        x_length, y_length = boards[0]._board_width, boards[0]._board_height
+        batch = cls(x_length, y_length, len(boards))
+        cells = x_length * y_length
+        for i, board in enumerate(boards):
+            if (board._board_width, board._board_height) != (x_length, y_length):
+                raise ValueError("Invalid boards. All boards of a batch must have the same size.")
+            bits = np.frombuffer(board._board.to_bytes((cells + 7) // 8, "little"), dtype=np.uint8)
+            batch.blocked[i] = np.unpackbits(bits, bitorder="little")[:cells].reshape(y_length, x_length)
+            for slot, player in enumerate((board.player_1, board.player_2)):
+                if board.positions[player]:
+                    batch.positions[i, slot] = board.positions[player]
+            batch.active[i] = 0 if board.active_player == board.player_1 else 1
+        return batch
+
+    def to_board(self, index, player_1, player_2):
+        """
+        Creates a GameBoard of one board of the batch
+        Args:
+            index: The index of the board in the batch
+            player_1: The player for slot 0
+            player_2: The player for slot 1
+
+        Returns: The GameBoard
+        """
+        board = GameBoard(self.x_length, self.y_length, player_1, player_2)
+        for y, x in np.argwhere(self.blocked[index]):
+            board.block_cell([int(y), int(x)])
+        for slot, player in enumerate((player_1, player_2)):
+            if self.positions[index, slot, 0] >= 0:
+                board.positions[player] = [int(self.positions[index, slot, 0]), int(self.positions[index, slot, 1])]
+        board.active_player = player_1 if self.active[index] == 0 else player_2
+        return board
+
+    def legal_move_masks(self, slots=None):
+        """
+        Computes the legal moves on every board. From the position of the player every direction is walked one step at
+        a time for all boards at once; a board drops out of a direction once its ray leaves the board or hits a blocked
+        cell. A player that hasn't been placed yet can move to every open cell.
+        Args:
+            slots: int array (N,) with the slot of the player to compute the moves for on each board, the active
+                player if None
+
+        Returns: bool array (N, height, width), True for the cells the player can move to
+        """
+        size = len(self)
+        if slots is None:
+            slots = self.active
+        index = np.arange(size)
+        position = self.positions[index, slots]
+        y, x = position[:, 0], position[:, 1]
+        placed = y >= 0
+
+        masks = np.zeros_like(self.blocked)
+        # Unplaced players can go to any open cell
+        masks[~placed] = ~self.blocked[~placed]
+
+        for dy, dx in DIRECTIONS:
+            open_ray = placed.copy()
+            for step in range(1, max(self.x_length, self.y_length)):
+                target_y = y + dy * step
+                target_x = x + dx * step
+                open_ray &= (target_y >= 0) & (target_y < self.y_length) & (target_x >= 0) & (target_x < self.x_length)
+                if not open_ray.any():
+                    break
+                # Out of bounds targets are read at [0, 0], they are already excluded by open_ray
+                open_ray &= ~self.blocked[index, np.where(open_ray, target_y, 0), np.where(open_ray, target_x, 0)]
+                masks[index[open_ray], target_y[open_ray], target_x[open_ray]] = True
+
+        return masks
+
+    def mobility(self, slots=None):
+        """
+        Returns: int array (N,) with the number of legal moves of the player on each board, the active player if
+        slots is None
+        """
+        return self.legal_move_masks(slots).sum(axis=(1, 2))
+
+    def terminal(self):
+        """
+        Returns: bool array (N,), True for the boards where the active player can't move anymore
+        """
+        return self.mobility() == 0
+
+    def apply_moves(self, moves, where=None, validate=True):
+        """
+        Makes a move on every board for the active player, and passes the initiative to the other player
+        Args:
+            moves: int array (N, 2) with the [y, x] move for every board
+            where: bool array (N,), only the boards where it is True make their move. All boards if None
+            validate: Check that every move is legal first
+
+        Returns: The batch
+        """
+        moves = np.asarray(moves, dtype=np.int64)
+        index = np.arange(len(self)) if where is None else np.flatnonzero(where)
+        moves = moves[index]
+        if validate:
+            inside = ((moves[:, 0] >= 0) & (moves[:, 0] < self.y_length) &
+                      (moves[:, 1] >= 0) & (moves[:, 1] < self.x_length))
+            if not inside.all() or not self.legal_move_masks()[index, moves[:, 0], moves[:, 1]].all():
+                raise ValueError("Invalid moves. Every move must be a legal move for the active player.")
+
+        self.blocked[index, moves[:, 0], moves[:, 1]] = True
+        self.positions[index, self.active[index]] = moves
+        self.active[index] ^= 1
+        return self
+
+    def random_moves(self, rng):
+        """
+        Picks a random legal move for the active player on every board
+        Args:
+            rng: numpy.random.Generator
+
+        Returns: int array (N, 2) with the moves, [-1, -1] for boards where the active player can't move
+        """
+        masks = self.legal_move_masks().reshape(len(self), -1)
+        # The legal cell with the highest random score is the move
+        scores = np.where(masks, rng.random(masks.shape), -1)
+        cells = scores.argmax(axis=1)
+        moves = np.stack([cells // self.x_length, cells % self.x_length], axis=1)
+        moves[~masks.any(axis=1)] = -1
+        return moves
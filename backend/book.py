@@ -0,0 +1,219 @@
+"""
+Opening book of the ComputerPlayer. The first moves of a game have the most legal moves and cost the most search
+time, but they are the same in every game, so they are searched once, deeply, by an offline builder and written to a
+book file. ComputerPlayer.get_actions answers from the book while the game is in it and searches once the game has left
+the book.
+
+Positions that are mirror images or rotations of each other share one entry: a position is stored under its
+GameBoard.canonical_hash, with the best move in the orientation of the canonical form.
+
+Layout of a book file, all little-endian:
+- header: magic b"ISOB", version, width, height, plies (the book holds the positions after 0 to plies - 1 moves),
+  number of slots, number of entries, and the side key of the Zobrist keys the book was built with
+- slots: an open addressing hash table of (key, cell of the move, depth, score) records. A key is stored in the slot
+  key % number of slots or in one of the slots after it, an empty slot has cell 0xFFFF
+The file is memory-mapped, a lookup reads one or a few records.
+
+Build the books of the medium and standard board, from the root of the repository:
+    python -m backend.book --board medium --board standard [--plies 2] [--depth 7] [--time-limit-ms 5000]
+"""
+import mmap
+import os
+import struct
+import time
+
+from backend.geometry import BOARD_SIZES
+from backend.new_game import GameBoard, ComputerPlayer, zobrist_keys
+
+MAGIC = b"ISOB"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBIIQ")
+RECORD = struct.Struct("<QHBf")
+EMPTY_CELL = 0xFFFF
+
+# The books that come with the engine
+BOOK_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "books")
+
+# Opened books per board size, None if there is no book for the size
+_BOOKS = {}
+
+
+class OpeningBook:
+    """
+    A memory-mapped book file
+    """
+
+    def __init__(self, path):
+        """
+        Opens a book file
+        Args:
+            path: The path of the book file
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.x_length, self.y_length, self.plies, self.slots, self.entries, side_key = \
+            HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Invalid book {path}. Not a version {VERSION} opening book.")
+        if side_key != zobrist_keys(self.x_length, self.y_length)[2]:
+            self.close()
+            raise ValueError(f"Invalid book {path}. It was built with other Zobrist keys.")
+
+    def __len__(self):
+        return self.entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Unmaps the book file
+        """
+        self._map.close()
+
+    def lookup(self, state):
+        """
+        Looks up the best move of the active player
+        Args:
+            state: The GameBoard
+
+        Returns: (move, depth of the search, score of the move) or None if the position isn't in the book
+        """
+        if (state._board_width, state._board_height) != (self.x_length, self.y_length):
+            return None
+        # Every move blocks a cell, positions after plies moves aren't in the book
+        if state._board.bit_count() >= self.plies:
+            return None
+
+        key, symmetry = state.canonical_hash()
+        slot = key % self.slots
+        while True:
+            record_key, cell, depth, score = RECORD.unpack_from(self._map, HEADER.size + slot * RECORD.size)
+            if cell == EMPTY_CELL:
+                return None
+            if record_key == key:
+                break
+            slot = (slot + 1) % self.slots
+
+        # The move is stored for the canonical form of the position
+        move = state.from_canonical_move(list(divmod(cell, self.x_length)), symmetry)
+        if move not in state.get_player_moves():
+            return None
+        return move, depth, score
+
+
+def write_book(path, x_length, y_length, plies, entries):
+    """
+    Writes a book file
+    Args:
+        path: The path of the book file
+        x_length: width of the board
+        y_length: height of the board
+        plies: The book holds the positions after 0 to plies - 1 moves
+        entries: Dictionary from canonical hash to (cell of the move in the canonical form, depth, score)
+    """
+    # At most half of the slots are used, so a lookup finds an empty slot soon
+    slots = 1
+    while slots < 2 * len(entries):
+        slots *= 2
+
+    table = [None] * slots
+    for key, entry in entries.items():
+        slot = key % slots
+        while table[slot] is not None:
+            slot = (slot + 1) % slots
+        table[slot] = (key,) + entry
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, x_length, y_length, plies, slots, len(entries),
+                               zobrist_keys(x_length, y_length)[2]))
+        for record in table:
+            file.write(RECORD.pack(*record) if record is not None else RECORD.pack(0, EMPTY_CELL, 0, 0.0))
+
+
+def build_book(x_length, y_length, plies, depth=None, time_limit_ms=None, progress=None):
+    """
+    Searches every position after 0 to plies - 1 moves, starting with either player, once per set of symmetric
+    positions
+    Args:
+        x_length: width of the board
+        y_length: height of the board
+        plies: The number of moves the book covers
+        depth: The depth of the searches, no limit if None
+        time_limit_ms: The time budget of every search, no limit if None
+        progress: Function called with (ply, number of positions of the ply) before the positions of a ply are searched
+
+    Returns: The entries for write_book
+    """
+    player_1, player_2 = ComputerPlayer("Player 1"), ComputerPlayer("Player 2")
+    entries = {}
+    positions = []
+    for first_player in (player_1, player_2):
+        state = GameBoard(x_length, y_length, player_1, player_2)
+        state.active_player = first_player
+        positions.append(state)
+
+    for ply in range(plies):
+        if progress is not None:
+            progress(ply, len(positions))
+        next_positions = {}
+        for state in positions:
+            key, symmetry = state.canonical_hash()
+            if key in entries or state.terminal_test():
+                continue
+            player = state.active_player
+            move = player.get_actions(state, depth, time_limit_ms)
+            canonical_move = state.to_canonical_move(move, symmetry)
+            entries[key] = (canonical_move[0] * x_length + canonical_move[1], player.depth_reached, player.best_score)
+
+            if ply + 1 < plies:
+                for child_move in state.get_player_moves():
+                    child = state.clone().make_move(child_move)
+                    next_positions.setdefault(child.canonical_hash()[0], child)
+        positions = list(next_positions.values())
+    return entries
+
+
+def find_book(x_length, y_length):
+    """
+    The book of a board size in BOOK_DIRECTORY, opened once per process
+    Returns: The OpeningBook, or None if there is no book for the size
+    """
+    key = (x_length, y_length)
+    if key not in _BOOKS:
+        path = os.path.join(BOOK_DIRECTORY, f"{x_length}x{y_length}.book")
+        _BOOKS[key] = OpeningBook(path) if os.path.exists(path) else None
+    return _BOOKS[key]
+
+
+def main():
+    # Only the command line needs argparse, the searches that read the books don't load it
+    import argparse
+    parser = argparse.ArgumentParser(description="Builds the opening books of the engine")
+    parser.add_argument("--board", choices=list(BOARD_SIZES), action="append", help="the boards to build a book for")
+    parser.add_argument("--plies", type=int, default=2, help="the number of moves the book covers")
+    parser.add_argument("--depth", type=int, default=7, help="the depth of every search")
+    parser.add_argument("--time-limit-ms", type=int, default=5000, help="the time budget of every search")
+    parser.add_argument("--output-dir", default=BOOK_DIRECTORY)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for board in args.board or ["medium", "standard"]:
+        x_length, y_length = BOARD_SIZES[board]
+        start = time.perf_counter()
+        entries = build_book(x_length, y_length, args.plies, args.depth, args.time_limit_ms,
+                             lambda ply, count: print(f"{board}: ply {ply}, {count} positions"))
+        path = os.path.join(args.output_dir, f"{x_length}x{y_length}.book")
+        write_book(path, x_length, y_length, args.plies, entries)
+        print(f"{board}: {len(entries)} positions in {time.perf_counter() - start:.1f}s, "
+              f"{os.path.getsize(path)} bytes written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Checkpoints of games and long searches. A deep analysis can search one position for minutes, and a restart of the
+process would lose the work. A checkpoint file holds a position, the players of its game and the search state of a
+ComputerPlayer: the transposition table, the depth iterative deepening reached and the best move and score so far.
+A restarted process opens the checkpoint and goes on with the game, and a search of the position answers every depth
+up to the depth reached from the table.
+
+Layout of a checkpoint file, all little-endian:
+- header: magic b"ISOC", version, the slot of the player of the search state (0xFF without one), the computer players
+  as bits (bit 0 for player 1, bit 1 for player 2), the depth reached, the cell of the best move (0xFFFF without a
+  move), the best score, the size and generation of the table, the number of entries and of slots, and the side key
+  of the Zobrist keys of the board
+- the position as GameBoard.to_bytes and the UTF-8 names of both players, each preceded by its length
+- what the move ordering of the player learned, see MoveOrdering.export_state: the number of values and the values
+- slots: an open addressing hash table of (key, depth, value, flag, cell of the best move, generation) records, as in
+  the opening books. The entry of table slot i is stored in slot i % number of slots or one of the slots after it, an
+  empty slot has flag 0xFF
+The file is memory-mapped: a table that starts from a checkpoint reads a record when the search needs its slot, so
+opening a checkpoint doesn't depend on the size of the table.
+
+A checkpoint is written to a temporary file that then replaces the old checkpoint, so a crash while writing keeps the
+last complete checkpoint. CheckpointingPlayer writes checkpoints while it searches.
+"""
+import math
+import mmap
+import os
+import struct
+import time
+
+from backend.endgame import EndgameSolver
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer, zobrist_keys
+from backend.transposition import TranspositionTable, TTEntry
+
+MAGIC = b"ISOC"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBHHdIIIIQ")
+LENGTH = struct.Struct("<H")
+COUNT = struct.Struct("<I")
+RECORD = struct.Struct("<QfdBHI")
+NO_SLOT = 0xFF
+NO_MOVE = 0xFFFF
+EMPTY_FLAG = 0xFF
+
+
+def _cell(move, x_length):
+    return NO_MOVE if move is None else move[0] * x_length + move[1]
+
+
+def _move(cell, x_length):
+    return None if cell == NO_MOVE else list(divmod(cell, x_length))
+
+
+def write_checkpoint(path, state, player=None):
+    """
+    Writes a checkpoint file
+    Args:
+        path: The path of the checkpoint file
+        state: The GameBoard, the position before the search of the player
+        player: The ComputerPlayer whose search state is written, one of the players of the board, or None
+    """
+    x_length = state._board_width
+    slot = NO_SLOT if player is None else state.get_slot(player)
+    computers = sum(1 << index for index, board_player in enumerate((state.player_1, state.player_2))
+                    if isinstance(board_player, ComputerPlayer))
+
+    table = None if player is None else player.transposition_table
+    entries = [] if table is None else list(table.entries())
+    # At most half of the slots are used, so a lookup finds an empty slot soon
+    slots = 1
+    while slots < 2 * len(entries):
+        slots *= 2
+    records = [None] * slots
+    for entry in entries:
+        index = entry.key % table.size % slots
+        while records[index] is not None:
+            index = (index + 1) % slots
+        records[index] = RECORD.pack(entry.key, entry.depth, entry.value, entry.flag, _cell(entry.best_move, x_length),
+                                     entry.generation)
+
+    best_move = None
+    depth_reached = 0
+    best_score = math.nan
+    ordering = []
+    if player is not None:
+        ordering = player.move_ordering.export_state()
+        best_move = player.principal_variation[0] if player.principal_variation else None
+        depth_reached = player.depth_reached
+        best_score = math.nan if player.best_score is None else player.best_score
+    board_bytes = state.to_bytes()
+    names = [getattr(board_player, "player_name", str(board_player)).encode()
+             for board_player in (state.player_1, state.player_2)]
+    empty = RECORD.pack(0, 0, 0, EMPTY_FLAG, NO_MOVE, 0)
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, slot, computers, depth_reached, _cell(best_move, x_length),
+                               best_score, 0 if table is None else table.size, 0 if table is None else table.generation,
+                               len(entries), slots, zobrist_keys(x_length, state._board_height)[2]))
+        for part in [board_bytes] + names:
+            file.write(LENGTH.pack(len(part)) + part)
+        file.write(COUNT.pack(len(ordering)) + struct.pack(f"<{len(ordering)}q", *ordering))
+        file.write(b"".join(empty if record is None else record for record in records))
+    os.replace(temporary_path, path)
+
+
+class CheckpointTable:
+    """
+    The read-only slots of the transposition table of a checkpoint, the base of a TranspositionTable
+    """
+
+    def __init__(self, checkpoint):
+        self._map = checkpoint._map
+        self._offset = checkpoint._records_offset
+        self._size = checkpoint.table_size
+        self._slots = checkpoint.slots
+        self._entries = checkpoint.entries
+        self._x_length = checkpoint.x_length
+
+    def __len__(self):
+        return self._entries
+
+    def _entry(self, record):
+        key, depth, value, flag, cell, generation = record
+        # Depths of searches without a depth limit are stored as infinity, the others are whole numbers
+        return TTEntry(key, depth if math.isinf(depth) else int(depth), value, flag, _move(cell, self._x_length),
+                       generation)
+
+    def get(self, index):
+        """
+        Returns: The TTEntry of a slot of the table, or None if the slot was empty
+        """
+        slot = index % self._slots
+        while True:
+            record = RECORD.unpack_from(self._map, self._offset + slot * RECORD.size)
+            if record[3] == EMPTY_FLAG:
+                return None
+            if record[0] % self._size == index:
+                return self._entry(record)
+            slot = (slot + 1) % self._slots
+
+    def items(self):
+        """
+        Returns: Iterator over the (index, TTEntry) of every used slot of the table
+        """
+        for record in RECORD.iter_unpack(self._map[self._offset:self._offset + self._slots * RECORD.size]):
+            if record[3] != EMPTY_FLAG:
+                yield record[0] % self._size, self._entry(record)
+
+
+class Checkpoint:
+    """
+    A memory-mapped checkpoint file. The tables of the checkpoint read the file, it's closed when the checkpoint and
+    its tables are no longer used, or by close.
+    """
+
+    def __init__(self, path):
+        """
+        Opens a checkpoint file
+        Args:
+            path: The path of the checkpoint file
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.slot, self.computers, self.depth_reached, best_cell, best_score, self.table_size,
+         self.generation, self.entries, self.slots, side_key) = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Invalid checkpoint {path}. Not a version {VERSION} checkpoint.")
+
+        offset = HEADER.size
+        parts = []
+        for _ in range(3):
+            length, = LENGTH.unpack_from(self._map, offset)
+            offset += LENGTH.size
+            parts.append(self._map[offset:offset + length])
+            offset += length
+        self.board_bytes = parts[0]
+        self.names = [part.decode() for part in parts[1:]]
+        count, = COUNT.unpack_from(self._map, offset)
+        self.ordering = list(struct.unpack_from(f"<{count}q", self._map, offset + COUNT.size))
+        self._records_offset = offset + COUNT.size + 8 * count
+        self.x_length, self.y_length = self.board_bytes[0], self.board_bytes[1]
+        if side_key != zobrist_keys(self.x_length, self.y_length)[2]:
+            self.close()
+            raise ValueError(f"Invalid checkpoint {path}. It was written with other Zobrist keys.")
+        self.best_move = _move(best_cell, self.x_length)
+        self.best_score = None if math.isnan(best_score) else best_score
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Unmaps the checkpoint file, the tables of the checkpoint can't be used anymore
+        """
+        self._map.close()
+
+    def transposition_table(self):
+        """
+        Returns: A TranspositionTable that starts from the entries of the checkpoint, None if it has no table
+        """
+        if not self.table_size:
+            return None
+        table = TranspositionTable(self.table_size, base=CheckpointTable(self))
+        table.generation = self.generation
+        return table
+
+    def restore(self, player):
+        """
+        Gives a ComputerPlayer the search state of the checkpoint: the table, what its move ordering learned, the
+        depth reached, the best move and score
+        """
+        table = self.transposition_table()
+        if table is not None:
+            player.transposition_table = table
+        player.move_ordering.import_state(self.ordering)
+        player.depth_reached = self.depth_reached
+        player.best_score = self.best_score
+        player.principal_variation = [] if self.best_move is None else [self.best_move]
+
+    def board(self, player_1=None, player_2=None):
+        """
+        Builds the board of the checkpoint. Players that aren't given are created with their names: a ComputerPlayer
+        with an endgame solver or a HumanPlayer. The player of the search state gets it, see restore
+        Returns: The GameBoard
+        """
+        players = [player_1, player_2]
+        for index, name in enumerate(self.names):
+            if players[index] is None:
+                if self.computers >> index & 1:
+                    players[index] = ComputerPlayer(name, endgame_solver=EndgameSolver())
+                else:
+                    players[index] = HumanPlayer(name)
+        if self.slot != NO_SLOT and isinstance(players[self.slot], ComputerPlayer):
+            self.restore(players[self.slot])
+        return GameBoard.from_bytes(self.board_bytes, *players)
+
+
+class CheckpointingPlayer(ComputerPlayer):
+    """
+    A ComputerPlayer that writes a checkpoint of its search every interval seconds while it searches, and after every
+    search. The checkpoint holds the position of the search, so a restarted process can go on with the search, see
+    Checkpoint.board.
+    """
+
+    def __init__(self, player_name, path, interval=30.0, **kwargs):
+        """
+        Constructor for the CheckpointingPlayer class
+        Args:
+            player_name: Name of the player
+            path: The path of the checkpoint file
+            interval: Seconds between the checkpoints of a search. Writing a checkpoint takes about a second per
+                million table entries
+            kwargs: The arguments of ComputerPlayer
+        """
+        super().__init__(player_name, **kwargs)
+        self.path = path
+        self.interval = interval
+        self.checkpoints = 0
+        # The position of the running search, the board of the search has the moves of the search on it
+        self._root = None
+        self._saved_at = 0.0
+
+    def get_actions(self, state, min_depth=None, time_limit_ms=None):
+        self._root = state.clone()
+        self._saved_at = time.perf_counter()
+        try:
+            return super().get_actions(state, min_depth, time_limit_ms)
+        finally:
+            # Also when the search is interrupted, like by a KeyboardInterrupt
+            self.save()
+            self._root = None
+
+    def count_node(self):
+        super().count_node()
+        if not self.nodes_searched & 1023 and self._root is not None \
+                and time.perf_counter() - self._saved_at >= self.interval:
+            self.save()
+
+    def save(self):
+        """
+        Writes a checkpoint of the running search
+        """
+        if self._root is not None:
+            write_checkpoint(self.path, self._root, self)
+            self._saved_at = time.perf_counter()
+            self.checkpoints += 1
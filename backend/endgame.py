@@ -0,0 +1,186 @@
+"""
+Exact endgame solver of the ComputerPlayer. Late in a game the blocked cells often split the open cells into a region
+for each player. From then on the players can't block each other anymore, every player walks the longest path of
+queen moves in its own region, and the player that can make the most moves wins. The active player needs strictly more
+moves than the opponent: with an equal number of moves it runs out of moves first.
+
+A position is partitioned when the open cells that can be reached from the players don't overlap. Queen moves only
+pass open cells, so the cells a player can reach are the open cells connected to the player by steps to neighbouring
+cells, which a flood fill over the bitboard finds with a few shifts per step.
+
+The longest path of a region is searched with its own memo: a path only depends on the cell of the player and the
+open cells of the region, not on the moves that led there.
+"""
+
+from backend.geometry import get_geometry
+
+
+def flood_masks(x_length, y_length):
+    """
+    The masks that keep a shift of the bitboard on the board, see BoardGeometry
+    Args:
+        x_length: width of the board
+        y_length: height of the board
+
+    Returns: (full mask, mask without the first column, mask without the last column)
+    """
+    return get_geometry(x_length, y_length).flood_masks
+
+
+def reachable_cells(cell, open_cells, x_length, y_length):
+    """
+    Flood fill of the open cells that are connected to a cell by steps to neighbouring cells, diagonal steps included
+    Args:
+        cell: The cell index to start from, the cell itself doesn't have to be open
+        open_cells: Mask of the open cells
+        x_length: width of the board
+        y_length: height of the board
+
+    Returns: Mask of the reachable open cells
+    """
+    full, without_first_column, without_last_column = flood_masks(x_length, y_length)
+    region = 0
+    frontier = 1 << cell
+    while True:
+        # A step to the right can't end in the first column, a step to the left can't end in the last column
+        row = frontier | (frontier << 1 & without_first_column) | (frontier >> 1 & without_last_column)
+        grown = (region | row | row << x_length | row >> x_length) & full & open_cells
+        if grown == region:
+            return region
+        region = grown
+        frontier = grown
+
+
+def moves_mask(rays, ascending, cell, open_cells):
+    """
+    The queen moves from a cell that only pass open cells, see GameBoard.cell_moves_mask
+    """
+    mask = 0
+    for direction_rays, direction_ascending in zip(rays, ascending):
+        ray = direction_rays[cell]
+        blockers = ray & ~open_cells
+        if blockers:
+            if direction_ascending:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            ray &= ~(direction_rays[blocker] | (1 << blocker))
+        mask |= ray
+    return mask
+
+
+class EndgameSolver:
+    """
+    Solves partitioned positions exactly. One solver can be shared by the searches of a player, its memo of longest
+    paths carries over from move to move.
+    """
+
+    def __init__(self, max_open_cells=32, max_region_cells=20, max_entries=1 << 16):
+        """
+        Constructor for the EndgameSolver class
+        Args:
+            max_open_cells: Positions with more open cells aren't checked for a partition. The flood fill runs at every
+                node of the search, early positions are almost never partitioned
+            max_region_cells: Regions with more open cells aren't solved, their longest path can take too long
+            max_entries: The memo of longest paths is cleared when it holds this many paths
+        """
+        self.max_open_cells = max_open_cells
+        self.max_region_cells = max_region_cells
+        self.max_entries = max_entries
+        self._paths = {}
+        # Statistics: the positions that were solved
+        self.solved = 0
+
+    def __len__(self):
+        return len(self._paths)
+
+    def clear(self):
+        """
+        Forgets the longest paths
+        """
+        self._paths.clear()
+
+    def regions(self, state):
+        """
+        The open cells each player can reach, if the position is partitioned
+        Args:
+            state: The GameBoard
+
+        Returns: (region of the active player, region of the opponent) as masks, or None if the players can still
+        reach a common cell or a player hasn't been placed yet
+        """
+        open_cells = state._full_mask & ~state._board
+        if open_cells.bit_count() > self.max_open_cells:
+            return None
+        active_cell, opponent_cell = state._cells[state._active], state._cells[state._active ^ 1]
+        if active_cell < 0 or opponent_cell < 0:
+            return None
+
+        active_region = reachable_cells(active_cell, open_cells, state._board_width, state._board_height)
+        opponent_region = reachable_cells(opponent_cell, open_cells, state._board_width, state._board_height)
+        if active_region & opponent_region:
+            return None
+        return active_region, opponent_region
+
+    def longest_path(self, state, cell, region):
+        """
+        The most moves a player can make from a cell without leaving a region
+        Args:
+            state: The GameBoard, for the rays of its size
+            cell: The cell index of the player
+            region: Mask of the open cells the player can move through, all reachable from the cell
+
+        Returns: The number of moves
+        """
+        if len(self._paths) >= self.max_entries:
+            self._paths.clear()
+        return self._longest_path(state._rays, state._ascending, state._board_width, state._board_height, cell, region)
+
+    def _longest_path(self, rays, ascending, x_length, y_length, cell, region):
+        key = (x_length, cell, region)
+        length = self._paths.get(key)
+        if length is not None:
+            return length
+
+        # No path is longer than the number of reachable cells, a path that long ends the search
+        bound = region.bit_count()
+        length = 0
+        moves = moves_mask(rays, ascending, cell, region)
+        while moves and length < bound:
+            lowest = moves & -moves
+            moves ^= lowest
+            target = lowest.bit_length() - 1
+            # A move can cut the region in parts, only the part of the target is left to walk
+            rest = reachable_cells(target, region ^ lowest, x_length, y_length)
+            if rest.bit_count() >= length:
+                length = max(length, 1 + self._longest_path(rays, ascending, x_length, y_length, target, rest))
+
+        self._paths[key] = length
+        return length
+
+    def solve(self, state, player):
+        """
+        Solves a partitioned position
+        Args:
+            state: The GameBoard
+            player: The player the result is for
+
+        Returns: inf if the player wins, -inf if the player loses, None if the position isn't partitioned or a region
+        is too large to solve
+        """
+        regions = self.regions(state)
+        if regions is None:
+            return None
+        active_region, opponent_region = regions
+        if active_region.bit_count() > self.max_region_cells or opponent_region.bit_count() > self.max_region_cells:
+            return None
+
+        opponent_moves = self.longest_path(state, state._cells[state._active ^ 1], opponent_region)
+        # The active player can't make more moves than it has open cells
+        if active_region.bit_count() <= opponent_moves:
+            active_wins = False
+        else:
+            active_wins = self.longest_path(state, state._cells[state._active], active_region) > opponent_moves
+
+        self.solved += 1
+        return float("inf") if active_wins == (state.active_player == player) else float("-inf")
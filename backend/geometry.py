@@ -0,0 +1,176 @@
+"""
+The geometry of a board size: every table that only depends on the width and height of the board. A BoardGeometry is
+built once per (width, height) by get_geometry and shared by all boards of that size, so the cost of building the
+tables doesn't depend on the number of boards, and move generation and evaluation only read tables.
+
+A cell is stored as the bit y * width + x of an integer, the tables are indexed by that cell index. The tables grow
+with the square of the number of cells at most, on the largest board of 16x16 they are built in well under a second.
+"""
+import random
+
+# The directions in which a player can move, as [y, x] steps. The order is the order in which get_legal_moves
+# reports the moves, so the search expands children in the same order as the original cell-by-cell walk.
+DIRECTIONS = [[1, -1], [-1, 1],  # Diagonal left top  -> right bottom
+              [1, 1], [-1, -1],  # Diagonal left bottom -> right top
+              [0, 1], [0, -1],  # Horizontal
+              [1, 0], [-1, 0]]  # Vertical
+
+BOARD_SIZES = {"small": (2, 3), "medium": (5, 5), "standard": (8, 6), "large": (10, 10), "xlarge": (16, 16)}
+
+# Largest width and height of a board
+MAX_BOARD_SIZE = 16
+
+# Geometries are built once per board size
+_GEOMETRIES = {}
+
+
+def board_size(board):
+    """
+    Checks the size of a board
+    Args:
+        board: A name of BOARD_SIZES, (x_length, y_length) or "<x_length>x<y_length>" like "12x12"
+
+    Returns: (x_length, y_length)
+    """
+    if isinstance(board, str):
+        if board in BOARD_SIZES:
+            return BOARD_SIZES[board]
+        x_length, _, y_length = board.lower().partition("x")
+        if not (x_length.strip().isdigit() and y_length.strip().isdigit()):
+            raise ValueError(f"Invalid board. Must be one of {', '.join(BOARD_SIZES)} or <width>x<height>.")
+        board = int(x_length), int(y_length)
+    x_length, y_length = board
+    if not (1 <= x_length <= MAX_BOARD_SIZE and 1 <= y_length <= MAX_BOARD_SIZE):
+        raise ValueError(f"Invalid board. The width and height must be between 1 and {MAX_BOARD_SIZE}.")
+    return x_length, y_length
+
+
+def get_geometry(x_length, y_length):
+    """
+    Returns: The BoardGeometry of a board size, built on the first call for the size
+    """
+    key = (x_length, y_length)
+    geometry = _GEOMETRIES.get(key)
+    if geometry is None:
+        geometry = _GEOMETRIES[key] = BoardGeometry(x_length, y_length)
+    return geometry
+
+
+class BoardGeometry:
+    """
+    The precomputed tables of a board size, use get_geometry instead of the constructor:
+    - coordinates: the [y, x] of every cell index, as tuples
+    - rays, ascending: the queen rays of every direction and cell, see GameBoard.cell_moves_mask
+    - shadows: what blocking a cell takes away from the moves of a player on another cell
+    - line_masks: the cells on the row, column and diagonals of every cell
+    - zobrist: the random keys of the position hash
+    - symmetries: the mirrors and rotations of the board as permutations of the cells
+    - center_distances: the squared distance of every cell to the center of the board
+    - flood_masks: the masks that keep the shifts of a flood fill on the board
+    """
+
+    __slots__ = ("width", "height", "cells", "full_mask", "coordinates", "rays", "ascending", "shadows", "line_masks",
+                 "zobrist", "symmetries", "center_distances", "flood_masks")
+
+    def __init__(self, x_length, y_length):
+        """
+        Constructor for the BoardGeometry class
+        Args:
+            x_length: width of the board
+            y_length: height of the board
+        """
+        self.width = x_length
+        self.height = y_length
+        self.cells = x_length * y_length
+        self.full_mask = (1 << self.cells) - 1
+        self.coordinates = tuple((y, x) for y in range(y_length) for x in range(x_length))
+        self.rays, self.ascending = self._build_rays()
+        self.shadows = self._build_shadows()
+        self.line_masks = self._build_line_masks()
+        self.zobrist = self._build_zobrist()
+        self.symmetries = self._build_symmetries()
+        self.center_distances = tuple((2 * y - (y_length - 1)) ** 2 + (2 * x - (x_length - 1)) ** 2
+                                      for y, x in self.coordinates)
+        first_column = sum(1 << (y * x_length) for y in range(y_length))
+        self.flood_masks = (self.full_mask, self.full_mask & ~first_column,
+                            self.full_mask & ~(first_column << (x_length - 1)))
+
+    def _build_rays(self):
+        # For every direction and every cell the ray is the mask of all cells from that cell (exclusive) up to the
+        # edge of the board. ascending[direction] tells if the cell indices along the ray go up or down
+        rays = []
+        ascending = []
+        for dy, dx in DIRECTIONS:
+            # A step to the next row or to the right always increases the cell index
+            ascending.append(dy > 0 or (dy == 0 and dx > 0))
+            direction_rays = []
+            for y, x in self.coordinates:
+                mask = 0
+                ny, nx = y + dy, x + dx
+                while 0 <= ny < self.height and 0 <= nx < self.width:
+                    mask |= 1 << (ny * self.width + nx)
+                    ny, nx = ny + dy, nx + dx
+                direction_rays.append(mask)
+            rays.append(tuple(direction_rays))
+        return tuple(rays), tuple(ascending)
+
+    def _build_shadows(self):
+        # shadows[source][target] is the mask of the target and the cells behind it seen from the source, 0 if the
+        # cells aren't on one line. When the target is blocked, a player on the source can't move to it nor past it
+        shadows = [[0] * self.cells for _ in range(self.cells)]
+        for direction_rays in self.rays:
+            for source in range(self.cells):
+                ray = direction_rays[source]
+                while ray:
+                    lowest = ray & -ray
+                    target = lowest.bit_length() - 1
+                    shadows[source][target] = lowest | direction_rays[target]
+                    ray ^= lowest
+        return tuple(tuple(row) for row in shadows)
+
+    def _build_line_masks(self):
+        # The cells a player on the cell could reach on an empty board
+        masks = []
+        for cell in range(self.cells):
+            mask = 0
+            for direction_rays in self.rays:
+                mask |= direction_rays[cell]
+            masks.append(mask)
+        return tuple(masks)
+
+    def _build_zobrist(self):
+        # The keys are drawn from a seed of the board size, so a position has the same hash in every process and the
+        # opening books stay valid. Returns (cell_keys, position_keys, side_key), position_keys[0] belongs to player 1
+        rng = random.Random(self.width * 1000 + self.height)
+        cell_keys = tuple(rng.getrandbits(64) for _ in range(self.cells))
+        position_keys = (tuple(rng.getrandbits(64) for _ in range(self.cells)),
+                         tuple(rng.getrandbits(64) for _ in range(self.cells)))
+        side_key = rng.getrandbits(64)
+        return cell_keys, position_keys, side_key
+
+    def _build_symmetries(self):
+        # Every board can be mirrored left-right and top-bottom and rotated by 180 degrees. A square board can also be
+        # rotated by 90 degrees and mirrored along its diagonals. Returns (permutation, inverse) pairs, the identity
+        # first
+        last_x, last_y = self.width - 1, self.height - 1
+        transforms = [lambda y, x: (y, x),
+                      lambda y, x: (y, last_x - x),
+                      lambda y, x: (last_y - y, x),
+                      lambda y, x: (last_y - y, last_x - x)]
+        if self.width == self.height:
+            transforms += [lambda y, x: (x, y),
+                           lambda y, x: (last_x - x, last_y - y),
+                           lambda y, x: (x, last_y - y),
+                           lambda y, x: (last_x - x, y)]
+
+        tables = []
+        for transform in transforms:
+            permutation = [0] * self.cells
+            for cell, (y, x) in enumerate(self.coordinates):
+                new_y, new_x = transform(y, x)
+                permutation[cell] = new_y * self.width + new_x
+            inverse = [0] * self.cells
+            for cell, new_cell in enumerate(permutation):
+                inverse[new_cell] = cell
+            tables.append((tuple(permutation), tuple(inverse)))
+        return tuple(tables)
@@ -0,0 +1,145 @@
+"""
+Evaluation functions for the depth limited searches of the ComputerPlayer. When a search reaches its depth limit
+before the game is over, the evaluation function estimates how good the position is for the player that searches.
+Higher is better for that player.
+
+The evaluation runs at every leaf of the search tree, so the heuristics only count bits of the move masks of the board
+and read precomputed tables. No move lists are built.
+"""
+
+from backend.geometry import get_geometry
+
+
+def center_distances(x_length, y_length):
+    """
+    The squared distance of every cell to the center of the board, see BoardGeometry. The distance is doubled on both
+    axes so boards with an even width or height have whole numbers as well.
+    Args:
+        x_length: width of the board
+        y_length: height of the board
+
+    Returns: tuple with the squared distance for every cell index y * x_length + x
+    """
+    return get_geometry(x_length, y_length).center_distances
+
+
+class Heuristic:
+    """ Base class of the evaluation functions """
+
+    name = "heuristic"
+
+    def score(self, state, player):
+        """
+        Estimates the value of a position that isn't over yet
+        Args:
+            state: The GameBoard to evaluate
+            player: The player the score is for
+
+        Returns: The estimated value of the position for player
+        """
+        raise NotImplementedError
+
+    def __str__(self):
+        return self.name
+
+
+class OwnMoves(Heuristic):
+    """ The number of moves the player has. A player with more moves is less likely to get isolated """
+
+    name = "own_moves"
+
+    def score(self, state, player):
+        return state.mobility(player)
+
+
+class WeightedMoves(Heuristic):
+    """
+    The moves of the player minus the moves of the opponent, each with a weight. With equal weights the player
+    values taking moves away from the opponent as much as keeping its own moves.
+    """
+
+    name = "weighted_moves"
+
+    def __init__(self, own_weight=1, opponent_weight=1):
+        """
+        Constructor for the WeightedMoves class
+        Args:
+            own_weight: Weight of the number of moves of the player
+            opponent_weight: Weight of the number of moves of the opponent
+        """
+        self.own_weight = own_weight
+        self.opponent_weight = opponent_weight
+
+    def score(self, state, player):
+        own_moves = state.mobility(player)
+        opponent_moves = state.mobility(state.get_opponent(player))
+        return self.own_weight * own_moves - self.opponent_weight * opponent_moves
+
+
+class OwnMinusOpponentMoves(WeightedMoves):
+    """ The moves of the player minus the moves of the opponent """
+
+    name = "own_minus_opponent_moves"
+
+    def __init__(self):
+        super().__init__(1, 1)
+
+
+class AggressiveMoves(WeightedMoves):
+    """ Taking away a move of the opponent counts twice as much as keeping a move of the player """
+
+    name = "aggressive"
+
+    def __init__(self):
+        super().__init__(1, 2)
+
+
+class DefensiveMoves(WeightedMoves):
+    """ Keeping a move of the player counts twice as much as taking away a move of the opponent """
+
+    name = "defensive"
+
+    def __init__(self):
+        super().__init__(2, 1)
+
+
+class CenterDistance(Heuristic):
+    """
+    How close the player is to the center compared to the opponent. From the center a player reaches most cells, at
+    the edges and in the corners the player is easily cut off.
+    """
+
+    name = "center_distance"
+
+    def score(self, state, player):
+        distances = state._geometry.center_distances
+        own_cell = state.get_cell(player)
+        opponent_cell = state.get_cell(state.get_opponent(player))
+        value = 0
+        if own_cell >= 0:
+            value -= distances[own_cell]
+        if opponent_cell >= 0:
+            value += distances[opponent_cell]
+        return value
+
+
+HEURISTICS = {
+    "own_moves": OwnMoves,
+    "own_minus_opponent_moves": OwnMinusOpponentMoves,
+    "aggressive": AggressiveMoves,
+    "defensive": DefensiveMoves,
+    "center_distance": CenterDistance,
+}
+
+
+def get_heuristic(name):
+    """
+    Creates an evaluation function by its name
+    Args:
+        name: One of the names in HEURISTICS
+
+    Returns: The evaluation function
+    """
+    if name not in HEURISTICS:
+        raise ValueError(f"Invalid heuristic. Must be one of {', '.join(HEURISTICS)}.")
+    return HEURISTICS[name]()
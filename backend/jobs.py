@@ -0,0 +1,450 @@
+"""
+Asynchronous moves of the computer player for the web API. A request for a computer move submits a job and returns
+its id at once. The search runs in a pool of worker processes, so the threads of the web server never wait for a search
+and the searches don't hold the interpreter lock of the server. When the search is done, the move is made on the
+GameBoard of the session and the job is done. Clients poll the job, or wait for it with JobManager.wait.
+
+As in backend.parallel the workers receive the position as GameBoard.to_bytes and keep their own transposition
+tables and endgame solvers between jobs, one for each slot the computer player can have. The first moves are answered
+from the opening books, see backend.book.
+
+Jobs have a time budget, and are limited in number: when max_queue jobs are queued or running, new jobs are refused
+with QueueFull. A queued job is cancelled before it starts, a running job is stopped by a shared cancel flag that the
+search checks every 1024 nodes.
+
+With ponder=True the workers search on the time of the human player, see backend.pondering: after a computer move a
+ponder job searches the position after the reply the search predicted, without a time budget. When the human plays
+that reply, the next computer move takes over the ponder job: the job gets the time budget of the move through a
+shared deadline and is done when it runs out, with all the time it pondered on top. Any other move cancels the ponder
+job. Ponder jobs give way to the computer moves of other games, and stop after max_ponder_ms.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from backend.book import find_book
+from backend.endgame import EndgameSolver
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer, SearchTimeout
+from backend.pondering import PonderStats
+from backend.sessions import TurnError
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+# State of a worker process, set by _init_worker
+_cancel_flags = None
+_deadlines = None
+_worker_players = None
+_worker_opponent = None
+
+
+class JobNotFound(KeyError):
+    """ The job doesn't exist, or is forgotten """
+
+
+class QueueFull(Exception):
+    """ There are too many queued and running jobs """
+
+
+class CancellableComputerPlayer(ComputerPlayer):
+    """
+    A ComputerPlayer of a worker process, that stops its search when the cancel flag of its job is set or the
+    deadline of its job, as time.monotonic(), has passed
+    """
+
+    def __init__(self, player_name):
+        super().__init__(player_name, endgame_solver=EndgameSolver())
+        self.cancel_slot = 0
+
+    def count_node(self):
+        super().count_node()
+        if not self.nodes_searched & 1023:
+            deadline = _deadlines[self.cancel_slot]
+            if _cancel_flags[self.cancel_slot] or (deadline and time.monotonic() > deadline):
+                raise SearchTimeout()
+
+
+def _init_worker(cancel_flags, deadlines):
+    """
+    Initializes a worker process with the shared cancel flags and deadlines, and a computer player for both slots
+    """
+    global _cancel_flags, _deadlines, _worker_players, _worker_opponent
+    _cancel_flags = cancel_flags
+    _deadlines = deadlines
+    _worker_players = (CancellableComputerPlayer("Worker"), CancellableComputerPlayer("Worker"))
+    _worker_opponent = HumanPlayer("Opponent")
+
+
+def _search_job(cancel_slot, board_bytes, player_slot, evaluation, use_book, depth, time_limit_ms, ponder=False):
+    """
+    Searches the move of a job in a worker process
+    Args:
+        cancel_slot: The index of the cancel flag and the deadline of the job
+        board_bytes: The position, see GameBoard.to_bytes
+        player_slot: The slot of the computer player, 0 or 1
+        evaluation: The heuristic of the computer player
+        use_book: Answer from the opening book of the board, if any
+        depth: The depth to search to, no limit if None
+        time_limit_ms: The time budget of the search
+        ponder: Search until the deadline of the job or the end of the game, depth and time_limit_ms are ignored
+
+    Returns: (move, depth reached, nodes searched, cancelled, principal variation)
+    """
+    player = _worker_players[player_slot]
+    # The transposition table only holds values of the heuristic it was filled with
+    if type(evaluation) is not type(player.evaluation) or vars(evaluation) != vars(player.evaluation):
+        player.evaluation = evaluation
+        player.transposition_table.clear()
+
+    players = (player, _worker_opponent) if player_slot == 0 else (_worker_opponent, player)
+    state = GameBoard.from_bytes(board_bytes, *players)
+    player.opening_book = find_book(state._board_width, state._board_height) if use_book else None
+    player.cancel_slot = cancel_slot
+    if ponder:
+        move = player.get_actions(state, max(state.count_blanc(), 1))
+    else:
+        move = player.get_actions(state, depth, time_limit_ms)
+    return (move, player.depth_reached, player.nodes_searched, bool(_cancel_flags[cancel_slot]),
+            player.principal_variation)
+
+
+class Job:
+    """
+    The search of one computer move
+    """
+
+    def __init__(self, job_id, session, depth, time_limit_ms, cancel_slot, board_bytes=None, pondering=False):
+        self.job_id = job_id
+        self.session = session
+        self.depth = depth
+        self.time_limit_ms = time_limit_ms
+        self.cancel_slot = cancel_slot
+        # The searched position, and whether the job ponders it for a computer move that isn't requested yet
+        self.board_bytes = board_bytes
+        self.pondering = pondering
+        self.status = QUEUED
+        self.move = None
+        self.depth_reached = None
+        self.nodes = None
+        self.principal_variation = []
+        self.error = None
+        self.submitted = time.monotonic()
+        self.finished = None
+        self.future = None
+        self.done_event = threading.Event()
+
+    def to_dict(self):
+        """
+        Returns: The job as a dictionary that can be sent as JSON, with the state of the game once the job is done
+        """
+        status = self.status
+        if status == QUEUED and self.future is not None and self.future.running():
+            status = RUNNING
+        job = {
+            "job_id": self.job_id,
+            "game_id": self.session.game_id,
+            "status": status,
+            "move": self.move,
+            "depth_reached": self.depth_reached,
+            "nodes": self.nodes,
+            "error": self.error,
+            "seconds": None if self.finished is None else self.finished - self.submitted,
+        }
+        if self.status == DONE:
+            job["game"] = self.session.to_dict()
+        return job
+
+
+class JobManager:
+    """
+    Runs the searches of computer moves on a pool of worker processes. The pool is started with the first job and stays
+    alive until close is called.
+    """
+
+    def __init__(self, store=None, workers=2, max_queue=64, default_time_limit_ms=1000, max_time_limit_ms=5000,
+                 max_finished=10000, ponder=False, max_ponder_ms=None):
+        """
+        Constructor for the JobManager class
+        Args:
+            store: The SessionStore of the games, it accounts for the memory of a game after its computer move
+            workers: Number of worker processes
+            max_queue: Maximum number of queued and running jobs
+            default_time_limit_ms: Time budget of a job without one
+            max_time_limit_ms: Maximum time budget of a job
+            max_finished: Number of finished jobs that are remembered for polling
+            ponder: Search the predicted reply of the human player after every computer move
+            max_ponder_ms: Maximum time a game ponders, max_time_limit_ms if None
+        """
+        if workers < 1:
+            raise ValueError("Invalid number of workers. Must be at least 1.")
+        if max_queue < 1:
+            raise ValueError("Invalid max_queue. Must be at least 1.")
+
+        self.store = store
+        self.workers = workers
+        self.max_queue = max_queue
+        self.default_time_limit_ms = default_time_limit_ms
+        self.max_time_limit_ms = max_time_limit_ms
+        self.max_finished = max_finished
+        self.ponder = ponder
+        self.max_ponder_ms = max_time_limit_ms if max_ponder_ms is None else max_ponder_ms
+        self.ponder_stats = PonderStats()
+        self._executor = None
+        self._cancel_flags = None
+        self._deadlines = None
+        # The running ponder job of every game, by game id, the oldest first
+        self._ponder_jobs = {}
+        self._free_slots = list(range(max_queue))
+        self._jobs = OrderedDict()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Starts the worker processes, if they aren't running yet
+        """
+        with self._lock:
+            if self._executor is None:
+                # Loaded with the first pool, see backend.parallel
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                self._cancel_flags = multiprocessing.Array("b", self.max_queue)
+                # time.monotonic() is the same clock in every process
+                self._deadlines = multiprocessing.Array("d", self.max_queue)
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                     initargs=(self._cancel_flags, self._deadlines))
+
+    def close(self):
+        """
+        Cancels the queued jobs and stops the worker processes
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def pending(self):
+        """
+        Returns: The number of queued and running jobs
+        """
+        return self._pending
+
+    def submit(self, session, depth=None, time_limit_ms=None):
+        """
+        Submits the search of the next computer move of a game. If the game pondered the position, the ponder job
+        becomes the job of the move
+        Args:
+            session: The GameSession, the computer player must be to move
+            depth: The depth to search to, no limit if None
+            time_limit_ms: The time budget of the search, default_time_limit_ms if None
+
+        Returns: The Job
+        """
+        time_limit_ms = self.default_time_limit_ms if time_limit_ms is None else time_limit_ms
+        time_limit_ms = max(1, min(time_limit_ms, self.max_time_limit_ms))
+        self.start()
+        board_bytes, player_slot = session.search_request()
+
+        with self._lock:
+            if session.pending_job is not None:
+                raise TurnError("Invalid move. The computer is already searching its move.")
+            job = self._take_ponder_job(session, board_bytes, depth, time_limit_ms)
+            queued = job is None
+            if queued:
+                if self._pending >= self.max_queue:
+                    raise QueueFull("Too many computer moves are searched, try again later.")
+                job = self._queue(session, board_bytes, depth, time_limit_ms)
+                self._give_way()
+                executor = self._executor
+            session.pending_job = job.job_id
+            play = job.finished is not None
+        if queued:
+            self._start(job, executor, player_slot)
+        elif play:
+            # The ponder job has already finished its search
+            self._play(job)
+        return job
+
+    def _take_ponder_job(self, session, board_bytes, depth, time_limit_ms):
+        # Returns the ponder job of the game if it pondered the position, otherwise cancels it. The lock is held
+        job = self._ponder_jobs.pop(session.game_id, None)
+        if job is None:
+            return None
+        if job.board_bytes != board_bytes or depth is not None:
+            # A wrong prediction, or a search to a fixed depth that the ponder job can't stop at
+            self.ponder_stats.record(False)
+            self._cancel(job)
+            return None
+
+        now = time.monotonic()
+        self.ponder_stats.record(True, (now if job.finished is None else job.finished) - job.submitted)
+        job.pondering = False
+        job.time_limit_ms = time_limit_ms
+        if job.finished is None:
+            self._deadlines[job.cancel_slot] = now + time_limit_ms / 1000
+        return job
+
+    def _queue(self, session, board_bytes, depth, time_limit_ms, pondering=False):
+        # Records the job of a position, the lock is held. The job is submitted to the pool by _start
+        job = Job(uuid.uuid4().hex, session, depth, time_limit_ms, self._free_slots.pop(), board_bytes, pondering)
+        self._cancel_flags[job.cancel_slot] = 0
+        self._deadlines[job.cancel_slot] = time.monotonic() + self.max_ponder_ms / 1000 if pondering else 0.0
+        self._jobs[job.job_id] = job
+        self._pending += 1
+        return job
+
+    def _start(self, job, executor, player_slot, pondering=False):
+        # Submits a queued job to the pool, the lock is not held: the pool forks its workers on the first submit, and
+        # the future of a job that is already done calls _finish in this thread. A ponder job can be taken over by a
+        # computer move in the meantime, so whether it ponders is passed in
+        player = job.session.computer_player
+        try:
+            if executor is None:
+                raise RuntimeError("The job manager is closed.")
+            future = executor.submit(_search_job, job.cancel_slot, job.board_bytes, player_slot, player.evaluation,
+                                     player.opening_book is not None, job.depth, job.time_limit_ms, pondering)
+        except RuntimeError as error:
+            # The pool was shut down by close, the job fails
+            from concurrent.futures import Future
+            future = Future()
+            future.set_exception(error)
+        job.future = future
+        future.add_done_callback(lambda future: self._finish(job, future))
+
+    def _give_way(self):
+        # Cancels the oldest ponder jobs while computer moves wait for a worker, the lock is held
+        while self._ponder_jobs and self._pending > self.workers:
+            self._cancel(self._ponder_jobs.pop(next(iter(self._ponder_jobs))))
+
+    def _ponder_next(self, job):
+        # Submits a ponder job for the position after the reply that the search of a computer move predicts
+        session = job.session
+        if not self.ponder or len(job.principal_variation) < 2:
+            return
+        with session.lock:
+            board = session.board.clone()
+        reply = job.principal_variation[1]
+        if board.active_player is not session.human_player or reply not in board.get_player_moves():
+            return
+        board.make_move(reply)
+        if board.terminal_test():
+            return
+
+        with self._lock:
+            # Pondering only uses idle workers, and leaves the queue to the computer moves
+            if self._executor is None or self._pending >= min(self.workers, self.max_queue):
+                return
+            ponder_job = self._queue(session, board.to_bytes(), None, None, True)
+            self._ponder_jobs[session.game_id] = ponder_job
+            executor = self._executor
+        self._start(ponder_job, executor, 0 if board.player_1 is session.computer_player else 1, True)
+
+    def _finish(self, job, future):
+        # Runs in a thread of the executor once the search is done, failed or cancelled
+        if future.cancelled():
+            job.status = CANCELLED
+        elif future.exception() is not None:
+            job.status = FAILED
+            job.error = str(future.exception())
+        else:
+            job.move, job.depth_reached, job.nodes, cancelled, job.principal_variation = future.result()
+            if cancelled:
+                job.status = CANCELLED
+                job.move = None
+
+        with self._lock:
+            job.finished = time.monotonic()
+            self._free_slots.append(job.cancel_slot)
+            self._pending -= 1
+            # A ponder job keeps its move until the computer move is requested, see submit
+            play = job.status == QUEUED and not job.pondering
+            if job.status != QUEUED and job.pondering:
+                if self._ponder_jobs.get(job.session.game_id) is job:
+                    del self._ponder_jobs[job.session.game_id]
+            elif not play and job.session.pending_job == job.job_id:
+                job.session.pending_job = None
+            self._forget_finished()
+        if play:
+            self._play(job)
+        elif job.status != QUEUED:
+            job.done_event.set()
+
+    def _play(self, job):
+        # Makes the searched move of a job on the board of its game and starts pondering the reply
+        try:
+            job.move = job.session.play_computer_move(job.move)
+            job.status = DONE
+        except ValueError as error:
+            job.status = FAILED
+            job.error = str(error)
+        if self.store is not None:
+            self.store.update(job.session)
+        with self._lock:
+            job.session.pending_job = None
+        # Pondering starts before the client hears of the move and can send the reply
+        if job.status == DONE:
+            self._ponder_next(job)
+        job.done_event.set()
+
+    def _forget_finished(self):
+        # The jobs are in order of submission, the oldest finished jobs are forgotten first
+        finished = len(self._jobs) - self._pending
+        for job_id in list(self._jobs):
+            if finished <= self.max_finished:
+                break
+            if self._jobs[job_id].finished is not None:
+                del self._jobs[job_id]
+                finished -= 1
+
+    def get(self, job_id):
+        """
+        Returns: The Job, raises JobNotFound if there is no such job
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise JobNotFound(job_id)
+        return job
+
+    def wait(self, job_id, timeout=None):
+        """
+        Waits until the job is finished or the timeout (in seconds) has passed
+        Returns: The Job
+        """
+        job = self.get(job_id)
+        job.done_event.wait(timeout)
+        return job
+
+    def cancel(self, job_id):
+        """
+        Cancels a job. A queued job doesn't start, a running job stops within 1024 nodes and its move isn't made
+        Returns: The Job
+        """
+        job = self.get(job_id)
+        # A cancelled future finishes the job right away, in this thread. A job that isn't submitted yet is stopped by
+        # its cancel flag
+        if job.future is not None and job.future.cancel():
+            return job
+        with self._lock:
+            self._cancel(job)
+        return job
+
+    def _cancel(self, job):
+        # Stops a running job, the lock is held
+        if job.finished is None:
+            self._cancel_flags[job.cancel_slot] = 1
+        elif job.pondering:
+            # The search of a ponder job has finished, but its move wasn't requested
+            job.status = CANCELLED
+            job.move = None
+            job.done_event.set()
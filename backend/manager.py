@@ -0,0 +1,131 @@
+"""
+The console game: a human player against a computer player in the terminal. The GameManager asks for the board size
+and the moves of the human player, and can ponder, see backend.pondering, and save and load games, see
+backend.checkpoint.
+
+This module is kept apart from the engine in backend.new_game, so processes that only search, like the workers of
+backend.parallel and backend.jobs, don't load the console game and what it depends on.
+"""
+from backend.checkpoint import Checkpoint, write_checkpoint
+from backend.endgame import EndgameSolver
+from backend.geometry import BOARD_SIZES, board_size
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer
+from backend.pondering import Ponderer
+
+
+class GameManager:
+
+    def __init__(self, computer_player=None, ponder=None, time_limit_ms=1000):
+        """
+        Constructor for the GameManager class.
+        Args:
+            computer_player: The computer player of the games, a ComputerPlayer if None. Any player with a
+                choose_move(state, time_limit_ms) method can play, like backend.mcts.MCTSPlayer
+            ponder: The ComputerPlayer searches while the human player thinks, in this mode of
+                backend.pondering.PONDER_MODES. No pondering if None
+            time_limit_ms: The time budget of the moves of the computer player
+        """
+        self.game = None
+        self.computer_player = computer_player
+        self.ponder = ponder
+        self.time_limit_ms = time_limit_ms
+        self.ponderer = None
+
+    def get_ponderer(self):
+        """
+        Returns: The Ponderer of the ComputerPlayer of the game, None without pondering
+        """
+        if self.ponder is None:
+            return None
+        for player in (self.game.player_1, self.game.player_2):
+            if isinstance(player, ComputerPlayer):
+                if self.ponderer is None or self.ponderer.player is not player:
+                    self.ponderer = Ponderer(player, self.ponder)
+                return self.ponderer
+        return None
+
+    def create_game(self, board=None):
+        """
+        Creates a game. Creates a computer player, asks for a human player and initiates the gameBoard,
+            board: The size of the board, a name of BOARD_SIZES, (x_length, y_length) or "<x_length>x<y_length>".
+                Asked for if None
+        """
+        # The computer player is created
+        computer_player = self.computer_player
+        if computer_player is None:
+            computer_player = ComputerPlayer("Computer", endgame_solver=EndgameSolver())
+        human_player = HumanPlayer("Jantje")
+
+        # The board size is asked until it's a valid size
+        x_length = y_length = None
+        while x_length is None:
+            if board is None:
+                sizes = ", ".join(f"{name} ({width}x{height})" for name, (width, height) in BOARD_SIZES.items())
+                board = input(f"Please enter the board size: {sizes} or <width>x<height>")
+            try:
+                x_length, y_length = board_size(board)
+            except ValueError as error:
+                print(error)
+                board = None
+        # The game is created
+        self.game = GameBoard(x_length, y_length, human_player, computer_player)
+
+    def save_game(self, path):
+        """
+        Writes the game and the search state of its ComputerPlayer to a checkpoint file, see backend.checkpoint
+        Args:
+            path: The path of the checkpoint file
+        """
+        computer_players = [player for player in (self.game.player_1, self.game.player_2)
+                            if isinstance(player, ComputerPlayer)]
+        write_checkpoint(path, self.game, computer_players[0] if computer_players else None)
+
+    def load_game(self, path):
+        """
+        Goes on with a game of a checkpoint file, see save_game. The computer player of the manager, if any, takes the
+        place of the computer player of the game and gets its search state
+        Args:
+            path: The path of the checkpoint file
+        """
+        checkpoint = Checkpoint(path)
+        players = [None, None]
+        if self.computer_player is not None and checkpoint.slot < 2:
+            players[checkpoint.slot] = self.computer_player
+        self.game = checkpoint.board(*players)
+
+    def play_game(self):
+        """
+        This function plays the game. The game is played until the game is over. The game is over when the terminal
+        test is true, meaning a player has no more move left.
+        :return:
+        """
+
+        ponderer = self.get_ponderer()
+        # The game is played until the game is over
+        while not self.game.terminal_test():
+            # The game board is printed
+            print(f"\n --- A new round ---\n{self.game}")
+
+            # The current human player is asked to make a move
+            if self.game.active_player.player_type == "Human":
+                print(f"Your turn player: {self.game.active_player.player_name}!")
+                move = self.game.active_player.human_decision(self.game)
+            # A move is generated by the computer player
+            else:
+                print("Computer's turn!")
+                if ponderer is not None and self.game.active_player is ponderer.player:
+                    move = ponderer.get_actions(self.game, time_limit_ms=self.time_limit_ms)
+                else:
+                    move = self.game.active_player.choose_move(self.game, self.time_limit_ms)
+
+            # The move is made
+            print(f"The move is processed in the board")
+            mover = self.game.active_player
+            self.game.make_move(move)
+            # The computer player ponders while the opponent thinks about its move
+            if ponderer is not None and mover is ponderer.player:
+                ponderer.start(self.game)
+
+        if ponderer is not None:
+            ponderer.stop()
+        print("Game over!")
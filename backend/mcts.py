@@ -0,0 +1,325 @@
+"""
+Monte Carlo tree search player, an alternative to the full-width search of the ComputerPlayer. On the standard board a
+player has up to 20 moves, too many for the minimax search to look far ahead. MCTS grows its tree towards the moves
+that win most often instead, and estimates positions by playing them out to the end.
+
+Every iteration of the search:
+1) Selection: walks down the tree, choosing the child with the highest UCT value: its win rate plus an exploration
+   term for children with few visits
+2) Expansion: adds one untried move of the reached node to the tree
+3) Rollout: plays the position out with random moves, or with moves that keep the most room for the player, on a
+   lightweight board of plain integers
+4) Backpropagation: counts the visit and the win on every node of the path
+
+The tree of the last search is kept: when the player moves again, the subtree of the position after its own move and
+the reply of the opponent is the start of the new search.
+
+With more than one worker the search is root-parallel: every worker process grows its own tree from the position and
+the visits and wins of the root moves of all trees are added up. Workers receive the position as GameBoard.to_bytes.
+"""
+import math
+import random
+import time
+
+from backend.endgame import moves_mask
+from backend.new_game import GameBoard, HumanPlayer, Player
+
+ROLLOUT_POLICIES = ("random", "mobility")
+
+
+def random_cell(mask, rng):
+    """
+    Returns: The index of a random set bit of a non-zero mask
+    """
+    for _ in range(rng.randrange(mask.bit_count())):
+        mask &= mask - 1
+    return (mask & -mask).bit_length() - 1
+
+
+def rollout(state, rng, policy="random"):
+    """
+    Plays a position out to the end on plain integers, the board isn't changed
+    Args:
+        state: The GameBoard
+        rng: The random.Random of the moves
+        policy: random plays random moves, mobility picks the better of two random moves: the one after which the
+            player has the most moves
+
+    Returns: The slot of the winner, 0 or 1
+    """
+    rays, ascending = state._rays, state._ascending
+    open_cells = state._full_mask & ~state._board
+    cells = state._cells[:]
+    active = state._active
+    while True:
+        cell = cells[active]
+        moves = moves_mask(rays, ascending, cell, open_cells) if cell >= 0 else open_cells
+        if not moves:
+            # The player that can't move has lost
+            return active ^ 1
+        target = random_cell(moves, rng)
+        if policy == "mobility" and moves & (moves - 1):
+            other = random_cell(moves, rng)
+            if (moves_mask(rays, ascending, other, open_cells ^ 1 << other).bit_count()
+                    > moves_mask(rays, ascending, target, open_cells ^ 1 << target).bit_count()):
+                target = other
+        open_cells ^= 1 << target
+        cells[active] = target
+        active ^= 1
+
+
+class Node:
+    """
+    A node of the search tree: the position after a move. wins counts the rollouts won by the player that made the
+    move.
+    """
+
+    __slots__ = ("move", "slot", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, slot, parent, untried):
+        self.move = move
+        self.slot = slot
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0
+
+    def size(self):
+        """
+        Returns: The number of nodes of the subtree
+        """
+        return 1 + sum(child.size() for child in self.children)
+
+
+def search_tree(root, state, iterations, deadline, exploration, policy, rng):
+    """
+    Grows a tree with MCTS iterations
+    Args:
+        root: The Node of the position
+        state: The GameBoard of the position, the moves of an iteration are taken back after it
+        iterations: The number of iterations, no limit if None
+        deadline: The time.perf_counter() to stop at, no limit if None
+        exploration: The exploration constant of UCT
+        policy: The rollout policy, see rollout
+        rng: The random.Random of the search
+
+    Returns: The number of iterations done
+    """
+    done = 0
+    while (iterations is None or done < iterations) and (deadline is None or time.perf_counter() < deadline):
+        node = root
+        # Selection
+        while not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            node = max(node.children, key=lambda child: child.wins / child.visits
+                       + exploration * math.sqrt(log_visits / child.visits))
+            state.apply_move(node.move)
+        # Expansion
+        if node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            slot = state._active
+            state.apply_move(move)
+            child = Node(move, slot, node, state.get_player_moves())
+            node.children.append(child)
+            node = child
+
+        winner = rollout(state, rng, policy)
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if node.slot == winner:
+                node.wins += 1
+            if node is not root:
+                state.undo_move()
+            node = node.parent
+        done += 1
+    return done
+
+
+def _search_worker(board_bytes, iterations, time_limit_ms, exploration, policy, seed):
+    """
+    Grows a tree in a worker process
+    Returns: (iterations done, {move cell: (visits, wins)} of the root moves)
+    """
+    state = GameBoard.from_bytes(board_bytes, HumanPlayer("Player 1"), HumanPlayer("Player 2"))
+    root = Node(None, state._active ^ 1, None, state.get_player_moves())
+    deadline = None if time_limit_ms is None else time.perf_counter() + time_limit_ms / 1000
+    done = search_tree(root, state, iterations, deadline, exploration, policy, random.Random(seed))
+    return done, {child.move[0] * state._board_width + child.move[1]: (child.visits, child.wins)
+                  for child in root.children}
+
+
+class MCTSPlayer(Player):
+    """
+    A computer player that searches its moves with Monte Carlo tree search
+    """
+
+    def __init__(self, player_name, iterations=None, time_limit_ms=1000, exploration=math.sqrt(2), policy="random",
+                 workers=1, reuse_tree=True, seed=None):
+        """
+        Constructor for the MCTSPlayer class
+        Args:
+            player_name: Name of the player
+            iterations: The number of iterations of every move, no limit if None. With workers, every worker does this
+                many
+            time_limit_ms: The time budget of every move, no limit if None
+            exploration: The exploration constant of UCT, higher values try more moves with few visits
+            policy: The rollout policy, one of ROLLOUT_POLICIES
+            workers: Number of processes that grow a tree, with 1 the search runs in this process only
+            reuse_tree: Start a search from the subtree of the last search
+            seed: Seed of the random moves
+        """
+        super().__init__(player_name, "Computer")
+        if iterations is None and time_limit_ms is None:
+            raise ValueError("Invalid search limits. Give iterations, a time_limit_ms or both.")
+        if policy not in ROLLOUT_POLICIES:
+            raise ValueError(f"Invalid policy. Must be one of {', '.join(ROLLOUT_POLICIES)}.")
+        if workers < 1:
+            raise ValueError("Invalid number of workers. Must be at least 1.")
+
+        self.iterations = iterations
+        self.time_limit_ms = time_limit_ms
+        self.exploration = exploration
+        self.policy = policy
+        self.workers = workers
+        self.reuse_tree = reuse_tree
+        self.rng = random.Random(seed)
+        self._executor = None
+        # The tree of the last search and the position at its root
+        self._root = None
+        self._root_state = None
+        # Statistics of the last search. Every iteration adds one node, so nodes_searched is the number of playouts as
+        # well, like ComputerPlayer.nodes_searched it counts the work of the search
+        self.playouts = 0
+        self.nodes_searched = 0
+        self.playouts_per_second = 0.0
+        self.reused_visits = 0
+        self.best_score = None
+        self.principal_variation = []
+
+    def start(self):
+        """
+        Starts the worker processes, if they aren't running yet
+        """
+        if self._executor is None and self.workers > 1:
+            # The process pool is only loaded by players with workers, a serial player starts faster
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.workers - 1)
+
+    def close(self):
+        """
+        Stops the worker processes
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def choose_move(self, state, time_limit_ms=None):
+        """
+        The move of the player in a game of the GameManager, within the time budget or the time limit of the player if
+        None
+        """
+        return self.get_actions(state, time_limit_ms=time_limit_ms)
+
+    def find_subtree(self, state):
+        """
+        Finds the position in the tree of the last search: the root itself, or a node one or two moves below it
+        Returns: The Node, or None
+        """
+        if self._root is None or (self._root_state._board_width, self._root_state._board_height) != \
+                (state._board_width, state._board_height):
+            return None
+        target = state.zobrist_hash()
+        board = self._root_state
+        if board.zobrist_hash() == target:
+            return self._root
+        for child in self._root.children:
+            board.apply_move(child.move)
+            found = child if board.zobrist_hash() == target else None
+            for grandchild in child.children if found is None else []:
+                board.apply_move(grandchild.move)
+                if board.zobrist_hash() == target:
+                    found = grandchild
+                board.undo_move()
+                if found is not None:
+                    break
+            board.undo_move()
+            if found is not None:
+                return found
+        return None
+
+    def get_actions(self, state, iterations=None, time_limit_ms=None):
+        """
+        Searches the best move with MCTS: the root move with the most visits
+        Args:
+            state: The GameBoard, the player must have initiative
+            iterations: The number of iterations, the iterations of the player if None
+            time_limit_ms: The time budget, the time limit of the player if None
+
+        Returns: The move, None if the player has no legal moves
+        """
+        iterations = self.iterations if iterations is None else iterations
+        time_limit_ms = self.time_limit_ms if time_limit_ms is None else time_limit_ms
+        start = time.perf_counter()
+        deadline = None if time_limit_ms is None else start + time_limit_ms / 1000
+
+        root = self.find_subtree(state) if self.reuse_tree else None
+        if root is None:
+            root = Node(None, state._active ^ 1, None, state.get_player_moves())
+        else:
+            root.parent = None
+        self.reused_visits = root.visits
+
+        board = state.clone()
+        futures = []
+        if self.workers > 1:
+            self.start()
+            board_bytes = state.to_bytes()
+            futures = [self._executor.submit(_search_worker, board_bytes, iterations, time_limit_ms, self.exploration,
+                                             self.policy, self.rng.getrandbits(32))
+                       for _ in range(self.workers - 1)]
+        self.playouts = search_tree(root, board, iterations, deadline, self.exploration, self.policy, self.rng)
+
+        # The visits and wins of the root moves, of this tree and the trees of the workers
+        totals = {child.move[0] * state._board_width + child.move[1]: [child.visits, child.wins]
+                  for child in root.children}
+        for future in futures:
+            done, moves = future.result()
+            self.playouts += done
+            for cell, (visits, wins) in moves.items():
+                total = totals.setdefault(cell, [0, 0])
+                total[0] += visits
+                total[1] += wins
+        seconds = time.perf_counter() - start
+        self.nodes_searched = self.playouts
+        self.playouts_per_second = self.playouts / seconds if seconds > 0 else 0.0
+
+        self._root, self._root_state = (root, board) if self.reuse_tree else (None, None)
+        if not totals:
+            self.best_score = None
+            self.principal_variation = []
+            return None
+        best_cell = max(totals, key=lambda cell: totals[cell][0])
+        visits, wins = totals[best_cell]
+        self.best_score = wins / visits if visits else 0.0
+        self.principal_variation = self.get_principal_variation(root, best_cell, state._board_width)
+        return list(divmod(best_cell, state._board_width))
+
+    def get_principal_variation(self, root, best_cell, width):
+        """
+        The best move followed by the most visited moves of the tree
+        """
+        line = [list(divmod(best_cell, width))]
+        node = next((child for child in root.children if child.move == line[0]), None)
+        while node is not None and node.children:
+            node = max(node.children, key=lambda child: child.visits)
+            line.append(node.move)
+        return line
@@ -1,10 +1,110 @@
 # TODO: implement the __init__ class below by adding properties
 # that meet the three requirements specified
+import math
 import random
-import copy
+import struct
+import time
+from collections.abc import Mapping
+
+from backend.geometry import get_geometry
+from backend.heuristics import OwnMoves
+from backend.ordering import KillerHistoryOrdering
+from backend.transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+
+def ray_tables(x_length, y_length):
+    """
+    The queen rays of a board size, see BoardGeometry
+    Returns: tuple (rays, ascending) where rays[direction][cell] is the mask of all cells from that cell (exclusive)
+    up to the edge of the board and ascending[direction] tells if the cell indices along the ray go up (True) or down
+    (False)
+    """
+    geometry = get_geometry(x_length, y_length)
+    return geometry.rays, geometry.ascending
+
+
+def zobrist_keys(x_length, y_length):
+    """
+    Random 64-bit keys to hash a position of a board size, see BoardGeometry. The hash of a position is the XOR of the
+    keys of its blocked cells, the keys of the cells of both players and the side key if player 2 has initiative.
+    Returns: tuple (cell_keys, position_keys, side_key) where position_keys[0] belongs to player 1 and
+    position_keys[1] to player 2
+    """
+    return get_geometry(x_length, y_length).zobrist
+
+
+def symmetries(x_length, y_length):
+    """
+    The symmetries of a board size as permutations of its cells, see BoardGeometry
+    Returns: tuple of (permutation, inverse) pairs, the identity first. permutation[cell] is the cell that cell is
+    mapped to, inverse maps it back
+    """
+    return get_geometry(x_length, y_length).symmetries
+
+
+def shadow_table(x_length, y_length):
+    """
+    What blocking a cell takes away from the queen moves of a player, see BoardGeometry
+    Returns: tuple where shadows[source][target] is the mask of the target and the cells behind it seen from the
+    source, 0 if the cells aren't on one line
+    """
+    return get_geometry(x_length, y_length).shadows
+
+
+class PositionView(Mapping):
+    """
+    The positions of both players as a read/write mapping from player to [y, x], or None if the player hasn't been
+    placed yet. The board stores the positions as cell indices, the view converts them.
+    """
+
+    __slots__ = ("_board",)
+
+    def __init__(self, board):
+        self._board = board
+
+    def __getitem__(self, player):
+        if player == self._board.player_1:
+            cell = self._board._cells[0]
+        elif player == self._board.player_2:
+            cell = self._board._cells[1]
+        else:
+            raise KeyError(player)
+        return list(divmod(cell, self._board._board_width)) if cell >= 0 else None
+
+    def __setitem__(self, player, position):
+        self._board.set_position(player, position)
+
+    def __iter__(self):
+        return iter((self._board.player_1, self._board.player_2))
+
+    def __len__(self):
+        return 2
+
+    def copy(self):
+        return dict(self)
+
+    def __repr__(self):
+        return repr(dict(self))
 
 
 class GameBoard:
+    """
+    An isolation board. The board is kept compact, because the search keeps many boards alive:
+    - The blocked cells are a bitboard, a single integer where bit y * x_length + x is set when the cell [y, x] is
+      blocked
+    - The positions of the players are cell indices, -1 for a player that hasn't been placed yet
+    - Players are referred to by their slot, 0 for player 1 and 1 for player 2
+    - The legal moves of both players are cached as masks of cells. A move only takes cells away from the moves of
+      the opponent, so its mask is updated with the shadow of the blocked cell. The mask of the player that moved is
+      computed again when it's needed
+    - The instance has no __dict__, the attributes are __slots__
+    The players, their positions and the player with initiative are still available as objects and [y, x] lists
+    through player_1, player_2, positions and active_player.
+    """
+
+    __slots__ = ("_board_width", "_board_height", "_board", "_full_mask", "_geometry", "_rays", "_ascending",
+                 "_zobrist", "_hash", "_cells", "_active", "_moves", "_shadows", "game_over", "player_1", "player_2",
+                 "_history", "recorder")
 
     def __init__(self, x_length, y_length, player_1, player_2):
         """The GameState class constructor performs required
@@ -26,16 +126,58 @@ class GameBoard:
         None
         """
 
-        # Create a board with the same size as the game board
-        # and fill it with False values
+        # Create a board with the same size as the game board, all cells open
         self._board_width = x_length
         self._board_height = y_length
-        self._board = [[False for _ in range(x_length)] for _ in range(y_length)]
-        self.positions = {player_1: None, player_2: None}
+        self._board = 0
+        # The tables of the board size, shared by every board of that size. The tables the search reads at every node
+        # are attributes of the board as well
+        geometry = get_geometry(x_length, y_length)
+        self._geometry = geometry
+        self._full_mask = geometry.full_mask
+        self._rays, self._ascending = geometry.rays, geometry.ascending
+        self._zobrist = geometry.zobrist
+        self._shadows = geometry.shadows
+        # Zobrist hash of the position, updated with every change of the board
+        self._hash = 0
+        self._cells = [-1, -1]
+        self._active = 0
+        # The legal moves of player 1 and player 2 as masks of cells, -1 if they have to be computed
+        self._moves = (-1, -1)
         self.game_over = False
         self.player_1 = player_1
         self.player_2 = player_2
         self.active_player = random.choice([self.player_1, self.player_2])
+        # Undo stack of (board, hash, cell of the mover, slot of the mover, game over, cached moves) for every applied
+        # move
+        self._history = []
+        # Records the moves of make_move, see backend.records. Moves aren't recorded if None
+        self.recorder = None
+
+    @property
+    def active_player(self):
+        """
+        The player that has initiative
+        """
+        return self.player_2 if self._active else self.player_1
+
+    @active_player.setter
+    def active_player(self, player):
+        slot = self.get_slot(player)
+        if slot != self._active:
+            self.change_initiative()
+
+    @property
+    def positions(self):
+        """
+        The positions of the players as a mapping from player to [y, x], see PositionView
+        """
+        return PositionView(self)
+
+    @positions.setter
+    def positions(self, positions):
+        for player, position in positions.items():
+            self.set_position(player, position)
 
     def change_initiative(self):
         """
@@ -52,67 +194,336 @@ class GameBoard:
          If _active_player is 0, it will become 1, and if _active_player is 1, it will become 0.
         """
 
-        if self.active_player == self.player_1:
-            self.active_player = self.player_2
-        elif self.active_player == self.player_2:
-            self.active_player = self.player_1
+        self._active ^= 1
+        self._hash ^= self._zobrist[2]
+
+    def get_slot(self, player):
+        """
+        Returns: 0 for player 1 and 1 for player 2
+        """
+        if player == self.player_1:
+            return 0
+        if player == self.player_2:
+            return 1
+        raise ValueError(f"Invalid player. {player} doesn't play on this board.")
+
+    def get_opponent(self, player):
+        """
+        Returns: The other player of the game
+        """
+        return self.player_2 if player == self.player_1 else self.player_1
+
+    def get_cell(self, player=None):
+        """
+        Returns: The cell index of the player, the active player if None. -1 if the player hasn't been placed yet
+        """
+        return self._cells[self._active if player is None else self.get_slot(player)]
+
+    def set_position(self, player, position):
+        """
+        Places a player on the board without blocking the cell or changing the initiative
+        Args:
+            player: The player to place
+            position: [y, x] position, or None to take the player off the board
+        """
+        slot = self.get_slot(player)
+        position_keys = self._zobrist[1][slot]
+        if self._cells[slot] >= 0:
+            self._hash ^= position_keys[self._cells[slot]]
+        self._cells[slot] = self.cell_index(position) if position else -1
+        if self._cells[slot] >= 0:
+            self._hash ^= position_keys[self._cells[slot]]
+        self._moves = (-1, -1)
+
+    def cell_index(self, position):
+        """
+        Converts a [y, x] position to the bit index of the cell on the bitboard
+        Args:
+            position: [y, x] coordinates of the cell
+
+        Returns: The bit index of the cell, or None if the position is not on the board
+        """
+        y, x = position
+        if not 0 <= y < self._board_height or not 0 <= x < self._board_width:
+            return None
+        return y * self._board_width + x
+
+    def is_blocked(self, position):
+        """
+        Checks if the cell at position [y, x] is blocked
+        """
+        return bool(self._board >> self.cell_index(position) & 1)
+
+    def block_cell(self, position):
+        """
+        Marks the cell at position [y, x] as blocked without moving a player
+        """
+        cell = self.cell_index(position)
+        if not self._board >> cell & 1:
+            self._board |= 1 << cell
+            self._hash ^= self._zobrist[0][cell]
+            self._moves = (-1, -1)
+
+    def zobrist_hash(self):
+        """
+        Hashes the position: the blocked cells, the positions of both players and the player that has initiative.
+        The hash is kept up to date incrementally by every change of the board.
+        Returns: 64-bit Zobrist hash of the position
+        """
+        return self._hash
+
+    def blocked_cells(self):
+        """
+        Returns: The indices of the blocked cells, in ascending order
+        """
+        cells = []
+        board = self._board
+        while board:
+            low_bit = board & -board
+            cells.append(low_bit.bit_length() - 1)
+            board ^= low_bit
+        return cells
+
+    def symmetric_hashes(self):
+        """
+        The Zobrist hashes of the position mapped by each of the symmetries of the board, see symmetries. The first
+        hash, of the identity, is zobrist_hash.
+        Returns: list of 64-bit hashes, in the order of symmetries
+        """
+        cell_keys, position_keys, side_key = self._zobrist
+        blocked = self.blocked_cells()
+        hashes = []
+        for permutation, _ in self._geometry.symmetries:
+            key = side_key if self._active else 0
+            for cell in blocked:
+                key ^= cell_keys[permutation[cell]]
+            for slot, cell in enumerate(self._cells):
+                if cell >= 0:
+                    key ^= position_keys[slot][permutation[cell]]
+            hashes.append(key)
+        return hashes
+
+    def canonical_hash(self):
+        """
+        The hash of the canonical form of the position: of all its mirror images and rotations, the one with the
+        smallest Zobrist hash. Symmetric positions have the same canonical hash, so caches of positions keyed by it
+        hold one entry for all of them. Moves are mapped to the canonical form with to_canonical_move and back with
+        from_canonical_move.
+        Returns: (canonical hash, index of the symmetry that maps the position to its canonical form)
+        """
+        hashes = self.symmetric_hashes()
+        symmetry = min(range(len(hashes)), key=hashes.__getitem__)
+        return hashes[symmetry], symmetry
+
+    def to_canonical_move(self, move, symmetry):
+        """
+        Maps a [y, x] move of this position to the move in the form of the position given by the symmetry
+        """
+        cell = self._geometry.symmetries[symmetry][0][move[0] * self._board_width + move[1]]
+        return list(self._geometry.coordinates[cell])
+
+    def from_canonical_move(self, move, symmetry):
+        """
+        Maps a [y, x] move of the form of the position given by the symmetry back to the move in this position
+        """
+        cell = self._geometry.symmetries[symmetry][1][move[0] * self._board_width + move[1]]
+        return list(self._geometry.coordinates[cell])
+
+    def stabilizer(self):
+        """
+        Returns: The permutations of the symmetries, apart from the identity, that map the position onto itself
+        """
+        blocked = self.blocked_cells()
+        return [permutation for permutation, _ in self._geometry.symmetries[1:]
+                if all(self._board >> permutation[cell] & 1 for cell in blocked)
+                and all(cell < 0 or permutation[cell] == cell for cell in self._cells)]
+
+    def unique_moves(self, moves):
+        """
+        Removes the moves that lead to a mirror image of the position after an earlier move in the list. On an empty
+        board only the moves to one of the symmetric cells are left, a quarter or an eighth of the cells.
+        Args:
+            moves: legal moves of the active player
+
+        Returns: The moves that lead to different positions, in the order of moves
+        """
+        stabilizer = self.stabilizer()
+        if not stabilizer:
+            return moves
+
+        unique = []
+        seen = set()
+        for move in moves:
+            cell = move[0] * self._board_width + move[1]
+            if cell in seen:
+                continue
+            unique.append(move)
+            seen.add(cell)
+            seen.update(permutation[cell] for permutation in stabilizer)
+        return unique
+
+    def moves_from_mask(self, mask):
+        """
+        Converts a mask of cells to a list of [y, x] moves, ordered by cell index
+        """
+        coordinates = self._geometry.coordinates
+        moves = []
+        while mask:
+            lowest = mask & -mask
+            moves.append(list(coordinates[lowest.bit_length() - 1]))
+            mask ^= lowest
+        return moves
+
+    def cell_moves_mask(self, cell):
+        """
+        Computes the legal moves from a cell as a mask of cells. For every direction the precomputed ray is cut off
+        at the first blocked cell: the first blocker is the lowest set bit on ascending rays and the highest set bit on
+        descending rays, and everything from the blocker outwards is removed from the ray.
+        Args:
+            cell: cell index of the player, or -1 if the player hasn't been placed yet
+
+        Returns: mask of the cells the player can move to
+        """
+        if cell < 0:
+            return self._full_mask & ~self._board
+
+        board = self._board
+        mask = 0
+        for rays, ascending in zip(self._rays, self._ascending):
+            ray = rays[cell]
+            blockers = ray & board
+            if blockers:
+                if ascending:
+                    blocker = (blockers & -blockers).bit_length() - 1
+                else:
+                    blocker = blockers.bit_length() - 1
+                ray &= ~(rays[blocker] | (1 << blocker))
+            mask |= ray
+        return mask
+
+    def legal_moves_mask(self, position=None):
+        """
+        Computes the legal moves from a position as a mask of cells, see cell_moves_mask
+        Args:
+            position: [y, x] position of the player, or None if the player hasn't been placed yet
+
+        Returns: mask of the cells the player can move to
+        """
+        return self.cell_moves_mask(position[0] * self._board_width + position[1] if position else -1)
+
+    def slot_moves_mask(self, slot):
+        """
+        The legal moves of a player as a mask of cells, from the cache
+        Args:
+            slot: The slot of the player, 0 for player 1 and 1 for player 2
+
+        Returns: mask of the cells the player can move to
+        """
+        mask = self._moves[slot]
+        if mask < 0:
+            mask = self.cell_moves_mask(self._cells[slot])
+            self._moves = (mask, self._moves[1]) if slot == 0 else (self._moves[0], mask)
+        return mask
+
+    def mobility(self, player=None):
+        """
+        Returns: The number of legal moves of the player, the active player if None
+        """
+        return self.slot_moves_mask(self._active if player is None else self.get_slot(player)).bit_count()
 
     def get_all_blanc(self):
         """
         Function to retrieve all blanc spaces on the board
-        Returns: List with all possible positions
+        Returns: List with all possible positions as [y, x]
         """
-        return [[x, y] for x in range(len(self._board[0])) for y in range(len(self._board)) if
-                self._board[y][x] is False]
+        return self.moves_from_mask(self._full_mask & ~self._board)
+
+    def count_blanc(self):
+        """
+        Returns: The number of blanc spaces on the board
+        """
+        return (self._full_mask & ~self._board).bit_count()
 
     def get_legal_moves(self, position=None):
         """
-        Function to retrieve diagonal moves from a two-dimensional playing board, base ob the position of the player
+        Function to retrieve the queen moves (diagonal, horizontal and vertical) from a two-dimensional playing board,
+        based on the position of the player. The moves are reported per direction, walking outwards from the player.
         Args:
             position:
 
-        Returns: all the possible diagonal moves from the position of the player
+        Returns: all the possible moves from the position of the player
         """
-        if not position:
-            return self.get_all_blanc()
-        # width of the board, the first line in [line_1:[F,F,F,F], line_2[F,F,F,F]] is the length (4) of the first line
-        x_length = len(self._board[0])
+        return self.cell_legal_moves(position[0] * self._board_width + position[1] if position else -1)
 
-        # Length of the board are the  lines in [line_1:[F,F,F,F], line_2[F,F,F,F]] (2)
-        y_length = len(self._board)
+    def get_player_moves(self, player=None):
+        """
+        Returns: The legal moves of the player, the active player if None, in the order of get_legal_moves
+        """
+        slot = self._active if player is None else self.get_slot(player)
+        return self.cell_legal_moves(self._cells[slot], self.slot_moves_mask(slot))
 
-        # Retrieve the diagonal moves
+    def cell_legal_moves(self, cell, mask=None):
+        """
+        The legal moves from a cell index, see get_legal_moves
+        Args:
+            cell: cell index of the player, or -1 if the player hasn't been placed yet
+            mask: The legal moves from the cell as a mask of cells, see cell_moves_mask. Computed if None
+        """
+        if cell < 0:
+            return self.get_all_blanc()
+        if mask is None:
+            mask = self.cell_moves_mask(cell)
+
+        coordinates = self._geometry.coordinates
         legal_moves = []
-        # The directions in which the player can move
-        directions = [[1, -1], [-1, 1],  # Diagonal left top  -> right bottom
-                      [1, 1], [-1, -1],  # Diagonal left bottom -> right top
-                      [0, 1], [0, -1],  # Horizontal
-                      [1, 0], [-1, 0]]  # Vertical
-
-        for direction in directions:
-            # Current position is starting point for new  position, which is [y,x]
-            new_position = position
-
-            # Check if the new position is within the board and not already occupied
-            proceed = True
-            while proceed:
-                # Go through the lines and check if a field is blocked. if not, add it to diagonal moves
-                new_position = [new_position[0] + direction[0], new_position[1] + direction[1]]
-                # Smaller than, because the board starts at 0 and the lengths are 1 higher
-                if not 0 <= new_position[0] < y_length or not 0 <= new_position[1] < x_length:
-                    proceed = False
-
-                elif self._board[new_position[0]][new_position[1]] is True:
-                    # This would mean the iteration hit an occupied cell, no further moves in this direction
-                    proceed = False
-                else:
-                    legal_moves.append(new_position)
+
+        for rays, ascending in zip(self._rays, self._ascending):
+            # The moves in this direction are the part of the mask on the ray
+            ray = rays[cell] & mask
+
+            # Walk the remaining ray outwards from the player
+            if ascending:
+                while ray:
+                    lowest = ray & -ray
+                    legal_moves.append(list(coordinates[lowest.bit_length() - 1]))
+                    ray ^= lowest
+            else:
+                while ray:
+                    highest = ray.bit_length() - 1
+                    legal_moves.append(list(coordinates[highest]))
+                    ray ^= 1 << highest
 
         if len(legal_moves) == 0:
             self.game_over = True
 
         return legal_moves
 
+    def _move_to(self, cell):
+        """
+        Blocks the cell, moves the active player to it and passes the initiative, keeping the hash up to date
+        """
+        slot = self._active
+        cell_keys, position_keys, side_key = self._zobrist
+        old_cell = self._cells[slot]
+        zobrist_hash = self._hash ^ cell_keys[cell] ^ position_keys[slot][cell] ^ side_key
+        if old_cell >= 0:
+            zobrist_hash ^= position_keys[slot][old_cell]
+
+        # The blocked cell casts its shadow on the moves of the opponent, the moves of the mover are computed again
+        opponent_moves = self._moves[slot ^ 1]
+        if opponent_moves > 0 and opponent_moves >> cell & 1:
+            opponent_cell = self._cells[slot ^ 1]
+            if opponent_cell >= 0:
+                opponent_moves &= ~self._shadows[opponent_cell][cell]
+            else:
+                opponent_moves ^= 1 << cell
+        self._moves = (-1, opponent_moves) if slot == 0 else (opponent_moves, -1)
+
+        self._board |= 1 << cell
+        self._cells[slot] = cell
+        self._active = slot ^ 1
+        self._hash = zobrist_hash
+
     def make_move(self, move):
         """
         Offers the player the opportunity to make a move. The player is the one that has initiative. The moves is
@@ -125,23 +536,44 @@ class GameBoard:
         if the player can't make any legal move, the game is over.
         """
 
-        legal_moves = self.get_legal_moves(self.positions[self.active_player])
-
-        # Make a move on the board at coordinates (x, y)
-        if move not in legal_moves:
+        cell = self.cell_index(move)
+        # Make a move on the board at coordinates (y, x)
+        if cell is None or not self.slot_moves_mask(self._active) >> cell & 1:
             return False  # Invalid move
 
-        y = move[0]
-        x = move[1]
-
-        self._board[y][x] = True
-        self.positions[self.active_player] = move
-        self.change_initiative()
-        # self.active_player.player_possible_moves = self.get_legal_moves(self.positions[self.active_player])
+        self._move_to(cell)
+        if self.recorder is not None:
+            self.recorder.record_move(cell)
 
         # Import to return the board, because the computer player needs to know the board for the iterative deepening
         return self
 
+    def apply_move(self, move):
+        """
+        Makes a move in place without validating it, so the search can walk the game tree on one board. The state
+        before the move is pushed on the undo stack and is restored by undo_move.
+        Args:
+            move: [y, x] legal move for the active player
+        """
+        slot = self._active
+        self._history.append((self._board, self._hash, self._cells[slot], slot, self.game_over, self._moves))
+        self._move_to(move[0] * self._board_width + move[1])
+
+    def undo_move(self):
+        """
+        Takes back the last move made with apply_move. Restores the blocked cells, the position of the player that
+        moved, the player that has initiative, the game over flag and the cached moves.
+        """
+        self._board, self._hash, cell, slot, self.game_over, self._moves = self._history.pop()
+        self._cells[slot] = cell
+        self._active = slot
+
+    def undo_count(self):
+        """
+        Returns: The number of moves made with apply_move that can still be taken back with undo_move
+        """
+        return len(self._history)
+
     def terminal_test(self):
         """
         Game over if no legal moves are left is managed in get_legal_moves. And checked after every move. If player one
@@ -150,20 +582,33 @@ class GameBoard:
         Returns: True if the game is over, otherwise False
         """
 
-        return len(self.get_legal_moves(self.positions[self.active_player])) == 0
+        # Most nodes find the moves of the active player in the cache, without the call of slot_moves_mask
+        mask = self._moves[self._active]
+        if mask < 0:
+            mask = self.slot_moves_mask(self._active)
+        if mask:
+            return False
 
-    def utility(self):
+        self.game_over = True
+        return True
+
+    def utility(self, player=None):
         """
         The game stop when the active player has no legal moves left. That means that the active player loses.
         If player one has no legal moves, he loses and the score will be -inf. If player two has no legal moves, player
         one wins and the score will be inf.
-        Returns: 1 if the player wins, -1 if the player loses, 0 if it's a draw
+        Args:
+            player: The player the score is for, player one if None
+        Returns: inf if the player wins, -inf if the player loses, 0 if it's a draw
         """
 
-        # The game stops when the active
-        if self.active_player == self.player_1:
+        if player is None:
+            player = self.player_1
+
+        # The game stops when the active player can't move anymore
+        if self.active_player == player:
             return float("-inf")
-        elif self.active_player == self.player_2:
+        elif self.active_player == self.get_opponent(player):
             return float("inf")
         else:
             return 0
@@ -174,23 +619,67 @@ class GameBoard:
         :return:
         """
 
-        cloned_board = GameBoard(self._board_width, self._board_height,
-                                 self.player_1, self.player_2)
-        cloned_board._board = [row[:] for row in self._board]  # Create a deep copy of the board
+        # Skip the constructor, the ray tables are shared and the active player is copied instead of drawn
+        cloned_board = GameBoard.__new__(GameBoard)
+        cloned_board._board_width = self._board_width
+        cloned_board._board_height = self._board_height
+        cloned_board._board = self._board  # Integers are immutable, so the bitboard can be shared
+        cloned_board._full_mask = self._full_mask
+        cloned_board._geometry = self._geometry
+        cloned_board._rays = self._rays
+        cloned_board._ascending = self._ascending
+        cloned_board._zobrist = self._zobrist
+        cloned_board._shadows = self._shadows
+        cloned_board._hash = self._hash
+        cloned_board._cells = self._cells[:]
+        cloned_board._active = self._active
+        cloned_board._moves = self._moves
         cloned_board.game_over = self.game_over
-        cloned_board.positions = self.positions.copy()
-        cloned_board.active_player = cloned_board.player_1 if self.active_player == self.player_1 else cloned_board.player_2
-        cloned_board.player_1 = self.player_1  # Clone player 1
-        cloned_board.player_2 = self.player_2  # Clone player 2
+        cloned_board.player_1 = self.player_1
+        cloned_board.player_2 = self.player_2
+        cloned_board._history = []
+        # The clones of the search aren't recorded
+        cloned_board.recorder = None
 
         return cloned_board
 
+    def to_bytes(self):
+        """
+        Serializes the position to a compact byte string, without the player objects. The players are stored by their
+        slot: 0 for player 1 and 1 for player 2.
+        Layout: width, height and the slot of the active player as bytes, the cells of both players as signed 16-bit
+        integers (-1 if not placed yet) and the bitboard of blocked cells in little-endian order.
+        Returns: bytes
+        """
+        header = struct.pack("<BBBhh", self._board_width, self._board_height, self._active, *self._cells)
+        return header + self._board.to_bytes((self._board_width * self._board_height + 7) // 8, "little")
+
+    @classmethod
+    def from_bytes(cls, data, player_1, player_2):
+        """
+        Builds a board from the bytes of to_bytes
+        Args:
+            data: The serialized position
+            player_1: The player for slot 0
+            player_2: The player for slot 1
+
+        Returns: The GameBoard
+        """
+        x_length, y_length, active_slot, cell_1, cell_2 = struct.unpack_from("<BBBhh", data)
+        board = cls(x_length, y_length, player_1, player_2)
+        for position in board.moves_from_mask(int.from_bytes(data[struct.calcsize("<BBBhh"):], "little")):
+            board.block_cell(position)
+        for player, cell in ((player_1, cell_1), (player_2, cell_2)):
+            board.set_position(player, list(divmod(cell, x_length)) if cell >= 0 else None)
+        board.active_player = player_1 if active_slot == 0 else player_2
+        return board
+
     def __str__(self):
         """
         Display the current game board with row and column labels.
         """
-        x_length = len(self._board[0])
-        y_length = len(self._board)
+        x_length = self._board_width
+        y_length = self._board_height
 
         # Column labels (characters A, B, C, ...)
         column_labels = "    " + "   ".join(chr(65 + i) for i in range(x_length))
@@ -199,7 +688,7 @@ class GameBoard:
         board_repr = []
         for y in range(y_length):
             row_label = str(y + 1).rjust(2)  # Row labels (numbers 1, 2, 3, ...)
-            row = [row_label] + [" T " if self._board[y][x] else " F " for x in range(x_length)]
+            row = [row_label] + [" T " if self._board >> (y * x_length + x) & 1 else " F " for x in range(x_length)]
             board_repr.append(" ".join(row))
 
         '''
@@ -260,7 +749,8 @@ class HumanPlayer(Player):
 
         Parameters:
         move (str): A move string in the format "A1" where the first character represents a column (letter) on the board,
-                    and the second character represents a row (number).
+                    and the other characters represent a row (number), e.g. "A10" on the larger boards. Input that
+                    isn't on the board is asked again.
         Returns:
         int: A zero-based index corresponding to the column specified in the move.
 
@@ -275,51 +765,167 @@ class HumanPlayer(Player):
         print(f"player position = {current_state.positions[current_state.active_player]}")
         legal_moves = current_state.get_legal_moves(current_state.positions[current_state.active_player])
 
-        # The user is asked to input a move
-        move_input = input("Please enter a move (e.g. 'A1'): ")
-
-        # The move is converted to a list of coordinates
-        move = [int(move_input[1]) - 1, ord(move_input[0].upper()) - 65]
-
-        print(f'{move_input} -> {move}')
-        print(f"These are the legal moves: {legal_moves}")
-        if move not in legal_moves:
+        while True:
+            # The user is asked to input a move
+            move_input = input("Please enter a move (e.g. 'A1'): ").strip()
+
+            # The move is converted to a list of coordinates, the row can have two digits on boards up to 16x16
+            column, row = move_input[:1].upper(), move_input[1:]
+            if not column.isalpha() or not row.isdecimal() or not 1 <= int(row) <= current_state._board_height \
+                    or not 0 <= ord(column) - 65 < current_state._board_width:
+                print(f"Invalid move. Enter a column from A to {chr(64 + current_state._board_width)} and a row from 1 "
+                      f"to {current_state._board_height}.")
+                continue
+            move = [int(row) - 1, ord(column) - 65]
+
+            print(f'{move_input} -> {move}')
+            print(f"These are the legal moves: {legal_moves}")
+            if move in legal_moves:
+                return move
             print("Invalid move. Please try again.")
-            move = self.human_decision(current_state)
 
-        return move
+
+class SearchTimeout(Exception):
+    """ Raised inside a search when the time budget of the move has run out """
 
 
 class ComputerPlayer(Player):
     """This subclass of Player representing an AI player. In this class different algortihms are worked out such as
         minimax algorithm with alpha-beta pruning and a depth limited search algorithm."""
 
-    def __init__(self, player_name):
+    def __init__(self, player_name, transposition_table=None, evaluation=None, tracer=None, opening_book=None,
+                 endgame_solver=None, move_ordering=None):
         """
         Constructor for the ComputerPlayer class.
         Args:
             player_name: Name of the player
+            transposition_table: Table of searched positions shared by all searches of this player. A new table is
+                created when none is given
+            evaluation: Heuristic that scores the positions where a depth limited search stops, see
+                backend.heuristics. The number of own moves if None
+            tracer: Follows the searches of this player, see backend.tracing. Searches aren't traced if None
+            opening_book: Book with the best first moves, see backend.book. get_actions answers from it while the game
+                is in the book
+            endgame_solver: Solves the positions where the players are walled off from each other, see
+                backend.endgame. The alpha-beta search returns the exact result of these positions instead of searching
+                them. Partitions aren't detected if None
+            move_ordering: Orders the moves of the alpha-beta search, see backend.ordering. Killer moves, the history
+                table and onward moves if None
         """
         super().__init__(player_name, "Computer")
+        self.evaluation = evaluation if evaluation is not None else OwnMoves()
+        self.transposition_table = transposition_table if transposition_table is not None else TranspositionTable()
+        self.tracer = tracer
+        self.opening_book = opening_book
+        self.endgame_solver = endgame_solver
+        self.move_ordering = move_ordering if move_ordering is not None else KillerHistoryOrdering()
+        # The root moves that lead to a mirror image of the position after another root move aren't searched. This
+        # needs an evaluation that scores mirror images the same, like all heuristics of backend.heuristics
+        self.prune_symmetric_moves = True
+        # get_actions searches every depth after the first with a window of this size on both sides of the score of
+        # the depth before. A window that doesn't hold the score is widened and the depth is searched again. With None
+        # every depth is searched with the full window
+        self.aspiration_window = 3
+        # Statistics of the last search, and the deadline of the running search. researches counts the subtrees and
+        # depths that were searched again with a wider window
+        self.nodes_searched = 0
+        self.researches = 0
+        self.depth_reached = 0
+        self.principal_variation = []
+        self.best_score = None
+        self._deadline = None
+
+    def choose_move(self, state, time_limit_ms=1000):
+        """
+        The move of the player in a game of the GameManager, an iterative deepening search within the time budget.
+        A search without a depth limit doesn't end on boards larger than a few cells
+        """
+        return self.get_actions(state, time_limit_ms=time_limit_ms)
 
     def my_moves(self, state):
-        my_available_moves = state.get_legal_moves(state.positions[state.active_player])
-
-        return len(my_available_moves)
+        """
+        The number of moves the computer player has in the given state
+        """
+        return OwnMoves().score(state, self)
 
-    def get_actions(self, state, min_depth):
+    def get_actions(self, state, min_depth=None, time_limit_ms=None):
         """
-        Function to get actions from the minimax_decision function to perform iterative deepening search. It will go
-        through a for loop to get the best move for each depth. The best move will be returned.
-        :param min_depth: The minimum depth the algorithm should search
+        Function to get actions from the alpha_beta_search function to perform iterative deepening search. It will go
+        through a loop to get the best move for each depth, starting at depth 1. Every iteration stores its best moves
+        in the transposition table, and the next, deeper, iteration searches those moves first.
+        The search stops when min_depth is reached, when the time limit runs out, or when a deeper search can't change
+        the result anymore. When the time runs out during an iteration, the best move of the last completed depth is
+        returned. A position of the opening book isn't searched, the move of the book is returned.
+        After the search, depth_reached, nodes_searched and principal_variation describe the search of this move.
+        :param min_depth: The minimum depth the algorithm should search, no limit if None
+        :param time_limit_ms: The wall-clock time budget for the move in milliseconds, no limit if None
         :param state:
         :return:
         """
 
-        best_move_for_depth = None
-        for d in range(1, min_depth + 1):
-            best_move_for_depth = self.minimax_decision(state, d)
+        if min_depth is None and time_limit_ms is None:
+            raise ValueError("Invalid search limits. Give a min_depth, a time_limit_ms or both.")
+
+        self.nodes_searched = 0
+        self.researches = 0
+        if self.opening_book is not None:
+            book_entry = self.opening_book.lookup(state)
+            if book_entry is not None:
+                move, self.depth_reached, self.best_score = book_entry
+                self.principal_variation = [move]
+                if self.tracer is not None:
+                    self.tracer.start_search(self, state, "opening_book")
+                    self.tracer.end_search(move, self.best_score, self.principal_variation)
+                return move
+
+        self._deadline = None if time_limit_ms is None else time.perf_counter() + time_limit_ms / 1000
+        self.depth_reached = 0
+        self.principal_variation = []
+        history_length = state.undo_count()
+        if self.tracer is not None:
+            self.tracer.start_search(self, state, "iterative_deepening")
+
+        # No game lasts longer than the number of open cells, deeper searches give the same result
+        max_depth = state.count_blanc()
+        if min_depth is not None:
+            max_depth = min(max_depth, min_depth)
 
+        best_move_for_depth = None
+        scores = []
+        try:
+            for d in range(1, max_depth + 1):
+                # The score of a depth is expected near the score two depths before, when the same player made the
+                # last move. With one player more to move the scores of mobility heuristics swing from depth to depth
+                move = self.aspiration_search(state, d, scores[-2] if len(scores) > 1 else None)
+                scores.append(self.best_score)
+                best_move_for_depth = move
+                self.depth_reached = d
+                self.principal_variation = self.get_principal_variation(state, d)
+                if self.tracer is not None:
+                    self.tracer.iteration(d, self.best_score, self.principal_variation)
+                # A won or lost game won't change with a deeper search
+                if self.best_score in (float("inf"), float("-inf")):
+                    break
+        except SearchTimeout:
+            # The interrupted search leaves its moves on the board, they are taken back
+            while state.undo_count() > history_length:
+                state.undo_move()
+            # A window that failed high or low before the timeout leaves a bound, the score of the move is the score
+            # of the last finished depth
+            self.best_score = scores[-1] if scores else None
+            if self.tracer is not None:
+                self.tracer.timeout()
+        finally:
+            self._deadline = None
+
+        # Even the first iteration didn't finish, any legal move is better than no move
+        if best_move_for_depth is None:
+            legal_moves = state.get_player_moves()
+            if legal_moves:
+                best_move_for_depth = legal_moves[0]
+
+        if self.tracer is not None:
+            self.tracer.end_search(best_move_for_depth, self.best_score, self.principal_variation)
         return best_move_for_depth
 
     def minimax_decision(self, current_state, depth=float("inf")):
@@ -336,22 +942,27 @@ class ComputerPlayer(Player):
         # The computer player wants to maximize its score, so the best score is set to -inf,
         # you only can go up from the position score
         best_score = float("-inf")
+        self.transposition_table.new_search()
+        if self.tracer is not None:
+            self.tracer.start_search(self, current_state, "minimax")
 
-        print(f"player active = {current_state.active_player}")
-        print(f"player position = {current_state.positions[current_state.active_player]}")
-        legal_moves = current_state.get_legal_moves(current_state.positions[current_state.active_player])
-        print(f"These are the legal moves: {legal_moves}")
+        legal_moves = current_state.get_player_moves()
+        if self.prune_symmetric_moves:
+            legal_moves = current_state.unique_moves(legal_moves)
 
         # Because the next step is to maximize the score, the computer player will start with the max_value function
         # The max_value function will return the best move and the best score
-        for move in current_state.get_legal_moves(current_state.positions[current_state.active_player]):
-            new_state = current_state.clone()
-            new_value = self.min_value(new_state.make_move(move), depth - 1)
-            if new_value > best_score:
+        for move in legal_moves:
+            current_state.apply_move(move)
+            new_value = self.min_value(current_state, depth - 1)
+            current_state.undo_move()
+            # A lost position still needs a move
+            if new_value > best_score or best_move is None:
                 best_score = new_value
-                print(f"best score = {best_score}")
                 best_move = move
 
+        if self.tracer is not None:
+            self.tracer.end_search(best_move, best_score, [] if best_move is None else [best_move])
         return best_move
 
     def min_value(self, state, depth):
@@ -363,24 +974,40 @@ class ComputerPlayer(Player):
         :return:
         """
 
+        self.count_node()
+        if self.tracer is not None:
+            self.tracer.node(state)
         if state.terminal_test():
-            return state.utility()
+            return state.utility(self)
 
-        print(f"Depth = {depth}")
         if depth <= 0:
-            return self.my_moves(state)
+            return self.evaluation.score(state, self)
             # return 0
 
+        # A position that was already searched at least as deep is taken from the transposition table
+        key = state.zobrist_hash()
+        entry = self.transposition_table.probe(key)
+        if entry is not None and entry.flag == EXACT and entry.depth >= depth:
+            return entry.value
+
         value = float("inf")
+        best_move = None
 
+        legal_moves = state.get_player_moves()
+        if self.tracer is not None:
+            self.tracer.expand(state, len(legal_moves))
         # Play out the moves from the new position
-        for move in state.get_legal_moves(state.positions[state.active_player]):
-            # change the state of the board by making a move. Copy the board state to prevent changing the original
-            new_state = state.clone()
-            new_value = self.max_value(new_state.make_move(move), depth - 1)
+        for move in legal_moves:
+            # change the state of the board by making a move. The move is taken back once the subtree is searched
+            state.apply_move(move)
+            new_value = self.max_value(state, depth - 1)
+            state.undo_move()
             # Based on the result of the played move, the human player will choose for min result for the computer
-            value = min(value, new_value)
+            if new_value < value or best_move is None:
+                value = new_value
+                best_move = move
 
+        self.transposition_table.store(key, depth, value, EXACT, best_move)
         return value
 
     def max_value(self, state, depth):
@@ -389,32 +1016,84 @@ class ComputerPlayer(Player):
         :return:
         """
 
+        self.count_node()
+        if self.tracer is not None:
+            self.tracer.node(state)
         # check if the game is over. If human wins, return -inf, if computer wins, return inf
         if state.terminal_test():
-            return state.utility()
+            return state.utility(self)
 
         if depth <= 0:
-            return self.my_moves(state)
+            return self.evaluation.score(state, self)
             # return 0
 
+        key = state.zobrist_hash()
+        entry = self.transposition_table.probe(key)
+        if entry is not None and entry.flag == EXACT and entry.depth >= depth:
+            return entry.value
+
         value = float("-inf")
+        best_move = None
 
+        legal_moves = state.get_player_moves()
+        if self.tracer is not None:
+            self.tracer.expand(state, len(legal_moves))
         # Play out the moves from the new position
-        for move in state.get_legal_moves(state.positions[state.active_player]):
+        for move in legal_moves:
             # The move will force the human player to make the next move
-            new_state = state.clone()
-            new_value = self.min_value(new_state.make_move(move), depth - 1)
+            state.apply_move(move)
+            new_value = self.min_value(state, depth - 1)
+            state.undo_move()
             # Based on the result of the played move, the computer player will choose for max result
-            value = max(value, new_value)
+            if new_value > value or best_move is None:
+                value = new_value
+                best_move = move
 
+        self.transposition_table.store(key, depth, value, EXACT, best_move)
         return value
 
-    def alpha_beta_search(self, current_state):
+    def aspiration_search(self, current_state, depth, guess):
+        """
+        Searches a depth of iterative deepening with an aspiration window: a narrow (alpha, beta) window around the
+        score of the depth before, which is usually close to the new score. A narrow window cuts off more of the tree.
+        When the score falls outside the window the search only returns a bound, so the window is widened on that side
+        and the depth is searched again, after three tries with the full window.
+        :param current_state:
+        :param depth: The number of moves to look ahead
+        :param guess: The expected score, the full window is used if None
+        :return: The best move
+        """
+
+        if guess is None or self.aspiration_window is None or guess in (float("inf"), float("-inf")):
+            return self.alpha_beta_search(current_state, depth)
+
+        lower = upper = self.aspiration_window
+        for _ in range(3):
+            alpha, beta = guess - lower, guess + upper
+            move = self.alpha_beta_search(current_state, depth, alpha, beta)
+            # A won or lost game is exact even outside the window
+            if alpha < self.best_score < beta or self.best_score in (float("inf"), float("-inf")):
+                return move
+            self.researches += 1
+            if self.best_score <= alpha:
+                lower = guess - self.best_score + lower * 2
+            else:
+                upper = self.best_score - guess + upper * 2
+        return self.alpha_beta_search(current_state, depth)
+
+    def alpha_beta_search(self, current_state, depth=float("inf"), alpha=float("-inf"), beta=float("inf")):
         """
         This function initiates the alpha beta pruning search algorithm. The algorithm will start the execution of
         a tree search where for every layer, the alpha or beta value will be found and the other branches will be pruned
-        Different from minimax, also because the algorithm start with the max_value function.
+        After the move of the computer player the opponent has to move, so every root move is answered by min_value.
+        The best move found so far raises alpha. The remaining root moves are searched as in principal variation
+        search, see max_value_alpha_beta.
+        With a window narrower than the full window a best_score at or below alpha is an upper bound, and at or above
+        beta a lower bound, of the score.
         :param current_state:
+        :param depth: The number of moves to look ahead, the search runs until the end of the game by default
+        :param alpha: The lower bound of the window
+        :param beta: The upper bound of the window
         :return:
         """
 
@@ -423,116 +1102,269 @@ class ComputerPlayer(Player):
         # The computer player wants to maximize its score, so the best score is set to -inf,
         # you only can go up from the position score
         best_score = float("-inf")
-        alpha = float("-inf")
-        beta = float("inf")
-
-        for move in current_state.get_legal_moves(current_state.positions[current_state.active_player]):
-            new_state = current_state.clone()
-            new_value = self.max_value_alpha_beta(new_state.make_move(move), alpha, beta)
-            # alpha = max(alpha, new_value) -> I think this would lead to initiate min_value instead of max_value
-            if new_value > best_score:
+        alpha_original = alpha
+        self.transposition_table.new_search()
+        self.move_ordering.new_search(current_state)
+        if self.tracer is not None:
+            self.tracer.start_search(self, current_state, "alpha_beta")
+
+        # The best move of a previous search of this position is searched first
+        key = current_state.zobrist_hash()
+        entry = self.transposition_table.probe(key)
+        legal_moves = self.order_moves(current_state, current_state.get_player_moves(),
+                                       entry.best_move if entry is not None else None)
+        if self.prune_symmetric_moves:
+            legal_moves = current_state.unique_moves(legal_moves)
+        for move in legal_moves:
+            current_state.apply_move(move)
+            if best_move is None:
+                new_value = self.min_value_alpha_beta(current_state, alpha, beta, depth - 1)
+            else:
+                new_value = self.min_value_alpha_beta(current_state, alpha, math.nextafter(alpha, math.inf), depth - 1)
+                if alpha < new_value < beta:
+                    self.researches += 1
+                    new_value = self.min_value_alpha_beta(current_state, alpha, beta, depth - 1)
+            current_state.undo_move()
+            if new_value > best_score or best_move is None:
                 best_score = new_value
                 best_move = move
+            if best_score >= beta:
+                break
+            alpha = max(alpha, best_score)
 
+        if best_move is not None:
+            self.store_alpha_beta(key, best_score, alpha_original, beta, depth, best_move)
+        self.best_score = best_score
+
+        if self.tracer is not None:
+            self.tracer.end_search(best_move, best_score, self.get_principal_variation(current_state, depth))
         return best_move
 
-    def max_value_alpha_beta(self, state, alpha, beta):
+    def order_moves(self, state, moves, first_move):
+        """
+        Orders the moves with the move ordering of the player. The move that was best in an earlier search of the
+        position goes in front, so alpha-beta finds a good bound with the first move and cuts off the other moves
+        earlier.
+        :param state: The position of the moves
+        :param moves: The legal moves in the order of get_legal_moves
+        :param first_move: The best move of an earlier search, or None
+        :return: The moves to search, in order
+        """
+
+        if not moves:
+            return moves
+        return self.move_ordering.order(state, moves, first_move)
+
+    def count_node(self):
+        """
+        Counts a searched node and stops the search with SearchTimeout once the deadline of get_actions has passed.
+        The clock is only read every 1024 nodes.
+        """
+
+        self.nodes_searched += 1
+        if self._deadline is not None and not self.nodes_searched & 1023 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+
+    def probe_alpha_beta(self, state, alpha, beta, depth):
+        """
+        Looks up the position in the transposition table for the alpha-beta helpers. A stored bound narrows the
+        (alpha, beta) window, and when the window closes the stored value can be returned right away. The stored best
+        move is returned as well, even if the entry is too shallow to use, to order the moves.
+        :param state:
+        :param alpha:
+        :param beta:
+        :param depth: The remaining depth of the search
+        :return: (key, value or None, alpha, beta, best move or None)
+        """
+
+        key = state.zobrist_hash()
+        entry = self.transposition_table.probe(key)
+        if entry is None:
+            return key, None, alpha, beta, None
+        if entry.depth < depth:
+            return key, None, alpha, beta, entry.best_move
+
+        if entry.flag == EXACT:
+            return key, entry.value, alpha, beta, entry.best_move
+        if entry.flag == LOWER:
+            alpha = max(alpha, entry.value)
+        elif entry.flag == UPPER:
+            beta = min(beta, entry.value)
+        if alpha >= beta:
+            return key, entry.value, alpha, beta, entry.best_move
+
+        return key, None, alpha, beta, entry.best_move
+
+    def store_alpha_beta(self, key, value, alpha, beta, depth, best_move):
+        """
+        Stores the value of an alpha-beta node with the bound type that follows from the window it was searched with
+        """
+
+        if value <= alpha:
+            flag = UPPER
+        elif value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.transposition_table.store(key, depth, value, flag, best_move)
+
+    def max_value_alpha_beta(self, state, alpha, beta, depth=float("inf")):
         """
         alpha at every state in the game tree α represents the guaranteed worst-case score that the MAX player could
         achieve.  If the estimate of the upper bound is ever lower than the estimate of the lower bound in any state,
         then the search can be cut off because there are no values between the upper and lower bounds.
+        The search is a principal variation search: the first move, the best move of an earlier search, is expected
+        to be the best and is searched with the (alpha, beta) window. The other moves only have to be proven worse, a
+        search with a null window just above alpha does that with far fewer nodes. Scores are floats, so the null
+        window is (alpha, the next float after alpha). A move that turns out better is searched again with the window.
         :param state:
         :param alpha:
         :param beta:
+        :param depth: The remaining number of moves to look ahead
         :return:
         """
 
+        self.count_node()
+        if self.tracer is not None:
+            self.tracer.node(state)
         if state.terminal_test():
-            return state.utility()
+            return state.utility(self)
+
+        if self.endgame_solver is not None:
+            value = self.endgame_solver.solve(state, self)
+            if value is not None:
+                return value
+
+        if depth <= 0:
+            return self.evaluation.score(state, self)
+
+        key, value, alpha, beta, tt_move = self.probe_alpha_beta(state, alpha, beta, depth)
+        if value is not None:
+            return value
+        alpha_original = alpha
 
         value = float("-inf")
+        best_move = None
 
-        for move in state.get_legal_moves(state.positions[state.active_player]):
-            new_state = state.clone()
-            value = max(value, self.min_value_alpha_beta(new_state.make_move(move), alpha, beta))
+        legal_moves = self.order_moves(state, state.get_player_moves(), tt_move)
+        if self.tracer is not None:
+            self.tracer.expand(state, len(legal_moves))
+        for move in legal_moves:
+            state.apply_move(move)
+            if best_move is None:
+                new_value = self.min_value_alpha_beta(state, alpha, beta, depth - 1)
+            else:
+                new_value = self.min_value_alpha_beta(state, alpha, math.nextafter(alpha, math.inf), depth - 1)
+                if alpha < new_value < beta:
+                    self.researches += 1
+                    new_value = self.min_value_alpha_beta(state, alpha, beta, depth - 1)
+            state.undo_move()
+            if new_value > value or best_move is None:
+                value = new_value
+                best_move = move
             if value >= beta:
-                return value
+                self.move_ordering.cutoff(state, move, depth)
+                if self.tracer is not None:
+                    self.tracer.cutoff(state, legal_moves.index(move))
+                break
             alpha = max(alpha, value)
 
+        self.store_alpha_beta(key, value, alpha_original, beta, depth, best_move)
         return value
 
-    def min_value_alpha_beta(self, state, alpha, beta):
+    def min_value_alpha_beta(self, state, alpha, beta, depth=float("inf")):
         """
         beta at every state in the game tree β represents the guaranteed worst-case score that the MIN player could
         achieve.  If the estimate of the lower bound is ever greater than the estimate of the upper bound in any state,
         then the search can be cut off because there are no values between the upper and lower bounds.
+        Like max_value_alpha_beta a principal variation search, the null window of the moves after the first is just
+        below beta.
         :param state:
         :param alpha:
         :param beta:
+        :param depth: The remaining number of moves to look ahead
         :return:
         """
 
+        self.count_node()
+        if self.tracer is not None:
+            self.tracer.node(state)
         if state.terminal_test():
-            return state.utility()
-
-        value = float("inf")
+            return state.utility(self)
 
-        for move in state.get_legal_moves(state.positions[state.active_player]):
-            new_state = state.clone()
-            value = min(value, self.max_value_alpha_beta(new_state.make_move(move), alpha, beta))
-            if value <= alpha:
+        if self.endgame_solver is not None:
+            value = self.endgame_solver.solve(state, self)
+            if value is not None:
                 return value
-            beta = min(beta, value)
 
+        if depth <= 0:
+            return self.evaluation.score(state, self)
 
-class GameManager:
+        key, value, alpha, beta, tt_move = self.probe_alpha_beta(state, alpha, beta, depth)
+        if value is not None:
+            return value
+        beta_original = beta
 
-    def __init__(self):
-        """
-        Constructor for the GameManager class.
-        """
-        self.game = None
+        value = float("inf")
+        best_move = None
 
-    def create_game(self):
-        """
-        Creates a game. Creates a computer player, asks for a human player and initiates the gameBoard,
-            game_type: The type of game to be created.
-        """
-        # The computer player is created
-        computer_player = ComputerPlayer("Computer")
-        human_player = HumanPlayer("Jantje")
+        legal_moves = self.order_moves(state, state.get_player_moves(), tt_move)
+        if self.tracer is not None:
+            self.tracer.expand(state, len(legal_moves))
+        for move in legal_moves:
+            state.apply_move(move)
+            if best_move is None:
+                new_value = self.max_value_alpha_beta(state, alpha, beta, depth - 1)
+            else:
+                new_value = self.max_value_alpha_beta(state, math.nextafter(beta, -math.inf), beta, depth - 1)
+                if alpha < new_value < beta:
+                    self.researches += 1
+                    new_value = self.max_value_alpha_beta(state, alpha, beta, depth - 1)
+            state.undo_move()
+            if new_value < value or best_move is None:
+                value = new_value
+                best_move = move
+            if value <= alpha:
+                self.move_ordering.cutoff(state, move, depth)
+                if self.tracer is not None:
+                    self.tracer.cutoff(state, legal_moves.index(move))
+                break
+            beta = min(beta, value)
 
-        # The game type is asked
-        game_type = input("Please enter the board size: small (2,3), medium (5,5) or standard (6,8)")
-        # The game is created
-        self.game = GameBoard(2, 3, human_player, computer_player)
+        self.store_alpha_beta(key, value, alpha, beta_original, depth, best_move)
+        return value
 
-    def play_game(self):
+    def get_principal_variation(self, state, max_length):
         """
-        This function plays the game. The game is played until the game is over. The game is over when the terminal
-        test is true, meaning a player has no more move left.
-        :return:
+        Follows the best moves stored in the transposition table from the given position. This is the line of play the
+        last search expects: the computer's best move, the best reply of the opponent, and so on.
+        :param state:
+        :param max_length: The maximum number of moves in the line
+        :return: List of moves
         """
 
-        # The game is played until the game is over
-        while not self.game.terminal_test():
-            # The game board is printed
-            print(f"\n --- A new round ---\n{self.game}")
+        principal_variation = []
+        while len(principal_variation) < max_length:
+            entry = self.transposition_table.probe(state.zobrist_hash())
+            if entry is None or entry.best_move is None:
+                break
+            if entry.best_move not in state.get_player_moves():
+                break
+            state.apply_move(entry.best_move)
+            principal_variation.append(entry.best_move)
 
-            # The current human player is asked to make a move
-            if self.game.active_player.player_type == "Human":
-                print(f"Your turn player: {self.game.active_player.player_name}!")
-                move = self.game.active_player.human_decision(self.game)
-            # A move is generated by the computer player
-            else:
-                print("Computer's turn!")
-                move = self.game.active_player.minimax_decision(self.game)
+        for _ in principal_variation:
+            state.undo_move()
+
+        return principal_variation
 
-            # The move is made
-            print(f"The move is processed in the board")
-            self.game.make_move(move)
 
-        print("Game over!")
+def __getattr__(name):
+    # The console game is loaded on first use, see backend.manager
+    if name == "GameManager":
+        from backend.manager import GameManager
+        return GameManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
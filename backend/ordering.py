@@ -0,0 +1,233 @@
+"""
+Move orderings for the alpha-beta search of the ComputerPlayer. Alpha-beta cuts off a node as soon as one move is
+good enough, so the earlier the best move is searched, the fewer moves are searched at all. get_legal_moves reports
+the moves in the order of the directions, which says nothing about how good a move is.
+
+The search calls these methods of the ordering:
+- new_search at the start of every alpha-beta search, also of every iteration of get_actions
+- order with the legal moves of every node. The best move of an earlier search of the node, from the transposition
+  table, is always searched first
+- cutoff for the move that cut off the search of a node
+
+MoveOrdering only puts the move of the transposition table in front. MobilityOrdering searches the moves to the cells
+with the most room around them first. KillerHistoryOrdering learns from the cutoffs of the search: killer moves cut
+off a sibling node at the same ply, and the history table counts the cutoffs of every target cell per player.
+
+The orderings run at every node that is expanded, so like the heuristics they only count bits of masks.
+"""
+
+from backend.geometry import get_geometry
+
+# Killer moves are searched before every move of the history table
+KILLER_SCORE = 1 << 60
+
+
+def line_masks(x_length, y_length):
+    """
+    For every cell the mask of the other cells on its row, its column and its diagonals: the cells a player on the
+    cell could reach on an empty board, see BoardGeometry.
+    Args:
+        x_length: width of the board
+        y_length: height of the board
+
+    Returns: tuple with the mask for every cell index y * x_length + x
+    """
+    return get_geometry(x_length, y_length).line_masks
+
+
+def open_lines(state):
+    """
+    Returns: (the line masks of the board, the mask of the open cells)
+    """
+    return state._geometry.line_masks, state._full_mask & ~state._board
+
+
+class MoveOrdering:
+    """
+    The order of get_legal_moves, only the best move of an earlier search goes first. Base class of the orderings.
+    """
+
+    name = "transposition_table"
+
+    def new_search(self, state):
+        """
+        An alpha-beta search of a position starts
+        Args:
+            state: The position at the root of the search
+        """
+
+    def order(self, state, moves, first_move):
+        """
+        Orders the moves of a node
+        Args:
+            state: The position of the node
+            moves: The legal moves, as [y, x], in the order of get_legal_moves
+            first_move: The best move of an earlier search of the node, or None
+
+        Returns: The moves to search, in order
+        """
+        return self.move_first(moves, first_move)
+
+    def cutoff(self, state, move, depth):
+        """
+        The search of a node was cut off after move
+        Args:
+            state: The position of the node
+            move: The move that cut off the search
+            depth: The remaining depth of the node
+        """
+
+    def export_state(self):
+        """
+        Returns: What the ordering learned from its searches as a list of integers, see import_state. Empty if it
+        doesn't learn
+        """
+        return []
+
+    def import_state(self, values):
+        """
+        Goes on from what another ordering of the same kind learned, see export_state and backend.checkpoint
+        Args:
+            values: The list of export_state
+        """
+
+    @staticmethod
+    def move_first(moves, first_move):
+        """
+        Returns: The moves with first_move in front, if it's one of the moves
+        """
+        if first_move is None or first_move == moves[0] or first_move not in moves:
+            return moves
+
+        moves = moves[:]
+        moves.remove(first_move)
+        moves.insert(0, first_move)
+        return moves
+
+    def __str__(self):
+        return self.name
+
+
+class MobilityOrdering(MoveOrdering):
+    """
+    Searches the moves to the cells with the most open cells on their lines first. A player with room around it is hard
+    to isolate, the same reason the heuristics count moves. The open cells on the lines estimate the moves after the
+    move: the exact count stops every line at its first blocked cell and costs about as much as evaluating the child.
+    """
+
+    name = "mobility"
+
+    def order(self, state, moves, first_move):
+        width = state._board_width
+        lines, open_cells = open_lines(state)
+        moves = sorted(moves, key=lambda move: -(lines[move[0] * width + move[1]] & open_cells).bit_count())
+        return self.move_first(moves, first_move)
+
+
+class KillerHistoryOrdering(MoveOrdering):
+    """
+    Orders the moves by what cut off the search before:
+    1) Killer moves: the last moves that cut off a node at the same ply. Sibling nodes are often refuted by the same
+       move
+    2) The history table: for every player and target cell, the cutoffs of moves to that cell, weighted by the
+       square of the remaining depth, so cutoffs near the root count most
+    3) The open cells on the lines of the target cell, as in MobilityOrdering, for moves without history
+    The killers of a ply are kept as long as the searches start from the same position. The history is halved with
+    every search, so the cutoffs of earlier moves of the game fade out.
+    """
+
+    name = "killer_history"
+
+    def __init__(self, killers=2, mobility=True):
+        """
+        Constructor for the KillerHistoryOrdering class
+        Args:
+            killers: Number of killer moves per ply
+            mobility: Order the moves without history and killers by the open cells on their lines
+        """
+        self.killers = killers
+        self.mobility = mobility
+        self._killers = {}
+        self._history = None
+        self._board_size = None
+        self._root = None
+
+    def new_search(self, state):
+        board_size = (state._board_width, state._board_height)
+        if board_size != self._board_size:
+            self._board_size = board_size
+            self._history = [[0] * (state._board_width * state._board_height) for _ in range(2)]
+        else:
+            for history in self._history:
+                for cell, value in enumerate(history):
+                    history[cell] = value >> 1
+
+        # Plies are counted from the root by the undo count of the board, the killers of another root don't fit
+        root = (state.zobrist_hash(), state.undo_count())
+        if root != self._root:
+            self._root = root
+            self._killers.clear()
+
+    def order(self, state, moves, first_move):
+        width = state._board_width
+        if self._board_size != (width, state._board_height):
+            # The helpers of the search can be called without new_search
+            self.new_search(state)
+        history = self._history[state._active]
+        killers = self._killers.get(state.undo_count(), ())
+        lines, open_cells = open_lines(state)
+        scores = []
+        for move in moves:
+            cell = move[0] * width + move[1]
+            score = KILLER_SCORE if cell in killers else history[cell]
+            if self.mobility:
+                # There are fewer than 256 open cells, the history decides between unequal moves
+                score = score * 256 + (lines[cell] & open_cells).bit_count()
+            scores.append(-score)
+        # Ties keep the order of get_legal_moves
+        moves = [moves[index] for index in sorted(range(len(moves)), key=scores.__getitem__)]
+        return self.move_first(moves, first_move)
+
+    def export_state(self):
+        # The killers belong to the plies of one search, only the history is kept
+        if self._history is None:
+            return []
+        return list(self._board_size) + self._history[0] + self._history[1]
+
+    def import_state(self, values):
+        if values:
+            width, height = values[:2]
+            cells = width * height
+            self._board_size = (width, height)
+            self._history = [list(values[2:2 + cells]), list(values[2 + cells:2 + 2 * cells])]
+
+    def cutoff(self, state, move, depth):
+        cell = move[0] * state._board_width + move[1]
+        # The search without a depth limit runs at most until the board is full
+        depth = min(depth, state.count_blanc())
+        self._history[state._active][cell] += depth * depth
+
+        killers = self._killers.setdefault(state.undo_count(), [])
+        if cell not in killers:
+            killers.insert(0, cell)
+            del killers[self.killers:]
+
+
+ORDERINGS = {
+    "transposition_table": MoveOrdering,
+    "mobility": MobilityOrdering,
+    "killer_history": KillerHistoryOrdering,
+}
+
+
+def get_ordering(name):
+    """
+    Creates a move ordering by its name
+    Args:
+        name: One of the names in ORDERINGS
+
+    Returns: The move ordering
+    """
+    if name not in ORDERINGS:
+        raise ValueError(f"Invalid move ordering. Must be one of {', '.join(ORDERINGS)}.")
+    return ORDERINGS[name]()
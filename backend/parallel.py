@@ -0,0 +1,230 @@
+"""
+Root-parallel alpha-beta search for the ComputerPlayer. The moves at the root of the search tree are divided over a
+pool of worker processes.
+
+The search follows young brothers wait: the first (eldest) root move, the best move of the previous search, is
+searched on its own to get a bound. The other root moves are then searched in parallel against that bound. Workers
+share the best value found so far (alpha) through shared memory: a worker reads it when it starts a move and raises it
+when it finds a better move, so moves that start later are searched with a narrower window.
+
+Workers receive the position as the compact bytes of GameBoard.to_bytes instead of pickled Player objects, and keep
+their own transposition table between tasks. Their players search with copies of the endgame solver and the move
+ordering of the ParallelComputerPlayer, taken when the pool starts.
+"""
+import copy
+import time
+
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer, SearchTimeout
+
+# Layout of the shared array: the id of the running search and the best value of that search
+_SEARCH_ID = 0
+_ALPHA = 1
+
+# State of a worker process, set by _init_worker
+_shared_alpha = None
+_worker_players = None
+_worker_opponent = None
+# The last root search of each worker player, see _search_move
+_worker_search_ids = None
+
+
+def _init_worker(shared_alpha, endgame_solver=None, move_ordering=None):
+    """
+    Initializes a worker process with the shared alpha and the players that the positions are rebuilt with. The players
+    search with their own copies of the endgame solver and the move ordering
+    """
+    global _shared_alpha, _worker_players, _worker_opponent, _worker_search_ids
+    _shared_alpha = shared_alpha
+    if endgame_solver is not None:
+        # The longest paths of the search process don't carry over
+        endgame_solver.clear()
+    # One player per slot: the values in a table are scored for the player that searched them, and the hash of a
+    # position doesn't tell which slot searched it
+    _worker_players = tuple(ComputerPlayer("Worker", endgame_solver=copy.deepcopy(endgame_solver),
+                                           move_ordering=copy.deepcopy(move_ordering)) for _ in range(2))
+    _worker_opponent = HumanPlayer("Opponent")
+    _worker_search_ids = [None, None]
+
+
+def _search_move(search_id, board_bytes, player_slot, move, evaluation, depth, time_left, alpha=float("-inf"),
+                 beta=float("inf")):
+    """
+    Searches one root move in a worker process
+    Args:
+        search_id: The id of the root search the move belongs to
+        board_bytes: The position before the move, see GameBoard.to_bytes
+        player_slot: The slot of the searching player, 0 or 1
+        move: The root move to search
+        evaluation: The heuristic of the searching player
+        depth: The depth of the root search
+        time_left: Seconds left before the deadline of the search, or None
+        alpha: The lower bound of the window of the root search, raised by the shared alpha
+        beta: The upper bound of the window of the root search
+
+    Returns: (move, value, alpha the move was searched with, nodes searched, timed out)
+    """
+    player = _worker_players[player_slot]
+    # The transposition table only holds values of the heuristic it was filled with
+    if type(evaluation) is not type(player.evaluation) or vars(evaluation) != vars(player.evaluation):
+        player.evaluation = evaluation
+        player.transposition_table.clear()
+
+    players = (player, _worker_opponent) if player_slot == 0 else (_worker_opponent, player)
+    state = GameBoard.from_bytes(board_bytes, *players)
+    if _worker_search_ids[player_slot] != search_id:
+        # The first move of a root search in this worker: the table ages its entries, and the ordering halves its
+        # history and forgets the killers of the last root
+        _worker_search_ids[player_slot] = search_id
+        player.transposition_table.new_search()
+        player.move_ordering.new_search(state)
+
+    with _shared_alpha.get_lock():
+        if _shared_alpha[_SEARCH_ID] == search_id:
+            alpha = max(alpha, _shared_alpha[_ALPHA])
+
+    player.nodes_searched = 0
+    player._deadline = None if time_left is None else time.perf_counter() + time_left
+    state.apply_move(move)
+    try:
+        value = player.min_value_alpha_beta(state, alpha, beta, depth - 1)
+    except SearchTimeout:
+        return move, None, alpha, player.nodes_searched, True
+    finally:
+        player._deadline = None
+
+    # Share a better root value with the workers that start a move later
+    with _shared_alpha.get_lock():
+        if _shared_alpha[_SEARCH_ID] == search_id and value > _shared_alpha[_ALPHA]:
+            _shared_alpha[_ALPHA] = value
+
+    return move, value, alpha, player.nodes_searched, False
+
+
+class ParallelComputerPlayer(ComputerPlayer):
+    """
+    A ComputerPlayer that divides the root moves of alpha_beta_search, and so of every iteration of get_actions, over a
+    pool of worker processes. The pool is started with the first search and stays alive until close is called.
+    """
+
+    def __init__(self, player_name, workers=4, transposition_table=None, evaluation=None, endgame_solver=None,
+                 move_ordering=None):
+        """
+        Constructor for the ParallelComputerPlayer class.
+        Args:
+            player_name: Name of the player
+            workers: Number of worker processes
+            transposition_table: see ComputerPlayer
+            evaluation: see ComputerPlayer
+            endgame_solver: see ComputerPlayer, the workers search with a copy
+            move_ordering: see ComputerPlayer, the workers search with a copy
+        """
+        super().__init__(player_name, transposition_table, evaluation, endgame_solver=endgame_solver,
+                         move_ordering=move_ordering)
+        if workers < 1:
+            raise ValueError("Invalid number of workers. Must be at least 1.")
+
+        self.workers = workers
+        # The root moves are searched with the full window, see alpha_beta_search
+        self.aspiration_window = None
+        self._executor = None
+        self._shared_alpha = None
+        self._search_id = 0
+
+    def start(self):
+        """
+        Starts the worker processes, if they aren't running yet
+        """
+        if self._executor is None:
+            # Loaded with the first pool, importing this module doesn't pay for multiprocessing
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self._shared_alpha = multiprocessing.Array("d", [0, float("-inf")])
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self._shared_alpha, self.endgame_solver,
+                                                           self.move_ordering))
+
+    def close(self):
+        """
+        Stops the worker processes
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def alpha_beta_search(self, current_state, depth=float("inf"), alpha=float("-inf"), beta=float("inf")):
+        """
+        The parallel version of ComputerPlayer.alpha_beta_search. The eldest root move is searched in this process,
+        the others in the worker processes.
+        :param current_state:
+        :param depth: The number of moves to look ahead, the search runs until the end of the game by default
+        :param alpha: The lower bound of the window
+        :param beta: The upper bound of the window
+        :return:
+        """
+
+        self.start()
+        self.transposition_table.new_search()
+        self._search_id += 1
+
+        key = current_state.zobrist_hash()
+        entry = self.transposition_table.probe(key)
+        legal_moves = current_state.get_player_moves()
+        if not legal_moves:
+            self.best_score = current_state.utility(self)
+            return None
+        self.move_ordering.new_search(current_state)
+        legal_moves = self.order_moves(current_state, legal_moves, entry.best_move if entry is not None else None)
+        if self.prune_symmetric_moves:
+            legal_moves = current_state.unique_moves(legal_moves)
+
+        # Young brothers wait: the eldest brother gives the bound for the others
+        best_move = legal_moves[0]
+        current_state.apply_move(best_move)
+        try:
+            best_score = self.min_value_alpha_beta(current_state, alpha, beta, depth - 1)
+        finally:
+            current_state.undo_move()
+
+        if best_score < beta:
+            with self._shared_alpha.get_lock():
+                self._shared_alpha[_SEARCH_ID] = self._search_id
+                self._shared_alpha[_ALPHA] = max(alpha, best_score)
+
+            board_bytes = current_state.to_bytes()
+            player_slot = 0 if self == current_state.player_1 else 1
+            time_left = None if self._deadline is None else max(self._deadline - time.perf_counter(), 0)
+            futures = [self._executor.submit(_search_move, self._search_id, board_bytes, player_slot, move,
+                                             self.evaluation, depth, time_left, alpha, beta)
+                       for move in legal_moves[1:]]
+
+            # A move is only better than the best move if its value is above the alpha it was searched with, otherwise
+            # the value is an upper bound. Equal values are decided by the move order, as in the sequential search.
+            timed_out = False
+            for future in futures:
+                if future.cancelled():
+                    continue
+                move, value, move_alpha, nodes, move_timed_out = future.result()
+                self.nodes_searched += nodes
+                if move_timed_out and not timed_out:
+                    timed_out = True
+                    # The moves that haven't started yet would time out as well
+                    for other in futures:
+                        other.cancel()
+                if not timed_out and value > move_alpha and value > best_score:
+                    best_score = value
+                    best_move = move
+
+            if timed_out:
+                raise SearchTimeout()
+
+        # With a narrower window than the full window the score can be a bound, see ComputerPlayer.alpha_beta_search
+        self.store_alpha_beta(key, best_score, alpha, beta, depth, best_move)
+        self.best_score = best_score
+        return best_move
@@ -0,0 +1,207 @@
+"""
+Pondering: the ComputerPlayer searches on the time of the opponent. After its own move the player would sit idle while
+a human types a move, so a Ponderer searches in a background thread until the opponent has moved:
+- predicted: the position after the reply the player expects, the second move of the principal variation of its last
+  search. When the opponent plays that reply (a ponder hit) the running search becomes the search of the move: it gets
+  the time budget of the move on top of the time it already had
+- all: every reply of the opponent, one depth at a time. Whatever the opponent plays, the transposition table holds
+  the searches of that reply, and the search of the move finishes the first depths at once
+
+The pondering search shares the transposition table, evaluation, endgame solver and move ordering of the player, so
+after a wrong prediction its work is still in the table. Only one search runs at a time: the search of the move starts
+after pondering has stopped.
+
+PonderStats counts the hits and the seconds of search the moves got from pondering. It is used by backend.jobs as well,
+where the workers ponder the moves of the web API.
+"""
+import threading
+import time
+
+from backend.new_game import ComputerPlayer, SearchTimeout
+
+PONDER_MODES = ("predicted", "all")
+
+
+class PonderStats:
+    """
+    The ponder hits and misses of a player, and the seconds of search that pondering saved
+    """
+
+    def __init__(self):
+        self.ponders = 0
+        self.hits = 0
+        self.seconds_saved = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, hit, seconds_saved=0.0):
+        """
+        Counts a pondered move of the opponent
+        Args:
+            hit: True if the position after the move of the opponent was searched
+            seconds_saved: The seconds the search of the position already had
+        """
+        with self._lock:
+            self.ponders += 1
+            if hit:
+                self.hits += 1
+                self.seconds_saved += seconds_saved
+
+    def to_dict(self):
+        """
+        Returns: The statistics as a dictionary that can be sent as JSON
+        """
+        with self._lock:
+            return {
+                "ponders": self.ponders,
+                "hits": self.hits,
+                "hit_rate": self.hits / self.ponders if self.ponders else 0.0,
+                "seconds_saved": self.seconds_saved,
+                "seconds_saved_per_move": self.seconds_saved / self.ponders if self.ponders else 0.0,
+            }
+
+
+class PonderingPlayer(ComputerPlayer):
+    """
+    The ComputerPlayer of the background search. It shares the tables of the player it ponders for, and stops when
+    pondering is stopped or, after a ponder hit, when the time budget of the move has run out.
+    """
+
+    def __init__(self, player):
+        super().__init__(player.player_name, transposition_table=player.transposition_table,
+                         evaluation=player.evaluation, opening_book=player.opening_book,
+                         endgame_solver=player.endgame_solver, move_ordering=player.move_ordering)
+        self.prune_symmetric_moves = player.prune_symmetric_moves
+        self.aspiration_window = player.aspiration_window
+        self.stop_event = threading.Event()
+        # Set by the thread of the game after a ponder hit, the pondering search has no deadline of its own
+        self.ponder_deadline = None
+
+    def count_node(self):
+        super().count_node()
+        if not self.nodes_searched & 1023:
+            if self.stop_event.is_set() or (self.ponder_deadline is not None
+                                            and time.perf_counter() > self.ponder_deadline):
+                raise SearchTimeout()
+
+
+class Ponderer:
+    """
+    Ponders for a ComputerPlayer. Call start after every move of the player, and get_actions instead of
+    player.get_actions to search the next move of the player.
+    """
+
+    def __init__(self, player, mode="predicted"):
+        """
+        Constructor for the Ponderer class
+        Args:
+            player: The ComputerPlayer
+            mode: What is searched on the time of the opponent, one of PONDER_MODES
+        """
+        if mode not in PONDER_MODES:
+            raise ValueError(f"Invalid ponder mode. Must be one of {', '.join(PONDER_MODES)}.")
+        self.player = player
+        self.mode = mode
+        self.stats = PonderStats()
+        self._thread = None
+        self._searcher = None
+        self._started = None
+        # predicted: the hash of the pondered position, and the move, depth, score and line found for it
+        self._target = None
+        self._result = None
+        # all: the seconds of search every reply got, by the hash of the position after the reply
+        self._seconds = {}
+
+    def start(self, state):
+        """
+        Starts pondering, it stops a pondering that is still running
+        Args:
+            state: The position after the move of the player, the opponent is to move
+        """
+        self.stop()
+        replies = state.get_player_moves()
+        if state.active_player is self.player or not replies:
+            return
+
+        searcher = PonderingPlayer(self.player)
+        board = state.clone()
+        board.player_1 = searcher if board.player_1 is self.player else board.player_1
+        board.player_2 = searcher if board.player_2 is self.player else board.player_2
+        prediction = self.player.principal_variation[1] if len(self.player.principal_variation) > 1 else None
+
+        self._searcher = searcher
+        self._started = time.perf_counter()
+        self._result = None
+        self._seconds = {}
+        if self.mode == "predicted" and prediction in replies:
+            board.make_move(prediction)
+            self._target = board.zobrist_hash()
+            target = self._ponder_predicted
+        else:
+            self._target = None
+            target = self._ponder_all
+        self._thread = threading.Thread(target=target, args=(searcher, board), daemon=True)
+        self._thread.start()
+
+    def _ponder_predicted(self, searcher, board):
+        # The search runs until it's stopped, the game is decided, or the board is full
+        move = searcher.get_actions(board, min_depth=max(board.count_blanc(), 1))
+        self._result = (move, searcher.depth_reached, searcher.best_score, searcher.principal_variation,
+                        searcher.nodes_searched)
+
+    def _ponder_all(self, searcher, board):
+        replies = board.get_player_moves()
+        for depth in range(1, board.count_blanc() + 1):
+            for reply in replies:
+                board.apply_move(reply)
+                key = board.zobrist_hash()
+                start = time.perf_counter()
+                try:
+                    if not board.terminal_test():
+                        searcher.alpha_beta_search(board, depth)
+                except SearchTimeout:
+                    return
+                finally:
+                    while board.undo_count():
+                        board.undo_move()
+                    self._seconds[key] = self._seconds.get(key, 0.0) + time.perf_counter() - start
+
+    def stop(self):
+        """
+        Stops pondering and waits for the background search to end
+        """
+        if self._thread is not None:
+            self._searcher.stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def get_actions(self, state, min_depth=None, time_limit_ms=None):
+        """
+        Searches the move of the player, see ComputerPlayer.get_actions. On a ponder hit of the predicted mode the
+        pondering search goes on with the time budget and its move is returned, otherwise pondering is stopped and
+        the player searches the position.
+        """
+        if self._thread is None:
+            return self.player.get_actions(state, min_depth, time_limit_ms)
+
+        key = state.zobrist_hash()
+        if self._target is not None and key == self._target and min_depth is None and time_limit_ms is not None:
+            seconds_saved = time.perf_counter() - self._started
+            self._searcher.ponder_deadline = time.perf_counter() + time_limit_ms / 1000
+            self._thread.join()
+            self._thread = None
+            self.stats.record(True, seconds_saved)
+            move, depth_reached, best_score, principal_variation, nodes = self._result
+            if move is not None:
+                self.player.depth_reached = depth_reached
+                self.player.best_score = best_score
+                self.player.principal_variation = principal_variation
+                self.player.nodes_searched = nodes
+                return move
+            return self.player.get_actions(state, min_depth, time_limit_ms)
+
+        # The pondered position without a time budget to go on with, a wrong prediction, or the mode all: the search
+        # of the move finds the work of pondering in the transposition table
+        self.stop()
+        seconds = time.perf_counter() - self._started if key == self._target else self._seconds.get(key, 0.0)
+        self.stats.record(seconds > 0, seconds)
+        return self.player.get_actions(state, min_depth, time_limit_ms)
@@ -0,0 +1,255 @@
+"""
+Compact binary records of whole games, to keep every game that is played and to analyze them offline. A game is
+stored as its board size and its moves, a move takes one byte on boards up to 127 cells and two bytes on larger
+boards. The positions of a game are rebuilt by replaying the moves.
+
+Layout of a record file:
+- header: magic b"ISOR" and the version
+- the games, one after the other: width, height and the slot of the player that moved first as bytes, the cell index
+  + 1 of every move as a varint (7 bits per byte, the high bit is set on all bytes but the last), and a 0 byte that
+  ends the game. A varint never ends with a 0 byte, so the end of a game is the first 0 byte after its size.
+
+A RecordWriter appends whole games to a file. A GameRecorder collects the moves of one GameBoard as they are made with
+make_move and writes the game when it's over, so the games of many boards can share one file. read_games streams the
+games of a file in chunks, and replay rebuilds the positions of a game one move at a time.
+"""
+import os
+import struct
+import threading
+from collections import namedtuple
+
+from backend.new_game import GameBoard, HumanPlayer
+
+MAGIC = b"ISOR"
+VERSION = 1
+HEADER = struct.Struct("<4sB")
+GAME_HEADER_SIZE = 3
+
+
+def encode_varint(value):
+    """
+    Returns: The bytes of a non-negative integer as a varint
+    """
+    data = bytearray()
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+def decode_cells(data):
+    """
+    Decodes the moves of a game
+    Args:
+        data: The varints of the moves, without the 0 byte that ends the game
+
+    Returns: List of cell indices
+    """
+    # On boards up to 127 cells every move is one byte
+    if max(data, default=0) < 0x80:
+        return [value - 1 for value in data]
+
+    cells = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            cells.append(value - 1)
+            value = shift = 0
+    return cells
+
+
+class GameRecord(namedtuple("GameRecord", ["x_length", "y_length", "first_slot", "cells"])):
+    """
+    A recorded game: the board size, the slot of the player that moved first and the cell indices of the moves
+    """
+
+    __slots__ = ()
+
+    def moves(self):
+        """
+        Returns: The moves as [y, x]
+        """
+        return [list(divmod(cell, self.x_length)) for cell in self.cells]
+
+    def to_bytes(self):
+        """
+        Returns: The game in the layout of a record file
+        """
+        return (bytes((self.x_length, self.y_length, self.first_slot))
+                + b"".join(encode_varint(cell + 1) for cell in self.cells) + b"\0")
+
+
+class RecordWriter:
+    """
+    Appends games to a record file. The writer is safe to use from several threads, every game is written at once.
+    """
+
+    def __init__(self, path):
+        """
+        Opens a record file, a new file is created with the header
+        Args:
+            path: The path of the record file
+        """
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as file:
+                _check_header(file.read(HEADER.size), path)
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION))
+        self._lock = threading.Lock()
+        self.games = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Writes the buffered games and closes the file
+        """
+        with self._lock:
+            self._file.close()
+
+    def flush(self):
+        """
+        Writes the buffered games to the file
+        """
+        with self._lock:
+            self._file.flush()
+
+    def write_game(self, record):
+        """
+        Appends a game
+        Args:
+            record: The GameRecord
+        """
+        data = record.to_bytes()
+        with self._lock:
+            self._file.write(data)
+            self.games += 1
+
+    def record(self, board):
+        """
+        Records the moves that are made on a board from now on, see GameRecorder
+        Args:
+            board: A GameBoard where no move has been made yet
+
+        Returns: The GameRecorder, also set as board.recorder
+        """
+        board.recorder = GameRecorder(self, board)
+        return board.recorder
+
+
+class GameRecorder:
+    """
+    Collects the moves of one GameBoard, GameBoard.make_move passes every move to record_move. The game is written
+    when it's over, or when finish is called for a game that is abandoned.
+    """
+
+    def __init__(self, writer, board):
+        """
+        Constructor for the GameRecorder class
+        Args:
+            writer: The RecordWriter the game is written to
+            board: The GameBoard, no move may have been made on it yet
+        """
+        if board._board or board._cells != [-1, -1]:
+            raise ValueError("Invalid board. A game is recorded from its first move.")
+        self.writer = writer
+        self.board = board
+        self.first_slot = None
+        self.cells = []
+        self.finished = False
+
+    def record_move(self, cell):
+        """
+        Records a move that was made on the board, and writes the game once it's over
+        Args:
+            cell: The cell index of the move
+        """
+        if self.first_slot is None:
+            # The initiative has passed already, the player that moved is the other one
+            self.first_slot = self.board._active ^ 1
+        self.cells.append(cell)
+        if self.board.terminal_test():
+            self.finish()
+
+    def finish(self):
+        """
+        Writes the game, if it isn't written yet, and stops recording the board. A game without moves isn't written.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        if self.board.recorder is self:
+            self.board.recorder = None
+        if self.cells:
+            self.writer.write_game(GameRecord(self.board._board_width, self.board._board_height, self.first_slot,
+                                              self.cells))
+
+
+def _check_header(data, path):
+    if len(data) < HEADER.size or HEADER.unpack(data) != (MAGIC, VERSION):
+        raise ValueError(f"Invalid record file {path}. Not a version {VERSION} game record file.")
+
+
+def read_games(path, chunk_size=1 << 16):
+    """
+    Streams the games of a record file. The file is read in chunks, so files with millions of games don't have to fit
+    in memory.
+    Args:
+        path: The path of the record file
+        chunk_size: The number of bytes that are read at once
+
+    Returns: Generator of GameRecords
+    """
+    with open(path, "rb") as file:
+        _check_header(file.read(HEADER.size), path)
+        buffer = b""
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            buffer += chunk
+            position = 0
+            while True:
+                end = buffer.find(0, position + GAME_HEADER_SIZE)
+                if end < 0:
+                    break
+                x_length, y_length, first_slot = buffer[position:position + GAME_HEADER_SIZE]
+                yield GameRecord(x_length, y_length, first_slot,
+                                 decode_cells(buffer[position + GAME_HEADER_SIZE:end]))
+                position = end + 1
+            # The rest of the buffer is the start of the next game
+            buffer = buffer[position:]
+
+    if buffer:
+        raise ValueError(f"Invalid record file {path}. The last game is truncated.")
+
+
+def replay(record, player_1=None, player_2=None):
+    """
+    Rebuilds the positions of a game one move at a time. The same GameBoard is yielded for every position, changed in
+    place, clone it to keep a position.
+    Args:
+        record: The GameRecord
+        player_1: The player for slot 0, a HumanPlayer if None
+        player_2: The player for slot 1, a HumanPlayer if None
+
+    Returns: Generator of the GameBoard before the first move and after every move
+    """
+    player_1 = player_1 if player_1 is not None else HumanPlayer("Player 1")
+    player_2 = player_2 if player_2 is not None else HumanPlayer("Player 2")
+    board = GameBoard(record.x_length, record.y_length, player_1, player_2)
+    board.active_player = player_1 if record.first_slot == 0 else player_2
+    yield board
+    for move in record.moves():
+        if not board.make_move(move):
+            raise ValueError(f"Invalid record. The move {move} isn't legal.")
+        yield board
@@ -0,0 +1,288 @@
+"""
+In-process store of the games of the web API. Every game is a GameSession that keeps its GameBoard and players alive
+between requests, so a request only looks up the session and makes its move.
+
+The SessionStore evicts games:
+- that haven't been used for ttl_seconds
+- the least recently used game, when there are more than max_games games
+- the least recently used games, when the estimated memory of all games is above max_bytes. Most memory of a game is
+  the transposition table and the endgame solver of its computer player, which grow with every computer move
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from backend.book import find_book
+from backend.endgame import EndgameSolver
+from backend.geometry import board_size
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer
+from backend.transposition import TranspositionTable
+
+# Estimated memory of a game without its transposition table (board, players, session), of one table entry and of one
+# longest path of the endgame solver
+SESSION_BYTES = 4096
+TABLE_ENTRY_BYTES = 250
+PATH_ENTRY_BYTES = 150
+
+
+class GameNotFound(KeyError):
+    """ The game doesn't exist, or has been evicted """
+
+
+class TurnError(Exception):
+    """ The move is made by the player that doesn't have initiative, or after the game is over """
+
+
+class GameSession:
+    """
+    A game between a human player and the computer player of the web API. Moves on one session are serialized by its
+    lock.
+    """
+
+    def __init__(self, game_id, x_length, y_length, human_first, player_name, table_size, opening_books=True,
+                 records=None):
+        """
+        Constructor for the GameSession class
+        Args:
+            game_id: Unique id of the game
+            x_length: width of the board
+            y_length: height of the board
+            human_first: True if the human player starts the game
+            player_name: Name of the human player
+            table_size: Number of slots of the transposition table of the computer player
+            opening_books: The computer player answers the first moves from the opening book of the board, if any
+            records: The RecordWriter the game is recorded to, see backend.records. The game isn't recorded if None
+        """
+        self.game_id = game_id
+        self.human_player = HumanPlayer(player_name)
+        self.computer_player = ComputerPlayer("Computer", transposition_table=TranspositionTable(table_size),
+                                              opening_book=find_book(x_length, y_length) if opening_books else None,
+                                              endgame_solver=EndgameSolver())
+        self.board = GameBoard(x_length, y_length, self.human_player, self.computer_player)
+        self.board.active_player = self.human_player if human_first else self.computer_player
+        if records is not None:
+            records.record(self.board)
+        self.lock = threading.Lock()
+        # The id of the job that searches the next computer move, see backend.jobs
+        self.pending_job = None
+        self.last_access = 0.0
+        self.accounted_bytes = 0
+
+    def close(self):
+        """
+        Ends the game. The moves of a game that isn't over yet are recorded as they are. The lock isn't taken, the
+        store closes evicted games while a search may still hold it
+        """
+        recorder = self.board.recorder
+        if recorder is not None:
+            recorder.finish()
+
+    def memory(self):
+        """
+        Returns: The estimated memory of the game in bytes
+        """
+        return (SESSION_BYTES + len(self.computer_player.transposition_table) * TABLE_ENTRY_BYTES
+                + len(self.computer_player.endgame_solver) * PATH_ENTRY_BYTES)
+
+    def human_move(self, move):
+        """
+        Makes a move for the human player
+        Args:
+            move: [y, x] move
+
+        Returns: The move
+        """
+        with self.lock:
+            if self.board.terminal_test():
+                raise TurnError("Invalid move. The game is over.")
+            if self.board.active_player is not self.human_player:
+                raise TurnError("Invalid move. It's the turn of the computer.")
+            if not self.board.make_move(move):
+                raise ValueError("Invalid move. The move must be one of the legal moves.")
+            return move
+
+    def computer_move(self, depth=None, time_limit_ms=None):
+        """
+        Searches and makes a move for the computer player with iterative deepening, see ComputerPlayer.get_actions
+        Args:
+            depth: The depth to search to, no limit if None
+            time_limit_ms: The time budget of the search, no limit if None
+
+        Returns: The move
+        """
+        with self.lock:
+            if self.board.terminal_test():
+                raise TurnError("Invalid move. The game is over.")
+            if self.board.active_player is not self.computer_player:
+                raise TurnError("Invalid move. It's the turn of the human player.")
+            move = self.computer_player.get_actions(self.board, depth, time_limit_ms)
+            self.board.make_move(move)
+            return move
+
+    def search_request(self):
+        """
+        Checks that the computer player is to move and returns what a search in another process needs
+        Returns: (board as GameBoard.to_bytes, slot of the computer player)
+        """
+        with self.lock:
+            if self.board.terminal_test():
+                raise TurnError("Invalid move. The game is over.")
+            if self.board.active_player is not self.computer_player:
+                raise TurnError("Invalid move. It's the turn of the human player.")
+            return self.board.to_bytes(), 0 if self.board.player_1 is self.computer_player else 1
+
+    def play_computer_move(self, move):
+        """
+        Makes a move that was searched for the computer player elsewhere, see search_request
+        """
+        with self.lock:
+            if self.board.active_player is not self.computer_player or not self.board.make_move(move):
+                raise ValueError("Invalid move. The move must be one of the legal moves of the computer player.")
+            return move
+
+    def to_dict(self):
+        """
+        Returns: The state of the game as a dictionary that can be sent as JSON
+        """
+        board = self.board
+        game_over = board.terminal_test()
+        winner = None
+        if game_over:
+            # The player that can't move has lost
+            winner = "human" if board.active_player is self.computer_player else "computer"
+        return {
+            "game_id": self.game_id,
+            "width": board._board_width,
+            "height": board._board_height,
+            "blocked": [[cell // board._board_width, cell % board._board_width]
+                        for cell in range(board._board_width * board._board_height) if board._board >> cell & 1],
+            "positions": {"human": board.positions[self.human_player],
+                          "computer": board.positions[self.computer_player]},
+            "active": "human" if board.active_player is self.human_player else "computer",
+            "legal_moves": [] if game_over else board.get_player_moves(),
+            "game_over": game_over,
+            "winner": winner,
+        }
+
+
+class SessionStore:
+    """
+    The games of the web API by game id, in least recently used order. The store is safe to use from the threads of
+    the web server.
+    """
+
+    def __init__(self, max_games=10000, ttl_seconds=3600, max_bytes=256 * 1024 * 1024, table_size=1 << 14,
+                 opening_books=True, records=None, clock=time.monotonic):
+        """
+        Constructor for the SessionStore class
+        Args:
+            max_games: Maximum number of games
+            ttl_seconds: Games that haven't been used for this time are evicted
+            max_bytes: Maximum estimated memory of all games
+            table_size: Number of slots of the transposition table of every computer player
+            opening_books: The computer players answer the first moves from the opening books, see backend.book
+            records: The RecordWriter every game is recorded to, see backend.records. Games aren't recorded if None
+            clock: Function that returns the time in seconds
+        """
+        if max_games < 1:
+            raise ValueError("Invalid max_games. Must be at least 1.")
+
+        self.max_games = max_games
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.table_size = table_size
+        self.opening_books = opening_books
+        self.records = records
+        self.clock = clock
+        self._sessions = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = {"ttl": 0, "lru": 0, "memory": 0}
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def create(self, board="standard", human_first=True, player_name="Human"):
+        """
+        Creates a game
+        Args:
+            board: The size of the board, see backend.geometry.board_size
+            human_first: True if the human player starts the game
+            player_name: Name of the human player
+
+        Returns: The GameSession of the game
+        """
+        x_length, y_length = board_size(board)
+
+        session = GameSession(uuid.uuid4().hex, x_length, y_length, human_first, player_name, self.table_size,
+                              self.opening_books, self.records)
+        with self._lock:
+            session.last_access = self.clock()
+            session.accounted_bytes = session.memory()
+            self._sessions[session.game_id] = session
+            self._bytes += session.accounted_bytes
+            self._evict()
+        return session
+
+    def get(self, game_id):
+        """
+        Looks up a game and marks it as the most recently used game
+        Returns: The GameSession, raises GameNotFound if there is no such game
+        """
+        with self._lock:
+            self._evict()
+            session = self._sessions.get(game_id)
+            if session is None:
+                raise GameNotFound(game_id)
+            session.last_access = self.clock()
+            self._sessions.move_to_end(game_id)
+            return session
+
+    def update(self, session):
+        """
+        Accounts for the memory a game gained with its last move, and evicts games if the store is over max_bytes
+        """
+        with self._lock:
+            if self._sessions.get(session.game_id) is not session:
+                return
+            memory = session.memory()
+            self._bytes += memory - session.accounted_bytes
+            session.accounted_bytes = memory
+            self._evict()
+
+    def delete(self, game_id):
+        """
+        Removes a game, raises GameNotFound if there is no such game
+        """
+        with self._lock:
+            session = self._sessions.pop(game_id, None)
+            if session is None:
+                raise GameNotFound(game_id)
+            self._bytes -= session.accounted_bytes
+        session.close()
+
+    def stats(self):
+        """
+        Returns: Dictionary with the number of games, their estimated memory and the evictions per reason
+        """
+        with self._lock:
+            return {"games": len(self._sessions), "bytes": self._bytes, "evictions": dict(self.evictions)}
+
+    def _evict(self):
+        # The sessions are in order of last access, so expired sessions are at the front
+        expire_before = self.clock() - self.ttl_seconds
+        while self._sessions:
+            game_id, session = next(iter(self._sessions.items()))
+            if session.last_access < expire_before:
+                reason = "ttl"
+            elif len(self._sessions) > self.max_games:
+                reason = "lru"
+            elif self._bytes > self.max_bytes and len(self._sessions) > 1:
+                reason = "memory"
+            else:
+                break
+            del self._sessions[game_id]
+            self._bytes -= session.accounted_bytes
+            self.evictions[reason] += 1
+            session.close()
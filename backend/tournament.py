@@ -0,0 +1,334 @@
+"""
+Headless self-play tournaments between configurations of the ComputerPlayer. Every pair of configurations plays a
+number of games on one board size: the first moves of a game are random, and every opening is played twice with the
+sides swapped, so neither configuration profits from a lucky opening or from moving first. The games run in parallel on
+a pool of worker processes.
+
+The report has for every configuration its win rate with a 95% confidence interval, the average time and nodes of its
+moves, the wins of every pair, and the number of games per second.
+
+Play a tournament, from the root of the repository:
+    python -m backend.tournament --player "ab3:algorithm=alpha_beta,depth=3" \\
+        --player "id50:algorithm=iterative_deepening,time_limit_ms=50,heuristic=aggressive" \\
+        [--board medium] [--games 100] [--workers 4] [--opening-plies 2] [--seed 0] [--output results.json]
+"""
+import math
+import os
+import random
+import time
+
+from backend.book import find_book
+from backend.endgame import EndgameSolver
+from backend.heuristics import get_heuristic
+from backend.mcts import MCTSPlayer, ROLLOUT_POLICIES
+from backend.geometry import BOARD_SIZES, board_size
+from backend.new_game import GameBoard, ComputerPlayer
+from backend.ordering import get_ordering
+
+ALGORITHMS = ("minimax", "alpha_beta", "iterative_deepening", "mcts")
+
+
+class PlayerConfig:
+    """
+    A configuration of the ComputerPlayer. It is sent to the worker processes, which create a new player from it for
+    every game.
+    """
+
+    def __init__(self, name, algorithm="iterative_deepening", depth=None, heuristic="own_moves", time_limit_ms=None,
+                 endgame=False, opening_book=False, iterations=None, policy="random", ordering="killer_history"):
+        """
+        Constructor for the PlayerConfig class
+        Args:
+            name: Unique name of the configuration in the report
+            algorithm: minimax (minimax_decision), alpha_beta (alpha_beta_search), iterative_deepening (get_actions)
+                or mcts (backend.mcts.MCTSPlayer)
+            depth: The search depth. minimax and alpha_beta need it, iterative deepening needs a depth or a time limit
+            heuristic: A name of backend.heuristics.HEURISTICS
+            time_limit_ms: The time budget of every move of iterative deepening and mcts
+            endgame: Solve partitioned positions exactly, see backend.endgame
+            opening_book: Answer the first moves from the opening book of the board, see backend.book
+            iterations: The iterations of every move of mcts
+            policy: The rollout policy of mcts, see backend.mcts.ROLLOUT_POLICIES
+            ordering: A name of backend.ordering.ORDERINGS, the move ordering of the alpha-beta searches
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Invalid algorithm. Must be one of {', '.join(ALGORITHMS)}.")
+        if algorithm in ("minimax", "alpha_beta") and depth is None:
+            raise ValueError(f"Invalid player {name}. The {algorithm} algorithm needs a depth.")
+        if algorithm == "iterative_deepening" and depth is None and time_limit_ms is None:
+            raise ValueError(f"Invalid player {name}. Give a depth, a time_limit_ms or both.")
+        if algorithm == "mcts" and iterations is None and time_limit_ms is None:
+            raise ValueError(f"Invalid player {name}. Give iterations, a time_limit_ms or both.")
+        if policy not in ROLLOUT_POLICIES:
+            raise ValueError(f"Invalid policy. Must be one of {', '.join(ROLLOUT_POLICIES)}.")
+        get_heuristic(heuristic)
+        get_ordering(ordering)
+
+        self.name = name
+        self.algorithm = algorithm
+        self.depth = depth
+        self.heuristic = heuristic
+        self.time_limit_ms = time_limit_ms
+        self.endgame = endgame
+        self.opening_book = opening_book
+        self.iterations = iterations
+        self.policy = policy
+        self.ordering = ordering
+
+    @classmethod
+    def parse(cls, spec):
+        """
+        Creates a configuration from the command line: the name, a colon and the options as key=value pairs separated
+        by commas, e.g. "ab4:algorithm=alpha_beta,depth=4,heuristic=aggressive"
+        """
+        name, _, options = spec.partition(":")
+        kwargs = {}
+        for option in filter(None, options.split(",")):
+            key, _, value = option.partition("=")
+            if key in ("depth", "time_limit_ms", "iterations"):
+                kwargs[key] = int(value)
+            elif key in ("endgame", "opening_book"):
+                kwargs[key] = value.lower() in ("1", "true", "yes")
+            elif key in ("algorithm", "heuristic", "policy", "ordering"):
+                kwargs[key] = value
+            else:
+                raise ValueError(f"Invalid option {key} of player {name}.")
+        return cls(name, **kwargs)
+
+    def create_player(self, x_length, y_length):
+        """
+        Returns: A new player of this configuration for a board size
+        """
+        if self.algorithm == "mcts":
+            return MCTSPlayer(self.name, self.iterations, self.time_limit_ms, policy=self.policy)
+        return ComputerPlayer(self.name, evaluation=get_heuristic(self.heuristic),
+                              endgame_solver=EndgameSolver() if self.endgame else None,
+                              move_ordering=get_ordering(self.ordering),
+                              opening_book=find_book(x_length, y_length) if self.opening_book else None)
+
+    def choose_move(self, player, state):
+        """
+        Searches the move of the player with the algorithm of this configuration
+        """
+        if self.algorithm == "minimax":
+            return player.minimax_decision(state, self.depth)
+        if self.algorithm == "alpha_beta":
+            return player.alpha_beta_search(state, self.depth)
+        if self.algorithm == "mcts":
+            return player.get_actions(state)
+        return player.get_actions(state, self.depth, self.time_limit_ms)
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def play_game(config_1, config_2, x_length, y_length, opening_plies, seed):
+    """
+    Plays one game
+    Args:
+        config_1: The PlayerConfig of player one, who moves first
+        config_2: The PlayerConfig of player two
+        x_length: width of the board
+        y_length: height of the board
+        opening_plies: The number of random moves the game starts with
+        seed: The seed of the random opening
+
+    Returns: Dictionary with the names of the players, the winner, the number of moves, and per player the number of
+    searched moves, their seconds and their nodes
+    """
+    player_1 = config_1.create_player(x_length, y_length)
+    player_2 = config_2.create_player(x_length, y_length)
+    state = GameBoard(x_length, y_length, player_1, player_2)
+    state.active_player = player_1
+
+    rng = random.Random(seed)
+    plies = 0
+    while plies < opening_plies and not state.terminal_test():
+        state.make_move(rng.choice(state.get_player_moves()))
+        plies += 1
+
+    moves, seconds, nodes = [0, 0], [0.0, 0.0], [0, 0]
+    while not state.terminal_test():
+        player = state.active_player
+        slot = state.get_slot(player)
+        config = config_1 if player is player_1 else config_2
+        player.nodes_searched = 0
+        start = time.perf_counter()
+        move = config.choose_move(player, state)
+        seconds[slot] += time.perf_counter() - start
+        moves[slot] += 1
+        nodes[slot] += player.nodes_searched
+        state.make_move(move)
+        plies += 1
+
+    # The player that can't move has lost
+    winner = state.get_opponent(state.active_player)
+    return {"players": [config_1.name, config_2.name], "winner": winner.player_name, "plies": plies,
+            "moves": moves, "seconds": seconds, "nodes": nodes}
+
+
+def _play_game(task):
+    # Runs in a worker process, the arguments of play_game come as one tuple
+    return play_game(*task)
+
+
+def wilson_interval(wins, games, z=1.96):
+    """
+    The Wilson score interval of a win rate, 95% confidence by default. Unlike the normal approximation it stays
+    between 0 and 1 and works for few games and for win rates close to 0 or 1.
+    Returns: (lower bound, upper bound)
+    """
+    if games == 0:
+        return 0.0, 1.0
+    rate = wins / games
+    center = (rate + z * z / (2 * games)) / (1 + z * z / games)
+    margin = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / (1 + z * z / games)
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def schedule(configs, games, x_length, y_length, opening_plies, seed):
+    """
+    The games of a round robin tournament: every pair of configurations plays games games, every random opening once
+    with each configuration as player one
+    Returns: List of the arguments of play_game
+    """
+    rng = random.Random(seed)
+    tasks = []
+    for first in range(len(configs)):
+        for second in range(first + 1, len(configs)):
+            for _ in range(games // 2):
+                game_seed = rng.getrandbits(32)
+                tasks.append((configs[first], configs[second], x_length, y_length, opening_plies, game_seed))
+                tasks.append((configs[second], configs[first], x_length, y_length, opening_plies, game_seed))
+    return tasks
+
+
+def summarize(configs, results, seconds):
+    """
+    Aggregates the results of the games
+    Args:
+        configs: The PlayerConfigs
+        results: The results of play_game
+        seconds: The wall-clock time of the tournament
+
+    Returns: Dictionary with the players, the wins of every pair as pairs[winner][loser], and the totals
+    """
+    players = {config.name: {"config": config.to_dict(), "games": 0, "wins": 0, "moves": 0, "seconds": 0.0, "nodes": 0}
+               for config in configs}
+    pairs = {config.name: {other.name: 0 for other in configs if other is not config} for config in configs}
+    for result in results:
+        for slot, name in enumerate(result["players"]):
+            player = players[name]
+            player["games"] += 1
+            player["moves"] += result["moves"][slot]
+            player["seconds"] += result["seconds"][slot]
+            player["nodes"] += result["nodes"][slot]
+        winner = result["winner"]
+        loser = result["players"][1] if result["players"][0] == winner else result["players"][0]
+        players[winner]["wins"] += 1
+        pairs[winner][loser] += 1
+
+    for player in players.values():
+        player["win_rate"] = player["wins"] / player["games"] if player["games"] else 0.0
+        player["confidence_interval"] = wilson_interval(player["wins"], player["games"])
+        player["average_move_ms"] = 1000 * player["seconds"] / player["moves"] if player["moves"] else 0.0
+        player["nodes_per_move"] = player["nodes"] / player["moves"] if player["moves"] else 0.0
+    return {"players": players, "pairs": pairs, "games": len(results), "seconds": seconds,
+            "games_per_second": len(results) / seconds if seconds > 0 else 0.0}
+
+
+def run_tournament(configs, board="medium", games=100, opening_plies=2, workers=None, seed=0, progress=None):
+    """
+    Plays a round robin tournament
+    Args:
+        configs: The PlayerConfigs, at least two with unique names
+        board: The size of the board, see backend.geometry.board_size
+        games: The number of games of every pair, rounded down to an even number
+        opening_plies: The number of random moves every game starts with
+        workers: The number of worker processes, the number of CPUs if None. With 1 the games run in this process
+        seed: The seed of the random openings
+        progress: Function called with (games played, games) after every game
+
+    Returns: The summary, see summarize
+    """
+    if len(configs) < 2 or len({config.name for config in configs}) != len(configs):
+        raise ValueError("Invalid players. A tournament needs at least two players with unique names.")
+    x_length, y_length = board_size(board)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    tasks = schedule(configs, games, x_length, y_length, opening_plies, seed)
+
+    results = []
+    start = time.perf_counter()
+    if workers == 1:
+        game_results = map(_play_game, tasks)
+        executor = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # Games are handed out in chunks, a single game can be over in a millisecond
+        game_results = executor.map(_play_game, tasks, chunksize=max(1, len(tasks) // (workers * 16)))
+    try:
+        for result in game_results:
+            results.append(result)
+            if progress is not None:
+                progress(len(results), len(tasks))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return summarize(configs, results, time.perf_counter() - start)
+
+
+def format_report(summary):
+    """
+    Returns: The summary as a table of the players and a table of the wins of every pair
+    """
+    lines = [f"{'player':<20}{'games':>7}{'wins':>7}{'win rate':>10}{'95% interval':>16}{'ms/move':>10}"
+             f"{'nodes/move':>12}"]
+    ranking = sorted(summary["players"].items(), key=lambda item: item[1]["win_rate"], reverse=True)
+    for name, player in ranking:
+        lower, upper = player["confidence_interval"]
+        lines.append(f"{name:<20}{player['games']:>7}{player['wins']:>7}{player['win_rate']:>10.1%}"
+                     f"{f'{lower:.1%} - {upper:.1%}':>16}{player['average_move_ms']:>10.2f}"
+                     f"{player['nodes_per_move']:>12.0f}")
+
+    names = [name for name, _ in ranking]
+    lines.append("")
+    lines.append("wins of the row against the column")
+    lines.append(f"{'':<20}" + "".join(f"{name[:10]:>12}" for name in names))
+    for name in names:
+        lines.append(f"{name:<20}" + "".join(f"{'-' if other == name else summary['pairs'][name][other]:>12}"
+                                             for other in names))
+    lines.append("")
+    lines.append(f"{summary['games']} games in {summary['seconds']:.1f}s, {summary['games_per_second']:.1f} games/s")
+    return "\n".join(lines)
+
+
+def main():
+    # The worker processes of a tournament import this module, only the command line needs argparse and json
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Plays a self-play tournament between computer player configurations")
+    parser.add_argument("--player", action="append", type=PlayerConfig.parse,
+                        help="a configuration as name:key=value,... with the keys algorithm, depth, heuristic, "
+                             "time_limit_ms, endgame, opening_book, iterations, policy and ordering")
+    parser.add_argument("--board", type=board_size, default="medium",
+                        help=f"one of {', '.join(BOARD_SIZES)} or <width>x<height>")
+    parser.add_argument("--games", type=int, default=100, help="games of every pair of players")
+    parser.add_argument("--opening-plies", type=int, default=2, help="random moves at the start of every game")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, the number of CPUs by default")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the summary as JSON to this file")
+    args = parser.parse_args()
+
+    configs = args.player or [PlayerConfig("minimax2", "minimax", depth=2),
+                              PlayerConfig("alpha_beta3", "alpha_beta", depth=3),
+                              PlayerConfig("iterative20ms", time_limit_ms=20, heuristic="own_minus_opponent_moves")]
+    summary = run_tournament(configs, args.board, args.games, args.opening_plies, args.workers, args.seed)
+    print(format_report(summary))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(summary, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Tracers that follow the searches of a ComputerPlayer. A player without a tracer (the default) skips every trace call,
+so the search pays nothing for it. A tracer is plugged in with ComputerPlayer(tracer=...) or by setting
+player.tracer.
+
+The search calls these methods of the tracer:
+- start_search / end_search around every search for a move. Searches started inside another search, like the
+  iterations of get_actions, belong to the outer search
+- node for every searched node, expand for every node whose moves are searched, cutoff for every alpha-beta cutoff
+- iteration after every completed depth of iterative deepening
+- timeout when the time of get_actions runs out
+
+SearchTracer does nothing and is the base class of new tracers. StatisticsTracer collects statistics per move that can
+be exported as JSON.
+"""
+import json
+import time
+
+
+class SearchTracer:
+    """
+    A tracer that ignores every event. Subclasses override the events they need.
+    """
+
+    def start_search(self, player, state, algorithm):
+        """
+        A search for a move starts
+        Args:
+            player: The searching ComputerPlayer
+            state: The position that is searched
+            algorithm: Name of the search, "minimax", "alpha_beta" or "iterative_deepening"
+        """
+
+    def node(self, state):
+        """
+        A node is searched. The ply of the node is state.undo_count() minus the undo count of the searched position
+        """
+
+    def expand(self, state, move_count):
+        """
+        The move_count moves of a node are searched
+        """
+
+    def cutoff(self, state, move_number):
+        """
+        The search of a node is cut off after its move with index move_number, 0 for the first move
+        """
+
+    def iteration(self, depth, score, principal_variation):
+        """
+        Iterative deepening completed a search to depth
+        """
+
+    def timeout(self):
+        """
+        The time of the search ran out, the running iteration is abandoned
+        """
+
+    def end_search(self, move, score, principal_variation):
+        """
+        The search for a move ends with the chosen move, its score and the line of play the search expects
+        """
+
+
+class StatisticsTracer(SearchTracer):
+    """
+    Collects per searched move: the nodes, expanded nodes, children and cutoffs per ply, the branching factor, the time
+    and nodes of every iteration and the principal variation. The statistics of every move are kept in searches, in
+    the order of the moves.
+    """
+
+    def __init__(self):
+        """
+        Constructor for the StatisticsTracer class
+        """
+        self.searches = []
+        self._search = None
+        self._nested = 0
+        self._root_ply = 0
+        self._start = 0.0
+        self._iteration_start = 0.0
+        self._iteration_nodes = 0
+
+    def start_search(self, player, state, algorithm):
+        if self._search is not None:
+            self._nested += 1
+            return
+
+        self._root_ply = state.undo_count()
+        self._start = self._iteration_start = time.perf_counter()
+        self._iteration_nodes = 0
+        self._search = {
+            "player": player.player_name,
+            "algorithm": algorithm,
+            "empty_cells": state.count_blanc(),
+            "nodes_per_ply": [],
+            "expanded_per_ply": [],
+            "children_per_ply": [],
+            "cutoffs_per_ply": [],
+            "first_move_cutoffs": 0,
+            "iterations": [],
+            "timed_out": False,
+        }
+
+    @staticmethod
+    def _count(counts, ply, amount=1):
+        # Counts are lists indexed by ply, so they stay lists in JSON
+        while len(counts) <= ply:
+            counts.append(0)
+        counts[ply] += amount
+
+    def node(self, state):
+        self._count(self._search["nodes_per_ply"], state.undo_count() - self._root_ply)
+
+    def expand(self, state, move_count):
+        ply = state.undo_count() - self._root_ply
+        self._count(self._search["expanded_per_ply"], ply)
+        self._count(self._search["children_per_ply"], ply, move_count)
+
+    def cutoff(self, state, move_number):
+        self._count(self._search["cutoffs_per_ply"], state.undo_count() - self._root_ply)
+        if move_number == 0:
+            self._search["first_move_cutoffs"] += 1
+
+    def iteration(self, depth, score, principal_variation):
+        now = time.perf_counter()
+        nodes = sum(self._search["nodes_per_ply"])
+        self._search["iterations"].append({
+            "depth": depth,
+            "score": score,
+            "nodes": nodes - self._iteration_nodes,
+            "seconds": now - self._iteration_start,
+            "principal_variation": list(principal_variation),
+        })
+        self._iteration_start = now
+        self._iteration_nodes = nodes
+
+    def timeout(self):
+        # The searches that were interrupted never end, only the outer search is left open
+        self._nested = 0
+        self._search["timed_out"] = True
+
+    def end_search(self, move, score, principal_variation):
+        if self._nested:
+            self._nested -= 1
+            return
+
+        search = self._search
+        self._search = None
+        expanded = sum(search["expanded_per_ply"])
+        cutoffs = sum(search["cutoffs_per_ply"])
+        search.update({
+            "move": move,
+            "score": score,
+            "principal_variation": list(principal_variation),
+            "seconds": time.perf_counter() - self._start,
+            "nodes": sum(search["nodes_per_ply"]),
+            "cutoffs": cutoffs,
+            "branching_factor": sum(search["children_per_ply"]) / expanded if expanded else 0.0,
+            "branching_factor_per_ply": [children / count if count else 0.0
+                                         for children, count in zip(search["children_per_ply"],
+                                                                    search["expanded_per_ply"])],
+            "first_move_cutoff_rate": search["first_move_cutoffs"] / cutoffs if cutoffs else 0.0,
+        })
+        self.searches.append(search)
+
+    def clear(self):
+        """
+        Forgets the statistics of all moves
+        """
+        self.searches = []
+
+    def to_json(self, index=-1, **kwargs):
+        """
+        Returns: The statistics of one move as a JSON string, the last move by default. Keyword arguments are passed
+        to json.dumps
+        """
+        return json.dumps(_json_safe(self.searches[index]), **kwargs)
+
+    def dump(self, file):
+        """
+        Writes the statistics of every move to an open text file, one JSON object per line
+        """
+        for search in self.searches:
+            file.write(json.dumps(_json_safe(search)) + "\n")
+
+
+def _json_safe(value):
+    """
+    JSON has no infinity, a won or lost position is exported as the strings "inf" and "-inf"
+    """
+    if isinstance(value, float) and value in (float("inf"), float("-inf")):
+        return "inf" if value > 0 else "-inf"
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
@@ -0,0 +1,132 @@
+from collections import namedtuple
+
+# Bound types of a stored value. An exact value is the minimax value of the position, a lower bound comes from a
+# beta cutoff (the real value is at least the stored value) and an upper bound from a node where no move raised alpha.
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+TTEntry = namedtuple("TTEntry", ["key", "depth", "value", "flag", "best_move", "generation"])
+
+
+class TranspositionTable:
+    """
+    A bounded table of searched positions, indexed by the Zobrist hash of the position. The table has a fixed number
+    of slots, a position is stored in slot key % size. When two positions compete for a slot the replacement policy
+    decides which one is kept:
+    1) An empty slot, or a slot holding the same position, is always written
+    2) An entry from an earlier search (older generation) is replaced
+    3) Otherwise the entry that was searched deepest is kept
+    A table can start from the entries of a checkpoint, see backend.checkpoint. The checkpoint stays on disk and is
+    read for the slots that haven't been written since.
+    """
+
+    def __init__(self, size=1 << 18, base=None):
+        """
+        Constructor for the TranspositionTable class
+        Args:
+            size: The maximum number of positions kept in the table
+            base: The read-only slots of a table of the same size, with a get(index) method that returns the TTEntry
+                of a slot or None, like backend.checkpoint.CheckpointTable
+        """
+        if size < 1:
+            raise ValueError("Invalid size. The transposition table needs at least one slot.")
+
+        self.size = size
+        self.generation = 0
+        # Slots are only created when they are written, so a large table that is hardly used costs little memory
+        self._slots = {}
+        self._base = base
+        # The slots of the base that were written since
+        self._base_overwritten = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def __len__(self):
+        if self._base is None:
+            return len(self._slots)
+        return len(self._slots) + len(self._base) - self._base_overwritten
+
+    def entries(self):
+        """
+        Returns: Iterator over the TTEntry of every used slot
+        """
+        yield from self._slots.values()
+        if self._base is not None:
+            for index, entry in self._base.items():
+                if index not in self._slots:
+                    yield entry
+
+    def new_search(self):
+        """
+        Marks the start of a new search. Entries of earlier searches are kept for lookups, but are the first to be
+        replaced.
+        """
+        self.generation += 1
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters
+        """
+        self._slots.clear()
+        self._base = None
+        self._base_overwritten = 0
+        self.generation = 0
+        self.hits = self.misses = self.collisions = self.stores = self.replacements = 0
+
+    def probe(self, key):
+        """
+        Looks up a position in the table. A slot holding a different position is counted as a collision and a miss.
+        Args:
+            key: The Zobrist hash of the position
+
+        Returns: The TTEntry of the position, or None if the position isn't in the table
+        """
+        entry = self._slots.get(key % self.size)
+        if entry is None and self._base is not None:
+            entry = self._base.get(key % self.size)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.key != key:
+            self.collisions += 1
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def store(self, key, depth, value, flag, best_move=None):
+        """
+        Stores the result of a search in the table, following the replacement policy of the table
+        Args:
+            key: The Zobrist hash of the position
+            depth: The remaining depth the position was searched to
+            value: The value found by the search
+            flag: EXACT, LOWER or UPPER
+            best_move: The best move found in the position, used to order the moves of a next search
+        """
+        index = key % self.size
+        entry = self._slots.get(index)
+        from_base = entry is None and self._base is not None
+        if from_base:
+            entry = self._base.get(index)
+        if entry is not None and entry.key != key:
+            if entry.generation == self.generation and entry.depth > depth:
+                return
+            self.replacements += 1
+
+        if from_base and entry is not None:
+            self._base_overwritten += 1
+        self._slots[index] = TTEntry(key, depth, value, flag, best_move, self.generation)
+        self.stores += 1
+
+    def stats(self):
+        """
+        Returns: The counters of the table as a dictionary
+        """
+        return {"size": self.size, "entries": len(self), "hits": self.hits, "misses": self.misses,
+                "collisions": self.collisions, "stores": self.stores, "replacements": self.replacements}
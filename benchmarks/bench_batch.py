@@ -0,0 +1,64 @@
+"""
+Throughput benchmark of BoardBatch against GameBoard. Random mid-game standard (6x8) boards are created with batch
+self-play, then legal moves, mobility and terminal flags of all boards are computed with one BoardBatch and with one
+GameBoard per board. Reports boards per second for batch sizes from 1 to 100k.
+
+Run from the root of the repository (needs NumPy):
+    python -m benchmarks.bench_batch [--sizes 1 10 100 1000 10000 100000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.batch import BoardBatch
+
+
+def create_batch(size, plies, generator):
+    """ Plays the same number of random moves on every board of a new batch """
+    batch = BoardBatch(8, 6, size)
+    for _ in range(plies):
+        playing = ~batch.terminal()
+        batch.apply_moves(batch.random_moves(generator), where=playing, validate=False)
+    return batch
+
+
+def measure_batch(batch):
+    """ Returns the seconds to compute legal moves, mobility and terminal flags of every board in the batch """
+    start = time.perf_counter()
+    batch.legal_move_masks()
+    batch.mobility(1 - batch.active)
+    batch.terminal()
+    return time.perf_counter() - start
+
+
+def measure_game_boards(batch, limit):
+    """ The same work with one GameBoard per board, on at most limit boards. Returns (boards, seconds) """
+    boards = [batch.to_board(i, "player_1", "player_2") for i in range(min(len(batch), limit))]
+    start = time.perf_counter()
+    for board in boards:
+        board.get_legal_moves(board.positions[board.active_player])
+        board.legal_moves_mask(board.positions[board.get_opponent(board.active_player)]).bit_count()
+        board.terminal_test()
+    return len(boards), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000, 100000])
+    parser.add_argument("--plies", type=int, default=10, help="random moves played before the measurement")
+    parser.add_argument("--board-limit", type=int, default=10000, help="maximum boards for the GameBoard loop")
+    args = parser.parse_args()
+
+    generator = np.random.default_rng(0)
+    print(f"{'batch size':>10}{'batch boards/sec':>20}{'GameBoard boards/sec':>24}{'speedup':>10}")
+    for size in args.sizes:
+        batch = create_batch(size, args.plies, generator)
+        batch_rate = size / measure_batch(batch)
+        boards, seconds = measure_game_boards(batch, args.board_limit)
+        board_rate = boards / seconds
+        print(f"{size:>10}{batch_rate:>20.0f}{board_rate:>24.0f}{batch_rate / board_rate:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark of checkpoints, see backend.checkpoint. A ComputerPlayer searches a position of the standard board to a
+depth, writes a checkpoint and a restored player searches the position again to the same depth. The benchmark reports
+the time to write and to open the checkpoint, its size, and the time of the search of a new player against the search
+of the restored player, which answers the depths of the checkpoint from its table.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_checkpoint [--depth 9]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from backend.checkpoint import Checkpoint, write_checkpoint
+from backend.new_game import ComputerPlayer, GameBoard, HumanPlayer, TranspositionTable
+
+OPENING = [[2, 3], [3, 4]]
+
+
+def search(player, state, depth):
+    """
+    Returns: (the move, the seconds of the search, the nodes searched)
+    """
+    start = time.perf_counter()
+    move = player.get_actions(state, depth)
+    return move, time.perf_counter() - start, player.nodes_searched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--depth", type=int, default=9, help="depth of the searches")
+    args = parser.parse_args()
+
+    player = ComputerPlayer("HAL2000", transposition_table=TranspositionTable())
+    state = GameBoard(8, 6, player, HumanPlayer("Frank"))
+    state.active_player = player
+    for move in OPENING:
+        state.make_move(move)
+    move, seconds, nodes = search(player, state, args.depth)
+    print(f"fresh search:   {seconds:8.3f} s {nodes:>9} nodes move {move}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.isoc")
+        start = time.perf_counter()
+        write_checkpoint(path, state, player)
+        write_seconds = time.perf_counter() - start
+        print(f"write:          {write_seconds:8.3f} s {len(player.transposition_table):>9} entries "
+              f"{os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        checkpoint = Checkpoint(path)
+        open_seconds = time.perf_counter() - start
+        restored = checkpoint.board()
+        print(f"open:           {open_seconds:8.4f} s")
+
+        move, seconds, nodes = search(restored.player_1, restored, args.depth)
+        print(f"resumed search: {seconds:8.3f} s {nodes:>9} nodes move {move}")
+        checkpoint.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark of the endgame solver (ComputerPlayer.endgame_solver). Random games on the standard board are played until
+few cells are open, and every position is searched with iterative deepening with and without the solver. It reports the
+nodes, the time, and the positions whose result the search proves, a won or lost game.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_endgame [--positions 40] [--open-cells 22] [--depth 8]
+"""
+import argparse
+import random
+import time
+
+from backend.endgame import EndgameSolver
+from backend.geometry import BOARD_SIZES
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer
+
+
+def random_positions(count, open_cells, seed):
+    """ Plays random games until open_cells cells are open, games that end earlier are skipped """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        player_1, player_2 = HumanPlayer("Player 1"), HumanPlayer("Player 2")
+        state = GameBoard(*BOARD_SIZES["standard"], player_1, player_2)
+        state.active_player = player_1
+        while not state.terminal_test() and state.count_blanc() > open_cells:
+            state.make_move(rng.choice(state.get_player_moves()))
+        if not state.terminal_test():
+            positions.append(state.to_bytes())
+    return positions
+
+
+def measure(positions, depth, solver):
+    """ Searches every position, returns (nodes, seconds, proven results) """
+    nodes = 0
+    proven = 0
+    start = time.perf_counter()
+    for board_bytes in positions:
+        computer_player = ComputerPlayer("HAL2000", endgame_solver=solver)
+        opponent = HumanPlayer("Frank")
+        # The computer player takes the slot of the active player
+        players = (computer_player, opponent) if board_bytes[2] == 0 else (opponent, computer_player)
+        computer_player.get_actions(GameBoard.from_bytes(board_bytes, *players), depth)
+        nodes += computer_player.nodes_searched
+        proven += computer_player.best_score in (float("inf"), float("-inf"))
+    return nodes, time.perf_counter() - start, proven
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--positions", type=int, default=40)
+    parser.add_argument("--open-cells", type=int, default=22)
+    parser.add_argument("--depth", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    positions = random_positions(args.positions, args.open_cells, args.seed)
+    print(f"{'solver':<10}{'nodes':>10}{'seconds':>10}{'proven':>8}")
+    for name, solver in (("off", None), ("on", EndgameSolver())):
+        nodes, seconds, proven = measure(positions, args.depth, solver)
+        print(f"{name:<10}{nodes:>10}{seconds:>10.2f}{proven:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark of the board sizes, see backend.geometry. For every size it reports the time to build the geometry, the
+legal move lists generated per second in random positions, and the nodes per second of a timed search, so the cost of
+the larger boards can be compared with the standard board.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_geometry [--time-limit-ms 1000]
+"""
+import argparse
+import random
+import time
+
+from backend.geometry import BoardGeometry
+from backend.new_game import ComputerPlayer, GameBoard, HumanPlayer, TranspositionTable
+
+SIZES = ((8, 6), (10, 10), (12, 12), (14, 14), (16, 16))
+
+
+def random_position(x_length, y_length, player, rng):
+    """
+    Returns: A board of the size where the players made random moves on a third of the cells, the game isn't over
+    """
+    while True:
+        state = GameBoard(x_length, y_length, player, HumanPlayer("Frank"))
+        state.active_player = player
+        for _ in range(x_length * y_length // 3):
+            moves = state.get_player_moves()
+            if not moves:
+                break
+            state.make_move(rng.choice(moves))
+        if not state.terminal_test():
+            return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--time-limit-ms", type=int, default=1000, help="time budget of the search of every size")
+    parser.add_argument("--positions", type=int, default=200, help="random positions for the move generation")
+    args = parser.parse_args()
+
+    print(f"{'board':<8} {'build ms':>9} {'move lists/s':>13} {'nodes/s':>9} {'depth':>6}")
+    for x_length, y_length in SIZES:
+        start = time.perf_counter()
+        BoardGeometry(x_length, y_length)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        rng = random.Random(19)
+        player = ComputerPlayer("HAL2000", transposition_table=TranspositionTable())
+        states = [random_position(x_length, y_length, player, rng) for _ in range(args.positions)]
+        start = time.perf_counter()
+        for state in states:
+            for cell in state._cells:
+                state.cell_legal_moves(cell)
+        move_lists = 2 * len(states) / (time.perf_counter() - start)
+
+        state = random_position(x_length, y_length, player, random.Random(7))
+        start = time.perf_counter()
+        player.get_actions(state, time_limit_ms=args.time_limit_ms)
+        nodes = player.nodes_searched / (time.perf_counter() - start)
+        print(f"{x_length}x{y_length:<5} {build_ms:>9.1f} {move_lists:>13.0f} {nodes:>9.0f} {player.depth_reached:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark of the evaluation functions in backend.heuristics. For every heuristic it reports:
+1) The speed of a depth limited alpha-beta search on a fixed standard (6x8) position, in nodes per second
+2) The strength: the win rate in games against the own_moves heuristic on a medium (5x5) board. Both players search to
+   the same depth, the first move of each player is random and every opening is played twice, with the sides swapped.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_heuristics [--games 20] [--depth 3]
+"""
+import argparse
+import random
+import time
+
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer
+from backend.heuristics import HEURISTICS, get_heuristic
+
+
+def create_position(computer_player):
+    """ A mid-game standard board where the computer player has initiative """
+    human_player = HumanPlayer("Frank")
+    state = GameBoard(8, 6, computer_player, human_player)
+    state.active_player = computer_player
+    state.positions[computer_player] = [2, 3]
+    state.positions[human_player] = [4, 5]
+    for position in [[1, 1], [2, 5], [3, 3], [4, 2], [0, 6], [5, 7], [2, 3], [4, 5]]:
+        state.block_cell(position)
+    return state
+
+
+def measure_speed(name, depth):
+    """ Runs one alpha-beta search and returns (nodes, seconds) """
+    computer_player = ComputerPlayer("HAL2000", evaluation=get_heuristic(name))
+    state = create_position(computer_player)
+    start = time.perf_counter()
+    computer_player.get_actions(state, depth)
+    return computer_player.nodes_searched, time.perf_counter() - start
+
+
+def play_game(player_1, player_2, opening, depth):
+    """
+    Plays a game between two computer players, starting with the opening moves
+    Returns: The player that won
+    """
+    state = GameBoard(5, 5, player_1, player_2)
+    state.active_player = player_1
+    for move in opening:
+        state.make_move(move)
+
+    while not state.terminal_test():
+        state.make_move(state.active_player.get_actions(state, depth))
+
+    # The player that can't move has lost
+    return state.get_opponent(state.active_player)
+
+
+def measure_strength(name, games, depth, rng):
+    """ Returns the number of games won by the heuristic against own_moves """
+    wins = 0
+    for _ in range(games // 2):
+        cells = [[y, x] for y in range(5) for x in range(5)]
+        opening = rng.sample(cells, 2)
+        for swap in (False, True):
+            player = ComputerPlayer(name, evaluation=get_heuristic(name))
+            opponent = ComputerPlayer("own_moves", evaluation=get_heuristic("own_moves"))
+            players = (opponent, player) if swap else (player, opponent)
+            if play_game(*players, opening, depth) is player:
+                wins += 1
+    return wins
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=20, help="games per heuristic, half of them as player one")
+    parser.add_argument("--depth", type=int, default=3, help="search depth of both players")
+    parser.add_argument("--speed-depth", type=int, default=5, help="search depth of the speed measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'heuristic':<28}{'nodes':>10}{'nodes/sec':>12}{'wins':>8}{'win rate':>10}")
+    for name in HEURISTICS:
+        nodes, seconds = measure_speed(name, args.speed_depth)
+        wins = measure_strength(name, args.games, args.depth, random.Random(args.seed))
+        played = args.games // 2 * 2
+        print(f"{name:<28}{nodes:>10}{nodes / seconds:>12.0f}{wins:>8}{wins / played:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
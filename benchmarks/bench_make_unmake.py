@@ -0,0 +1,134 @@
+"""
+Benchmark of the minimax search with a cloned board per node against the search that applies and undoes moves on a
+single board. Reports the nodes per second of both on a medium (5x5) and a standard (6x8) board.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_make_unmake
+"""
+import contextlib
+import os
+import time
+
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer
+from backend.transposition import TranspositionTable
+
+
+class NoTranspositionTable(TranspositionTable):
+    """ A table that never finds a position, so both searches visit the same tree """
+
+    def probe(self, key):
+        return None
+
+    def store(self, key, depth, value, flag, best_move=None):
+        pass
+
+
+class CountingComputerPlayer(ComputerPlayer):
+    """ ComputerPlayer that counts the nodes visited by the minimax helpers """
+
+    def __init__(self, player_name):
+        super().__init__(player_name, transposition_table=NoTranspositionTable())
+        self.nodes = 0
+
+    def min_value(self, state, depth):
+        self.nodes += 1
+        return super().min_value(state, depth)
+
+    def max_value(self, state, depth):
+        self.nodes += 1
+        return super().max_value(state, depth)
+
+
+class CloningComputerPlayer(CountingComputerPlayer):
+    """ The minimax helpers as they were before apply_move / undo_move: a new board is built for every child """
+
+    @staticmethod
+    def clone(state):
+        # The original clone went through the constructor, which draws a random player and builds a new board
+        cloned_board = GameBoard(state._board_width, state._board_height, state.player_1, state.player_2)
+        cloned_board._board = state._board
+        cloned_board.game_over = state.game_over
+        cloned_board.positions = state.positions.copy()
+        cloned_board.active_player = state.active_player
+        return cloned_board
+
+    def minimax_decision(self, current_state, depth=float("inf")):
+        best_move = None
+        best_score = float("-inf")
+        for move in current_state.get_legal_moves(current_state.positions[current_state.active_player]):
+            new_value = self.min_value(self.clone(current_state).make_move(move), depth - 1)
+            if new_value > best_score:
+                best_score = new_value
+                best_move = move
+        return best_move
+
+    def min_value(self, state, depth):
+        self.nodes += 1
+        if state.terminal_test():
+            return state.utility()
+        if depth <= 0:
+            return self.my_moves(state)
+        value = float("inf")
+        for move in state.get_legal_moves(state.positions[state.active_player]):
+            value = min(value, self.max_value(self.clone(state).make_move(move), depth - 1))
+        return value
+
+    def max_value(self, state, depth):
+        self.nodes += 1
+        if state.terminal_test():
+            return state.utility()
+        if depth <= 0:
+            return self.my_moves(state)
+        value = float("-inf")
+        for move in state.get_legal_moves(state.positions[state.active_player]):
+            value = max(value, self.min_value(self.clone(state).make_move(move), depth - 1))
+        return value
+
+
+def create_position(x_length, y_length, computer_player, position_1, position_2, blocked):
+    """ Creates a mid-game position where the computer player has initiative """
+    human_player = HumanPlayer("Frank")
+    state = GameBoard(x_length, y_length, computer_player, human_player)
+    state.active_player = computer_player
+    state.positions[computer_player] = position_1
+    state.positions[human_player] = position_2
+    for position in blocked + [position_1, position_2]:
+        state.block_cell(position)
+    return state
+
+
+POSITIONS = {
+    "medium (5x5)": (5, 5, [2, 3], [4, 1], [[1, 0], [2, 1], [1, 1], [0, 1]], 5),
+    "standard (6x8)": (8, 6, [2, 3], [4, 5], [[1, 1], [2, 5], [3, 3], [4, 2], [0, 6], [5, 7]], 4),
+}
+
+
+def run(player_class, x_length, y_length, position_1, position_2, blocked, depth):
+    """ Runs one minimax search and returns (nodes, seconds, best move) """
+    computer_player = player_class("HAL2000")
+    state = create_position(x_length, y_length, computer_player, position_1, position_2, blocked)
+    # The search helpers print while they search, that output is not part of the measurement
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        move = computer_player.minimax_decision(state, depth)
+        seconds = time.perf_counter() - start
+    return computer_player.nodes, seconds, move
+
+
+def main():
+    print(f"{'board':<16}{'search':<14}{'depth':>6}{'nodes':>10}{'seconds':>10}{'nodes/sec':>12}")
+    for name, (x_length, y_length, position_1, position_2, blocked, depth) in POSITIONS.items():
+        results = {}
+        for label, player_class in (("clone", CloningComputerPlayer), ("apply/undo", CountingComputerPlayer)):
+            nodes, seconds, move = run(player_class, x_length, y_length, position_1, position_2, blocked, depth)
+            results[label] = (nodes, seconds, move)
+            print(f"{name:<16}{label:<14}{depth:>6}{nodes:>10}{seconds:>10.3f}{nodes / seconds:>12.0f}")
+
+        # Both searches have to visit the same tree and find the same move
+        assert results["clone"][0] == results["apply/undo"][0]
+        assert results["clone"][2] == results["apply/undo"][2]
+        print(f"{name:<16}speedup {results['clone'][1] / results['apply/undo'][1]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark of the MCTSPlayer in backend.mcts. It reports the playouts per second of every rollout policy and number of
+workers from the position after the first two moves, and the win rate of MCTS against the iterative deepening
+ComputerPlayer with the same time per move, played as a tournament of backend.tournament.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_mcts [--board standard] [--time-limit-ms 100] [--games 10]
+"""
+import argparse
+import os
+
+from backend.mcts import MCTSPlayer, ROLLOUT_POLICIES
+from backend.geometry import BOARD_SIZES
+from backend.new_game import GameBoard, HumanPlayer
+from backend.tournament import PlayerConfig, run_tournament, format_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--board", choices=sorted(BOARD_SIZES), default="standard")
+    parser.add_argument("--time-limit-ms", type=int, default=100)
+    parser.add_argument("--games", type=int, default=10, help="Games per pair of players and opening")
+    args = parser.parse_args()
+
+    x_length, y_length = BOARD_SIZES[args.board]
+    state = GameBoard(x_length, y_length, HumanPlayer("Player 1"), HumanPlayer("Player 2"))
+    state.make_move([0, 0])
+    state.make_move([y_length - 1, x_length - 1])
+    workers = sorted({1, 2, os.cpu_count() or 1})
+    print(f"{'policy':<10} {'workers':>7} {'playouts/s':>12}")
+    for policy in ROLLOUT_POLICIES:
+        for count in workers:
+            with MCTSPlayer("MCTS", time_limit_ms=1000, policy=policy, workers=count, seed=0) as player:
+                player.get_actions(state)
+                print(f"{policy:<10} {count:>7} {player.playouts_per_second:>12.0f}")
+
+    configs = [PlayerConfig("mcts", algorithm="mcts", time_limit_ms=args.time_limit_ms),
+               PlayerConfig("minimax", time_limit_ms=args.time_limit_ms, heuristic="own_minus_opponent_moves")]
+    print()
+    print(format_report(run_tournament(configs, board=args.board, games=args.games, workers=1)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Memory benchmark of the GameBoard, measured with tracemalloc:
+1) Bytes per board: the memory of 10000 clones of a mid-game board, divided by the number of boards
+2) Bytes per million nodes: the peak memory of a search, with and without transposition table, divided by the number
+   of nodes searched
+
+Run from the root of the repository:
+    python -m benchmarks.bench_memory [--depth 6]
+"""
+import argparse
+import tracemalloc
+
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer
+from backend.transposition import TranspositionTable
+
+
+class NoTranspositionTable(TranspositionTable):
+    """ A table that never stores a position """
+
+    def store(self, key, depth, value, flag, best_move=None):
+        pass
+
+
+def create_position(computer_player, x_length, y_length):
+    """ A board after four moves, where the computer player has initiative """
+    human_player = HumanPlayer("Frank")
+    state = GameBoard(x_length, y_length, computer_player, human_player)
+    state.active_player = computer_player
+    for move in [[2, 3], [4, 1], [1, 3], [4, 4]]:
+        state.make_move(move)
+    return state
+
+
+def bytes_per_board(x_length, y_length, count=10000):
+    """ Returns the traced memory of one board """
+    state = create_position(ComputerPlayer("HAL2000"), x_length, y_length)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    boards = [state.clone() for _ in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del boards
+    return used / count
+
+
+def bytes_per_million_nodes(depth, transposition_table):
+    """ Returns (peak bytes per million nodes, nodes) of an iterative deepening search on the standard board """
+    computer_player = ComputerPlayer("HAL2000", transposition_table=transposition_table)
+    state = create_position(computer_player, 8, 6)
+    tracemalloc.start()
+    computer_player.get_actions(state, depth)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / computer_player.nodes_searched * 1_000_000, computer_player.nodes_searched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--depth", type=int, default=6)
+    args = parser.parse_args()
+
+    for name, (x_length, y_length) in (("medium (5x5)", (5, 5)), ("standard (6x8)", (8, 6))):
+        print(f"{name:<16}{bytes_per_board(x_length, y_length):>10.0f} bytes per board")
+
+    for name, table in (("with table", TranspositionTable()), ("without table", NoTranspositionTable())):
+        per_million, nodes = bytes_per_million_nodes(args.depth, table)
+        print(f"search {name:<16}{per_million:>14.0f} bytes per million nodes ({nodes} nodes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Speedup benchmark of the root-parallel search. Searches a fixed standard (6x8) position to a fixed depth with the
+sequential ComputerPlayer and with the ParallelComputerPlayer on 1, 2, 4 and 8 workers, and reports the time, the
+nodes searched and the speedup over the sequential search. The worker pools are started before the clock runs.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_parallel [--depth 6] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import time
+
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer
+from backend.parallel import ParallelComputerPlayer
+
+
+def create_position(computer_player):
+    """ A mid-game standard board where the computer player has initiative """
+    human_player = HumanPlayer("Frank")
+    state = GameBoard(8, 6, computer_player, human_player)
+    state.active_player = computer_player
+    state.positions[computer_player] = [2, 3]
+    state.positions[human_player] = [4, 5]
+    for position in [[1, 1], [2, 5], [3, 3], [4, 2], [0, 6], [5, 7], [2, 3], [4, 5]]:
+        state.block_cell(position)
+    return state
+
+
+def run(computer_player, depth):
+    """ Runs one iterative deepening search and returns (move, score, nodes, seconds) """
+    state = create_position(computer_player)
+    start = time.perf_counter()
+    move = computer_player.get_actions(state, depth)
+    seconds = time.perf_counter() - start
+    return move, computer_player.best_score, computer_player.nodes_searched, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"cpu count: {os.cpu_count()}")
+    print(f"{'search':<14}{'move':>10}{'score':>8}{'nodes':>10}{'seconds':>10}{'speedup':>10}")
+    move, score, nodes, sequential_seconds = run(ComputerPlayer("HAL2000"), args.depth)
+    print(f"{'sequential':<14}{str(move):>10}{score:>8}{nodes:>10}{sequential_seconds:>10.3f}{1:>10.2f}")
+
+    for workers in args.workers:
+        with ParallelComputerPlayer("HAL2000", workers=workers) as computer_player:
+            # Start every worker process before the measurement
+            list(computer_player._executor.map(abs, range(workers * 4)))
+            move, score, nodes, seconds = run(computer_player, args.depth)
+        label = f"{workers} workers"
+        print(f"{label:<14}{str(move):>10}{score:>8}{nodes:>10}{seconds:>10.3f}{sequential_seconds / seconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
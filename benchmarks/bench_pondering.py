@@ -0,0 +1,89 @@
+"""
+Benchmark of pondering, see backend.pondering. A ComputerPlayer with a time budget per move plays games against an
+opponent that searches to a fixed depth and then thinks for a while, like a human would. The player ponders in each
+mode, and not at all. The benchmark reports the ponder hit rate, the seconds of search pondering saved per move, and
+the mean depth the moves of the player reached. Once the search has proved the result of a game it stops at a shallow
+depth, those moves are counted apart and not in the mean depth.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_pondering [--games 4] [--time-limit-ms 100] [--think-ms 300]
+"""
+import argparse
+import math
+import statistics
+import time
+
+from backend.new_game import ComputerPlayer, GameBoard, TranspositionTable
+from backend.pondering import PONDER_MODES, Ponderer
+
+OPENINGS = ([[2, 3], [3, 4]], [[0, 0], [5, 7]], [[1, 6], [4, 1]], [[3, 2], [2, 5]])
+
+
+def play_game(mode, opening, time_limit_ms, think_ms, opponent_depth):
+    """
+    Plays a game on the standard board, the player moves first after the opening
+    Returns: (the Ponderer or None, the depths reached by the moves of the player, the number of proved moves)
+    """
+    player = ComputerPlayer("HAL2000", transposition_table=TranspositionTable())
+    opponent = ComputerPlayer("HAL9000")
+    state = GameBoard(8, 6, player, opponent)
+    state.active_player = player
+    for move in opening:
+        state.make_move(move)
+    ponderer = Ponderer(player, mode) if mode != "off" else None
+
+    depths = []
+    proved = 0
+    while not state.terminal_test():
+        if state.active_player is player:
+            if ponderer is None:
+                move = player.get_actions(state, time_limit_ms=time_limit_ms)
+            else:
+                move = ponderer.get_actions(state, time_limit_ms=time_limit_ms)
+            if math.isinf(player.best_score):
+                proved += 1
+            else:
+                depths.append(player.depth_reached)
+            state.make_move(move)
+            if ponderer is not None:
+                ponderer.start(state)
+        else:
+            move = opponent.get_actions(state, opponent_depth)
+            time.sleep(think_ms / 1000)
+            state.make_move(move)
+    if ponderer is not None:
+        ponderer.stop()
+    return ponderer, depths, proved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=4, help="games per mode, at most 4 openings")
+    parser.add_argument("--time-limit-ms", type=int, default=100, help="time budget of a move of the player")
+    parser.add_argument("--think-ms", type=int, default=300, help="time the opponent thinks about a move")
+    parser.add_argument("--opponent-depth", type=int, default=3, help="search depth of the opponent")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'moves':>6} {'proved':>7} {'hit rate':>9} {'saved s/move':>13} {'mean depth':>11}")
+    for mode in ("off",) + PONDER_MODES:
+        depths = []
+        proved = 0
+        ponders = hits = 0
+        seconds_saved = 0.0
+        for opening in OPENINGS[:args.games]:
+            ponderer, game_depths, game_proved = play_game(mode, opening, args.time_limit_ms, args.think_ms,
+                                                           args.opponent_depth)
+            depths.extend(game_depths)
+            proved += game_proved
+            if ponderer is not None:
+                ponders += ponderer.stats.ponders
+                hits += ponderer.stats.hits
+                seconds_saved += ponderer.stats.seconds_saved
+        hit_rate = hits / ponders if ponders else 0.0
+        saved = seconds_saved / ponders if ponders else 0.0
+        mean_depth = statistics.mean(depths) if depths else 0.0
+        print(f"{mode:<10} {len(depths) + proved:>6} {proved:>7} {hit_rate:>9.1%} {saved:>13.3f} {mean_depth:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
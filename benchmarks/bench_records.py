@@ -0,0 +1,70 @@
+"""
+Benchmark of the game record format in backend.records. Random games on the standard board are written to a record
+file, then read back and replayed. It reports the bytes per game, compared to pickling the final GameBoard with its
+players, and the games per second of writing, reading and replaying.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_records [--games 20000]
+"""
+import argparse
+import os
+import pickle
+import random
+import tempfile
+import time
+
+from backend.geometry import BOARD_SIZES
+from backend.new_game import GameBoard, HumanPlayer
+from backend.records import GameRecord, RecordWriter, read_games, replay
+
+
+def random_records(count, seed):
+    """ Plays random games on the standard board, returns the records and the final board of the first game """
+    rng = random.Random(seed)
+    x_length, y_length = BOARD_SIZES["standard"]
+    records = []
+    board = None
+    for _ in range(count):
+        board = GameBoard(x_length, y_length, HumanPlayer("Player 1"), HumanPlayer("Player 2"))
+        first_slot = board._active
+        cells = []
+        while not board.terminal_test():
+            move = rng.choice(board.get_player_moves())
+            board.make_move(move)
+            cells.append(move[0] * x_length + move[1])
+        records.append(GameRecord(x_length, y_length, first_slot, cells))
+    return records, board
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    records, board = random_records(args.games, args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "games.rec")
+        start = time.perf_counter()
+        with RecordWriter(path) as writer:
+            for record in records:
+                writer.write_game(record)
+        write_seconds = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        games = sum(1 for _ in read_games(path))
+        read_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        positions = sum(1 for record in read_games(path) for _ in replay(record))
+        replay_seconds = time.perf_counter() - start
+
+    print(f"{games} games, {size / games:.1f} bytes per game, a pickled final board takes {len(pickle.dumps(board))}")
+    print(f"write  {games / write_seconds:>12.0f} games/s")
+    print(f"read   {games / read_seconds:>12.0f} games/s")
+    print(f"replay {games / replay_seconds:>12.0f} games/s, {positions / replay_seconds:.0f} positions/s")
+
+
+if __name__ == "__main__":
+    main()
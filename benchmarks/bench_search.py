@@ -0,0 +1,230 @@
+"""
+Benchmark suite of the searches of the ComputerPlayer on a corpus of fixed mid-game positions of the small (2x3),
+medium (5x5) and standard (6x8) boards. minimax_decision, alpha_beta_search and get_actions search every position to
+a fixed depth, and for every search it reports:
+1) The nodes searched and the nodes per second
+2) The time to depth: the wall-clock time of the search
+3) The peak memory of the search, measured with tracemalloc in a separate run, because tracing slows the search down
+
+The results can be written to a JSON file. With --compare the results are checked against such a file from an earlier
+run, the baseline, and every search that got slower, searched more nodes or used more memory than the threshold allows
+is reported as a regression. The exit code is 1 when there are regressions.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_search [--output results.json] [--compare baseline.json] [--threshold 0.15]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer
+
+# Every position has the size of its board, the positions of player 1 and player 2 as [y, x], the other blocked cells,
+# the slot of the player with initiative, who is the computer player, and the depth of every search
+CORPUS = [
+    {
+        "name": "small-opening",
+        "board": (2, 3),
+        "positions": ([0, 0], [2, 1]),
+        "blocked": [],
+        "active": 0,
+        "depths": {"minimax": 4, "alpha_beta": 4, "get_actions": 4},
+    },
+    {
+        "name": "small-middle",
+        "board": (2, 3),
+        "positions": ([1, 1], [2, 0]),
+        "blocked": [[0, 0]],
+        "active": 1,
+        "depths": {"minimax": 3, "alpha_beta": 3, "get_actions": 3},
+    },
+    {
+        "name": "medium-opening",
+        "board": (5, 5),
+        "positions": ([2, 2], [0, 4]),
+        "blocked": [[1, 1]],
+        "active": 0,
+        "depths": {"minimax": 4, "alpha_beta": 7, "get_actions": 7},
+    },
+    {
+        "name": "medium-middle",
+        "board": (5, 5),
+        "positions": ([3, 1], [1, 3]),
+        "blocked": [[0, 0], [2, 2], [4, 4], [0, 3], [3, 4], [1, 0]],
+        "active": 1,
+        "depths": {"minimax": 5, "alpha_beta": 8, "get_actions": 8},
+    },
+    {
+        "name": "standard-opening",
+        "board": (8, 6),
+        "positions": ([2, 3], [4, 1]),
+        "blocked": [[1, 3], [4, 4]],
+        "active": 0,
+        "depths": {"minimax": 4, "alpha_beta": 5, "get_actions": 5},
+    },
+    {
+        "name": "standard-middle",
+        "board": (8, 6),
+        "positions": ([4, 5], [2, 3]),
+        "blocked": [[1, 1], [2, 5], [3, 3], [4, 2], [0, 6], [5, 7]],
+        "active": 1,
+        "depths": {"minimax": 4, "alpha_beta": 6, "get_actions": 6},
+    },
+]
+
+ALGORITHMS = ["minimax", "alpha_beta", "get_actions"]
+
+
+def create_position(position, computer_player):
+    """ Builds the board of a corpus position, the player with initiative is the computer player """
+    human_player = HumanPlayer("Frank")
+    players = (computer_player, human_player) if position["active"] == 0 else (human_player, computer_player)
+    state = GameBoard(*position["board"], *players)
+    state.active_player = computer_player
+    for player, cell in zip(players, position["positions"]):
+        state.positions[player] = cell
+        state.block_cell(cell)
+    for cell in position["blocked"]:
+        state.block_cell(cell)
+    return state
+
+
+def search(computer_player, state, algorithm, depth):
+    """ Runs one search and returns the move """
+    if algorithm == "minimax":
+        return computer_player.minimax_decision(state, depth)
+    if algorithm == "alpha_beta":
+        return computer_player.alpha_beta_search(state, depth)
+    return computer_player.get_actions(state, depth)
+
+
+def run_search(position, algorithm, depth, measure_memory=False):
+    """
+    Searches a corpus position with a new player, so every run starts with an empty transposition table
+    Returns: (move, nodes, seconds, peak bytes or None)
+    """
+    computer_player = ComputerPlayer("HAL2000")
+    state = create_position(position, computer_player)
+    computer_player.nodes_searched = 0
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    move = search(computer_player, state, algorithm, depth)
+    seconds = time.perf_counter() - start
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return move, computer_player.nodes_searched, seconds, peak
+
+
+def run_suite(algorithms=ALGORITHMS, boards=None, repeat=3, measure_memory=True):
+    """
+    Runs every search of the corpus. The time is the fastest of repeat runs.
+    Args:
+        algorithms: The searches to run
+        boards: The board sizes (width, height) to run, all if None
+        repeat: Number of timed runs of every search
+        measure_memory: Measure the peak memory in an extra run
+
+    Returns: List of results, one dictionary per position and search
+    """
+    results = []
+    for position in CORPUS:
+        if boards is not None and tuple(position["board"]) not in boards:
+            continue
+        for algorithm in algorithms:
+            depth = position["depths"][algorithm]
+            runs = [run_search(position, algorithm, depth) for _ in range(repeat)]
+            move, nodes, _, _ = runs[0]
+            seconds = min(run[2] for run in runs)
+            peak = run_search(position, algorithm, depth, measure_memory=True)[3] if measure_memory else None
+            results.append({
+                "position": position["name"],
+                "board": "{}x{}".format(*position["board"]),
+                "algorithm": algorithm,
+                "depth": depth,
+                "move": move,
+                "nodes": nodes,
+                "seconds": seconds,
+                "nodes_per_second": nodes / seconds if seconds else 0.0,
+                "peak_memory": peak,
+            })
+    return results
+
+
+def compare(results, baseline, threshold, min_seconds=0.05):
+    """
+    Compares results with the results of a baseline run. Searches that are not in both runs are skipped.
+    Args:
+        results: The results of run_suite
+        baseline: The results of an earlier run_suite
+        threshold: The allowed relative change, 0.15 allows 15% more time, nodes or memory
+        min_seconds: Searches that took less time in the baseline are too short to time, only their nodes and memory
+            are compared
+
+    Returns: List of (position, algorithm, measure, baseline value, new value) for every regression
+    """
+    regressions = []
+    baseline_results = {(result["position"], result["algorithm"], result["depth"]): result for result in baseline}
+    for result in results:
+        old_result = baseline_results.get((result["position"], result["algorithm"], result["depth"]))
+        if old_result is None:
+            continue
+        timed = old_result["seconds"] >= min_seconds
+        # Higher is worse for these measures, except for nodes per second
+        for measure in ("seconds", "nodes", "peak_memory") if timed else ("nodes", "peak_memory"):
+            old_value, new_value = old_result.get(measure), result.get(measure)
+            if old_value is not None and new_value is not None and new_value > old_value * (1 + threshold):
+                regressions.append((result["position"], result["algorithm"], measure, old_value, new_value))
+        old_value, new_value = old_result["nodes_per_second"], result["nodes_per_second"]
+        if timed and new_value < old_value * (1 - threshold):
+            regressions.append((result["position"], result["algorithm"], "nodes_per_second", old_value, new_value))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to check the results against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative change before a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="searches that took less time in the baseline are not timed in the comparison")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per search, the fastest counts")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, action="append", help="run only these searches")
+    parser.add_argument("--board", choices=["2x3", "5x5", "6x8"], action="append", help="run only these boards")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory runs")
+    args = parser.parse_args()
+
+    # The standard 6x8 board has 8 columns and 6 rows
+    sizes = {"2x3": (2, 3), "5x5": (5, 5), "6x8": (8, 6)}
+    boards = None if args.board is None else [sizes[board] for board in args.board]
+    results = run_suite(args.algorithm or ALGORITHMS, boards, args.repeat, not args.no_memory)
+
+    print(f"{'position':<18}{'search':<13}{'depth':>6}{'nodes':>10}{'seconds':>10}{'nodes/sec':>12}{'peak KB':>10}")
+    for result in results:
+        peak = "" if result["peak_memory"] is None else f"{result['peak_memory'] / 1024:.1f}"
+        print(f"{result['position']:<18}{result['algorithm']:<13}{result['depth']:>6}{result['nodes']:>10}"
+              f"{result['seconds']:>10.3f}{result['nodes_per_second']:>12.0f}{peak:>10}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "created": time.time(),
+                       "results": results}, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        for position, algorithm, measure, old_value, new_value in regressions:
+            print(f"REGRESSION {position} {algorithm} {measure}: {old_value:.6g} -> {new_value:.6g}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark of process startup. Every worker process of backend.parallel, backend.mcts, backend.tournament and
+backend.jobs imports the engine before its first search, so the import time is paid per worker. Every measurement runs
+in a new interpreter and the fastest of the runs is reported:
+- the interpreter alone, the time every process pays
+- the import time of the modules, and the heavy modules they load: the engine core, backend.new_game, loads neither
+  the web app nor the process pools nor the command line parsers
+- the cold time to the first move: importing the engine, creating a board and searching a move to a depth, and the
+  time of the whole process
+
+The modules are compiled first, so the timings don't include compiling them.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_startup [--runs 10] [--depth 4]
+"""
+import argparse
+import compileall
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+MODULES = ("backend.new_game", "backend.mcts", "backend.parallel", "backend.tournament", "backend.manager",
+           "backend.jobs", "app")
+HEAVY_MODULES = ("flask", "multiprocessing", "concurrent.futures", "threading", "argparse", "json", "backend.manager")
+
+IMPORT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+import json
+print(json.dumps([seconds, loaded]))
+"""
+
+FIRST_MOVE = """
+import time
+start = time.perf_counter()
+from backend.new_game import ComputerPlayer, GameBoard, HumanPlayer
+imported = time.perf_counter()
+player = ComputerPlayer("HAL2000")
+state = GameBoard(8, 6, player, HumanPlayer("Frank"))
+state.active_player = player
+state.make_move([2, 3])
+state.make_move([3, 4])
+player.get_actions(state, {depth})
+import json
+print(json.dumps([imported - start, time.perf_counter() - start]))
+"""
+
+
+def run(code, runs):
+    """
+    Runs the code in new interpreters
+    Returns: The outputs of the runs as JSON, and the seconds of every run
+    """
+    outputs = []
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        seconds.append(time.perf_counter() - start)
+        outputs.append(json.loads(output) if output else None)
+    return outputs, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10, help="runs of every measurement")
+    parser.add_argument("--depth", type=int, default=4, help="depth of the first move")
+    args = parser.parse_args()
+
+    compileall.compile_dir("backend", quiet=1)
+    compileall.compile_file("app.py", quiet=1)
+
+    _, seconds = run("pass", args.runs)
+    print(f"interpreter: {min(seconds) * 1000:.1f} ms per process\n")
+
+    print(f"{'module':<20} {'import ms':>10} {'median ms':>10}  heavy modules loaded")
+    for module in MODULES:
+        outputs, _ = run(IMPORT.format(module=module, heavy=HEAVY_MODULES), args.runs)
+        import_ms = [output[0] * 1000 for output in outputs]
+        print(f"{module:<20} {min(import_ms):>10.1f} {statistics.median(import_ms):>10.1f}  "
+              f"{', '.join(outputs[0][1]) or '-'}")
+
+    outputs, seconds = run(FIRST_MOVE.format(depth=args.depth), args.runs)
+    print(f"\nfirst move to depth {args.depth} on the standard board: "
+          f"import {min(output[0] for output in outputs) * 1000:.1f} ms, "
+          f"first move {min(output[1] for output in outputs) * 1000:.1f} ms after the start of the import, "
+          f"process {min(seconds) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark of pruning the symmetric root moves (ComputerPlayer.prune_symmetric_moves). On empty and early-game boards
+it reports the root moves and the nodes of an alpha-beta search with and without the pruning.
+
+A position only has symmetric root moves when a mirror image or rotation maps it onto itself: the empty board, and on
+the square 5x5 board the positions where the players stand on the center or a diagonal. The 8x6 board has no cell that
+its mirror images keep in place, so only its empty board gains.
+
+Run from the root of the repository:
+    python -m benchmarks.bench_symmetry [--depth 4]
+"""
+import argparse
+import time
+
+from backend.new_game import GameBoard, ComputerPlayer, HumanPlayer
+
+POSITIONS = [
+    ("5x5 empty", (5, 5), []),
+    ("5x5 center", (5, 5), [[2, 2]]),
+    ("5x5 diagonal", (5, 5), [[1, 1]]),
+    ("5x5 diagonal pair", (5, 5), [[0, 0], [3, 3]]),
+    ("8x6 empty", (8, 6), []),
+    ("8x6 first move", (8, 6), [[2, 3]]),
+]
+
+
+def measure(board, moves, depth, prune):
+    """ Runs one alpha-beta search and returns (root moves, nodes, seconds) """
+    computer_player = ComputerPlayer("HAL2000")
+    computer_player.prune_symmetric_moves = prune
+    human_player = HumanPlayer("Frank")
+    # The moves are made in turns, the computer player is to move after them
+    first_player = computer_player if len(moves) % 2 == 0 else human_player
+    state = GameBoard(*board, first_player, computer_player if first_player is human_player else human_player)
+    state.active_player = first_player
+    for move in moves:
+        state.make_move(move)
+
+    root_moves = state.get_player_moves()
+    if prune:
+        root_moves = state.unique_moves(root_moves)
+    start = time.perf_counter()
+    computer_player.alpha_beta_search(state, depth)
+    return len(root_moves), computer_player.nodes_searched, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--depth", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'position':<20}{'root moves':>12}{'unique':>8}{'nodes':>10}{'pruned':>10}{'reduction':>11}"
+          f"{'seconds':>9}{'pruned':>8}")
+    for name, board, moves in POSITIONS:
+        all_moves, nodes, seconds = measure(board, moves, args.depth, False)
+        unique_moves, pruned_nodes, pruned_seconds = measure(board, moves, args.depth, True)
+        print(f"{name:<20}{all_moves:>12}{unique_moves:>8}{nodes:>10}{pruned_nodes:>10}"
+              f"{1 - pruned_nodes / nodes:>11.0%}{seconds:>9.2f}{pruned_seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Load test of the JSON API of app.py. Creates thousands of games that are all played at the same time: a pool of client
+threads takes a game from a shared queue, makes one move and puts the game back until it's over. The move is a random
+move for the human player. For the computer player a search job is started, and the job is waited for with a long-poll.
+It reports the requests per second and the latency percentiles of every kind of request.
+
+Start a server first, or let the load test start one in this process with --serve:
+    python -m benchmarks.load_test --serve [--games 2000] [--clients 32] [--board medium] [--time-limit-ms 20]
+    python -m benchmarks.load_test --url http://127.0.0.1:5000
+"""
+import argparse
+import json
+import queue
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+
+def call(url, method, path, data=None):
+    """ Sends a JSON request and returns (status, decoded JSON body) """
+    body = None if data is None else json.dumps(data).encode()
+    http_request = urllib.request.Request(url + path, data=body, method=method,
+                                          headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(http_request, timeout=60) as response:
+            content = response.read()
+            return response.status, json.loads(content) if content else None
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read() or b"null")
+
+
+class LoadTest:
+    """ Plays the games and keeps the latency of every request by kind """
+
+    def __init__(self, url, board, time_limit_ms, seed):
+        self.url = url
+        self.board = board
+        self.time_limit_ms = time_limit_ms
+        self.rng = random.Random(seed)
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.finished = 0
+        self._lock = threading.Lock()
+
+    def request(self, kind, method, path, data=None):
+        start = time.perf_counter()
+        status, body = call(self.url, method, path, data)
+        with self._lock:
+            self.latencies[kind].append(time.perf_counter() - start)
+            if status >= 400:
+                self.errors[(kind, status)] += 1
+        return status, body
+
+    def create_game(self):
+        first = "human" if self.rng.random() < 0.5 else "computer"
+        status, state = self.request("create", "POST", "/games", {"board": self.board, "first": first})
+        return state if status == 201 else None
+
+    def play_move(self, state):
+        """ Makes one move in the game, returns the new state or None when the game is over or gone """
+        path = f"/games/{state['game_id']}"
+        if state["active"] == "human":
+            with self._lock:
+                move = self.rng.choice(state["legal_moves"])
+            status, state = self.request("move", "POST", path + "/moves", {"move": move})
+        else:
+            status, job = self.request("ai-move", "POST", path + "/ai-move", {"time_limit_ms": self.time_limit_ms})
+            if status == 503:
+                # The queue of searches is full, the game tries again later
+                return state
+            while status == 202 or (status == 200 and job["status"] in ("queued", "running")):
+                status, job = self.request("poll", "GET", f"/jobs/{job['job_id']}?wait=10")
+            if status != 200 or job["status"] != "done":
+                return None
+            state = job["game"]
+        if status != 200:
+            return None
+        if state["game_over"]:
+            self.request("delete", "DELETE", path)
+            with self._lock:
+                self.finished += 1
+            return None
+        return state
+
+    def run(self, games, clients):
+        """ Creates the games and plays them to the end with the client threads """
+        games_queue = queue.Queue()
+
+        def client():
+            while True:
+                state = games_queue.get()
+                if state is None:
+                    return
+                if state.get("game_id") is None:
+                    state = self.create_game()
+                else:
+                    state = self.play_move(state)
+                if state is not None:
+                    games_queue.put(state)
+                games_queue.task_done()
+
+        # Games are created by the clients as well, so all games are in play at the same time
+        for _ in range(games):
+            games_queue.put({})
+        threads = [threading.Thread(target=client, daemon=True) for _ in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        games_queue.join()
+        seconds = time.perf_counter() - start
+        for _ in threads:
+            games_queue.put(None)
+        return seconds
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--serve", action="store_true", help="start the API in this process on a free port")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=32, help="number of client threads")
+    parser.add_argument("--board", default="medium", choices=["small", "medium", "standard"])
+    parser.add_argument("--time-limit-ms", type=int, default=20, help="search time of the computer player per move")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    url = args.url
+    if args.serve:
+        import logging
+        from werkzeug.serving import make_server
+        from app import create_app
+
+        # The server would log every request
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}"
+
+    load_test = LoadTest(url, args.board, args.time_limit_ms, args.seed)
+    seconds = load_test.run(args.games, args.clients)
+
+    requests = sum(len(latencies) for latencies in load_test.latencies.values())
+    print(f"{args.games} games, {load_test.finished} finished, {requests} requests in {seconds:.1f}s: "
+          f"{requests / seconds:.0f} requests/sec")
+    print(f"{'request':<10}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for kind, latencies in sorted(load_test.latencies.items()):
+        print(f"{kind:<10}{len(latencies):>8}{percentile(latencies, 0.5) * 1000:>10.1f}"
+              f"{percentile(latencies, 0.95) * 1000:>10.1f}{percentile(latencies, 0.99) * 1000:>10.1f}"
+              f"{max(latencies) * 1000:>10.1f}")
+    for (kind, status), count in sorted(load_test.errors.items()):
+        print(f"errors {kind} {status}: {count}")
+    print(json.dumps(call(url, "GET", "/stats")[1]))
+
+
+if __name__ == "__main__":
+    main()
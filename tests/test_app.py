@@ -0,0 +1,74 @@
+import unittest
+
+try:
+    from app import create_app
+except ImportError:
+    create_app = None
+from backend.jobs import JobManager
+from backend.sessions import SessionStore
+
+
+@unittest.skipUnless(create_app, "Flask is not installed")
+class TestGameApi(unittest.TestCase):
+
+    def setUp(self):
+        self.store = SessionStore(max_games=10)
+        self.jobs = JobManager(self.store, workers=1)
+        self.client = create_app(self.store, self.jobs).test_client()
+
+    def tearDown(self):
+        self.jobs.close()
+
+    def test_play_over_http(self):
+        """ A game is created, moved in and played by the computer over the JSON API"""
+        response = self.client.post("/games", json={"board": "medium", "first": "human", "player_name": "Frank"})
+        self.assertEqual(response.status_code, 201)
+        game_id = response.get_json()["game_id"]
+
+        response = self.client.post(f"/games/{game_id}/moves", json={"move": [2, 2]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["active"], "computer")
+
+        response = self.client.post(f"/games/{game_id}/ai-move", json={"depth": 2})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.get_json()["job_id"]
+        self.assertEqual(response.headers["Location"], f"/jobs/{job_id}")
+        job = self.client.get(f"/jobs/{job_id}?wait=10").get_json()
+        self.assertEqual(job["status"], "done")
+        self.assertEqual(job["game"]["positions"]["computer"], job["move"])
+        self.assertEqual(job["game"]["active"], "human")
+        self.assertEqual(self.client.get(f"/games/{game_id}").get_json()["positions"]["human"], [2, 2])
+
+        self.assertEqual(self.client.delete(f"/games/{game_id}").status_code, 204)
+        self.assertEqual(self.client.get(f"/games/{game_id}").status_code, 404)
+
+    def test_errors(self):
+        """ Unknown games, invalid and out of turn moves are reported with their status code"""
+        self.assertEqual(self.client.get("/games/unknown").status_code, 404)
+        self.assertEqual(self.client.post("/games", json={"board": "huge"}).status_code, 400)
+        for body in ({"width": 5}, {"height": 5}, {"width": None, "height": 5}, {"width": "5", "height": 5},
+                     {"board": [5, 5]}, [1]):
+            self.assertEqual(self.client.post("/games", json=body).status_code, 400, body)
+        self.assertEqual(self.client.post("/games", json={"width": 5, "height": 4}).status_code, 201)
+
+        game_id = self.client.post("/games", json={"board": "small", "first": "computer"}).get_json()["game_id"]
+        self.assertEqual(self.client.post(f"/games/{game_id}/moves", json={"move": [0, 0]}).status_code, 409)
+        job_id = self.client.post(f"/games/{game_id}/ai-move", json={"depth": 1}).get_json()["job_id"]
+        self.client.get(f"/jobs/{job_id}?wait=10")
+        self.assertEqual(self.client.post(f"/games/{game_id}/ai-move").status_code, 409)
+        self.assertEqual(self.client.get("/jobs/unknown").status_code, 404)
+        for body in ({"depth": [1]}, {"depth": 0}, {"depth": -1}, {"depth": "2"}, {"time_limit_ms": {"ms": 5}}, [1]):
+            self.assertEqual(self.client.post(f"/games/{game_id}/ai-move", json=body).status_code, 400, body)
+        self.assertEqual(self.client.post(f"/games/{game_id}/moves", json={"move": "a1"}).status_code, 400)
+        self.assertEqual(self.client.post(f"/games/{game_id}/moves", json={"move": [9, 9]}).status_code, 400)
+        self.assertEqual(self.client.get("/stats").get_json()["games"], 2)
+
+    def test_job_events(self):
+        """ The events of a job end with the finished job"""
+        game_id = self.client.post("/games", json={"board": "small", "first": "computer"}).get_json()["game_id"]
+        job_id = self.client.post(f"/games/{game_id}/ai-move", json={"depth": 2}).get_json()["job_id"]
+        response = self.client.get(f"/jobs/{job_id}/events")
+        self.assertEqual(response.mimetype, "text/event-stream")
+        events = response.get_data(as_text=True).strip().split("\n\n")
+        self.assertTrue(events[-1].startswith("event: finished\ndata: "))
+        self.assertIn('"status": "done"', events[-1])
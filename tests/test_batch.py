@@ -0,0 +1,85 @@
+import random
+import unittest
+from backend.new_game import *
+
+try:
+    import numpy as np
+    from backend.batch import BoardBatch
+except ImportError:
+    np = None
+
+
+def random_boards(x_length, y_length, count, rng):
+    """ Boards after a random number of random moves, some of them finished games """
+    boards = []
+    for _ in range(count):
+        board = GameBoard(x_length, y_length, "test_pl_1", "test_pl_2")
+        for _ in range(rng.randrange(x_length * y_length)):
+            if board.terminal_test():
+                break
+            board.make_move(rng.choice(board.get_legal_moves(board.positions[board.active_player])))
+        boards.append(board)
+    return boards
+
+
+def mask_to_int(mask):
+    """ Converts a (height, width) bool array to the bitboard of GameBoard """
+    return sum(1 << int(cell) for cell in np.flatnonzero(mask))
+
+
+@unittest.skipUnless(np, "NumPy is not installed")
+class TestBoardBatch(unittest.TestCase):
+
+    def test_parity_with_game_board(self):
+        """ Legal moves, mobility and terminal flags equal the per board GameBoard results"""
+        rng = random.Random(11)
+        for x_length, y_length in [(3, 2), (5, 5), (8, 6)]:
+            boards = random_boards(x_length, y_length, 200, rng)
+            batch = BoardBatch.from_boards(boards)
+            masks = batch.legal_move_masks()
+            mobility = batch.mobility()
+            terminal = batch.terminal()
+            opponent_mobility = batch.mobility(1 - batch.active)
+
+            for i, board in enumerate(boards):
+                expected_mask = board.legal_moves_mask(board.positions[board.active_player])
+                opponent_mask = board.legal_moves_mask(board.positions[board.get_opponent(board.active_player)])
+                self.assertEqual(mask_to_int(masks[i]), expected_mask)
+                self.assertEqual(mobility[i], expected_mask.bit_count())
+                self.assertEqual(opponent_mobility[i], opponent_mask.bit_count())
+                self.assertEqual(terminal[i], board.terminal_test())
+
+    def test_apply_moves(self):
+        """ Applying a vector of moves gives the same boards as make_move on each board"""
+        rng = random.Random(5)
+        boards = [board for board in random_boards(5, 5, 100, rng) if not board.terminal_test()]
+        batch = BoardBatch.from_boards(boards)
+        moves = batch.random_moves(np.random.default_rng(5))
+        batch.apply_moves(moves)
+
+        for i, board in enumerate(boards):
+            board.make_move([int(moves[i, 0]), int(moves[i, 1])])
+            rebuilt_board = batch.to_board(i, "test_pl_1", "test_pl_2")
+            self.assertEqual(rebuilt_board._board, board._board)
+            self.assertEqual(rebuilt_board.positions, board.positions)
+            self.assertEqual(rebuilt_board.active_player, board.active_player)
+
+    def test_illegal_moves_rejected(self):
+        """ A batch with one illegal move isn't changed"""
+        batch = BoardBatch(5, 5, 2)
+        batch.apply_moves([[0, 0], [2, 2]])
+        self.assertRaises(ValueError, batch.apply_moves, [[0, 0], [4, 4]])
+        self.assertRaises(ValueError, batch.apply_moves, [[5, 0], [4, 4]])
+        self.assertEqual(batch.blocked.sum(), 2)
+
+    def test_self_play(self):
+        """ Random self-play on the batch ends every game"""
+        batch = BoardBatch(5, 5, 50)
+        generator = np.random.default_rng(0)
+        playing = ~batch.terminal()
+        while playing.any():
+            # Finished games have no move and are left alone
+            batch.apply_moves(batch.random_moves(generator), where=playing)
+            playing = ~batch.terminal()
+
+        self.assertTrue(batch.terminal().all())
@@ -0,0 +1,37 @@
+import unittest
+from benchmarks.bench_search import CORPUS, ALGORITHMS, create_position, run_suite, compare
+from backend.new_game import ComputerPlayer
+
+
+class TestSearchBenchmark(unittest.TestCase):
+
+    def test_corpus_positions(self):
+        """ Every corpus position is a game in progress where the computer player has initiative"""
+        for position in CORPUS:
+            computer_player = ComputerPlayer("HAL2000")
+            state = create_position(position, computer_player)
+            self.assertIs(state.active_player, computer_player)
+            self.assertFalse(state.terminal_test())
+            self.assertEqual(sorted(position["depths"]), sorted(ALGORITHMS))
+
+    def test_suite_results(self):
+        """ The small boards are searched by every algorithm, and a run compares clean against itself"""
+        results = run_suite(boards=[(2, 3)], repeat=1)
+        self.assertEqual(len(results), 2 * len(ALGORITHMS))
+        for result in results:
+            self.assertGreater(result["nodes"], 0)
+            self.assertGreater(result["peak_memory"], 0)
+        self.assertEqual(compare(results, results, 0.15), [])
+
+    def test_compare_flags_regressions(self):
+        """ More nodes, more memory and a slower search are regressions, faster searches are not"""
+        baseline = [{"position": "p", "algorithm": "alpha_beta", "depth": 4, "nodes": 1000, "seconds": 1.0,
+                     "nodes_per_second": 1000.0, "peak_memory": 1000}]
+        faster = [dict(baseline[0], seconds=0.5, nodes_per_second=2000.0)]
+        slower = [dict(baseline[0], nodes=1500, seconds=2.0, nodes_per_second=750.0, peak_memory=2000)]
+        self.assertEqual(compare(faster, baseline, 0.15), [])
+        self.assertEqual([regression[2] for regression in compare(slower, baseline, 0.15)],
+                         ["seconds", "nodes", "peak_memory", "nodes_per_second"])
+        # Searches that are too short to time are only compared on nodes and memory
+        self.assertEqual([regression[2] for regression in compare(slower, baseline, 0.15, min_seconds=5)],
+                         ["nodes", "peak_memory"])
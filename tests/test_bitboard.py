@@ -0,0 +1,174 @@
+import random
+import unittest
+from backend.new_game import *
+
+
+class ListGameBoard:
+    """ The original list-of-lists board, kept as the reference for the bitboard parity tests """
+
+    def __init__(self, x_length, y_length):
+        self._board = [[False for _ in range(x_length)] for _ in range(y_length)]
+
+    def get_all_blanc(self):
+        return [[y, x] for y in range(len(self._board)) for x in range(len(self._board[0]))
+                if self._board[y][x] is False]
+
+    def get_legal_moves(self, position=None):
+        if not position:
+            return self.get_all_blanc()
+        x_length = len(self._board[0])
+        y_length = len(self._board)
+
+        legal_moves = []
+        directions = [[1, -1], [-1, 1],
+                      [1, 1], [-1, -1],
+                      [0, 1], [0, -1],
+                      [1, 0], [-1, 0]]
+
+        for direction in directions:
+            new_position = position
+            proceed = True
+            while proceed:
+                new_position = [new_position[0] + direction[0], new_position[1] + direction[1]]
+                if not 0 <= new_position[0] < y_length or not 0 <= new_position[1] < x_length:
+                    proceed = False
+                elif self._board[new_position[0]][new_position[1]] is True:
+                    proceed = False
+                else:
+                    legal_moves.append(new_position)
+
+        return legal_moves
+
+
+class TestBitboardParity(unittest.TestCase):
+
+    board_sizes = [(2, 3), (3, 2), (3, 3), (5, 5), (8, 6), (1, 4), (4, 1)]
+
+    def assert_same_board(self, board, reference):
+        """ Compare the legal moves from every cell, blocked or not, of both boards """
+        self.assertEqual(board.get_all_blanc(), reference.get_all_blanc())
+        for y in range(board._board_height):
+            for x in range(board._board_width):
+                self.assertEqual(board.get_legal_moves([y, x]), reference.get_legal_moves([y, x]))
+                self.assertEqual(board.is_blocked([y, x]), reference._board[y][x])
+
+    def test_empty_boards(self):
+        """ Every cell of an empty board has the same legal moves, in the same order"""
+        for x_length, y_length in self.board_sizes:
+            board = GameBoard(x_length, y_length, "test_pl_1", "test_pl_2")
+            reference = ListGameBoard(x_length, y_length)
+            self.assert_same_board(board, reference)
+
+    def test_random_blocked_cells(self):
+        """ Block random cells and compare the legal moves after every blocked cell"""
+        rng = random.Random(1234)
+        for x_length, y_length in self.board_sizes:
+            for _ in range(5):
+                board = GameBoard(x_length, y_length, "test_pl_1", "test_pl_2")
+                reference = ListGameBoard(x_length, y_length)
+                cells = [[y, x] for y in range(y_length) for x in range(x_length)]
+                rng.shuffle(cells)
+                for y, x in cells:
+                    board.block_cell([y, x])
+                    reference._board[y][x] = True
+                    self.assert_same_board(board, reference)
+
+    def test_random_games(self):
+        """ Play random games and check the moves, terminal test and game over flag against the reference"""
+        rng = random.Random(42)
+        for x_length, y_length in self.board_sizes:
+            for _ in range(20):
+                board = GameBoard(x_length, y_length, "test_pl_1", "test_pl_2")
+                reference = ListGameBoard(x_length, y_length)
+                reference_positions = {"test_pl_1": None, "test_pl_2": None}
+                while True:
+                    player = board.active_player
+                    legal_moves = board.get_legal_moves(board.positions[player])
+                    self.assertEqual(legal_moves, reference.get_legal_moves(reference_positions[player]))
+                    self.assertEqual(board.terminal_test(), len(legal_moves) == 0)
+                    if not legal_moves:
+                        self.assertTrue(board.game_over)
+                        break
+
+                    move = rng.choice(legal_moves)
+                    self.assertIs(board.make_move(move), board)
+                    reference._board[move[0]][move[1]] = True
+                    reference_positions[player] = move
+                    self.assertEqual(board.positions[player], move)
+                    self.assertNotEqual(board.active_player, player)
+
+    def test_illegal_moves_rejected(self):
+        """ Moves off the board, onto blocked cells or through blocked cells are rejected"""
+        board = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+        board.active_player = board.player_1
+        board.make_move([2, 2])
+        board.active_player = board.player_1
+        board.block_cell([2, 3])
+
+        self.assertFalse(board.make_move([2, 2]))
+        self.assertFalse(board.make_move([2, 4]))
+        self.assertFalse(board.make_move([5, 2]))
+        self.assertFalse(board.make_move([0, 1]))
+        self.assertIs(board.make_move([0, 0]), board)
+
+    def test_clone_is_independent(self):
+        """ Moves on a clone don't change the original board"""
+        board = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+        board.make_move([0, 0])
+        cloned_board = board.clone()
+        cloned_board.make_move([4, 4])
+
+        self.assertFalse(board.is_blocked([4, 4]))
+        self.assertTrue(cloned_board.is_blocked([4, 4]))
+        self.assertEqual(cloned_board.active_player, board.player_1 if board.active_player == board.player_2
+                         else board.player_2)
+
+    def test_ray_tables_are_shared(self):
+        """ Boards of the same size share one set of precomputed rays"""
+        board_1 = GameBoard(8, 6, "test_pl_1", "test_pl_2")
+        board_2 = GameBoard(8, 6, "test_pl_1", "test_pl_2")
+        self.assertIs(board_1._rays, board_2._rays)
+
+
+class TestApplyUndoMove(unittest.TestCase):
+
+    def snapshot(self, board):
+        return board._board, dict(board.positions), board.active_player, board.game_over
+
+    def test_undo_restores_state(self):
+        """ Apply random move sequences and undo them one by one, every intermediate state must come back"""
+        rng = random.Random(7)
+        for x_length, y_length in [(3, 2), (5, 5), (8, 6)]:
+            for _ in range(10):
+                board = GameBoard(x_length, y_length, "test_pl_1", "test_pl_2")
+                snapshots = []
+                while not board.terminal_test():
+                    snapshots.append(self.snapshot(board))
+                    board.apply_move(rng.choice(board.get_legal_moves(board.positions[board.active_player])))
+
+                while snapshots:
+                    board.undo_move()
+                    self.assertEqual(self.snapshot(board), snapshots.pop())
+                self.assertEqual(board._history, [])
+
+    def test_apply_move_matches_make_move(self):
+        """ apply_move leaves the board in the same state as a validated make_move"""
+        board = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+        cloned_board = board.clone()
+        for move in [[2, 2], [4, 4], [3, 2], [3, 3]]:
+            board.make_move(move)
+            cloned_board.apply_move(move)
+            self.assertEqual(self.snapshot(board), self.snapshot(cloned_board))
+
+    def test_search_leaves_board_unchanged(self):
+        """ The search walks the tree on the board it is given and must leave it as it found it"""
+        computer_player = ComputerPlayer("HAL2000")
+        human_player = HumanPlayer("Frank")
+        board = GameBoard(5, 5, computer_player, human_player)
+        board.active_player = computer_player
+        board.make_move([2, 3])
+        board.make_move([4, 1])
+        before = self.snapshot(board)
+
+        computer_player.minimax_decision(board, depth=3)
+        self.assertEqual(self.snapshot(board), before)
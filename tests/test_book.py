@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from backend.new_game import *
+from backend.book import OpeningBook, build_book, write_book
+
+
+def mirrored(state, player_1, player_2, symmetry):
+    """ The position mapped by one of the symmetries of its board """
+    permutation = symmetries(state._board_width, state._board_height)[symmetry][0]
+    board = GameBoard(state._board_width, state._board_height, player_1, player_2)
+    for cell in range(state._board_width * state._board_height):
+        if state.is_blocked(list(divmod(cell, state._board_width))):
+            board.block_cell(list(divmod(permutation[cell], state._board_width)))
+    for player, own_player in ((player_1, state.player_1), (player_2, state.player_2)):
+        cell = state.get_cell(own_player)
+        if cell >= 0:
+            board.positions[player] = list(divmod(permutation[cell], state._board_width))
+    board.active_player = player_1 if state.active_player == state.player_1 else player_2
+    return board
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "5x5.book")
+        write_book(cls.path, 5, 5, 2, build_book(5, 5, 2, depth=2))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_book_positions(self):
+        """ The book has one entry per set of symmetric positions and gives the same move for every one of them"""
+        with OpeningBook(self.path) as book:
+            # The empty board with either player to move, and the six different first moves of either player
+            self.assertEqual(len(book), 14)
+            self.assertEqual(os.path.getsize(self.path), 24 + 32 * 15)
+
+            state = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+            state.active_player = "test_pl_2"
+            state.make_move([0, 1])
+            move, depth, _ = book.lookup(state)
+            self.assertIn(move, state.get_player_moves())
+            self.assertEqual(depth, 2)
+            for symmetry, (permutation, _) in enumerate(symmetries(5, 5)):
+                mirrored_move = book.lookup(mirrored(state, "test_pl_1", "test_pl_2", symmetry))[0]
+                self.assertEqual(mirrored_move, list(divmod(permutation[move[0] * 5 + move[1]], 5)))
+
+            # Out of the book
+            state.make_move(move)
+            self.assertIsNone(book.lookup(state))
+            self.assertIsNone(book.lookup(GameBoard(8, 6, "test_pl_1", "test_pl_2")))
+
+    def test_player_falls_back_to_search(self):
+        """ The computer player answers from the book without a search, and searches when the game leaves the book"""
+        with OpeningBook(self.path) as book:
+            computer_player = ComputerPlayer("HAL2000", opening_book=book)
+            state = GameBoard(5, 5, computer_player, HumanPlayer("Frank"))
+            state.active_player = computer_player
+            move = computer_player.get_actions(state, 4)
+            self.assertEqual(computer_player.nodes_searched, 0)
+            self.assertEqual(computer_player.principal_variation, [move])
+
+            state.make_move(move)
+            state.make_move(state.get_player_moves()[0])
+            computer_player.get_actions(state, 4)
+            self.assertGreater(computer_player.nodes_searched, 0)
+            self.assertEqual(computer_player.depth_reached, 4)
+
+    def test_invalid_book(self):
+        """ Files that aren't a book are refused"""
+        path = os.path.join(self.directory.name, "invalid.book")
+        with open(path, "wb") as file:
+            file.write(b"NOPE" + bytes(40))
+        self.assertRaises(ValueError, OpeningBook, path)
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+from backend.new_game import *
+from backend.checkpoint import Checkpoint, CheckpointingPlayer, write_checkpoint
+from backend.manager import GameManager
+from backend.transposition import TTEntry
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.isoc")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_game(self, player, x_length=5, y_length=5):
+        human_player = HumanPlayer("Frank")
+        game_state = GameBoard(x_length, y_length, player, human_player)
+        game_state.active_player = player
+        game_state.make_move([2, 2])
+        game_state.make_move([1, 3])
+        return game_state
+
+    def test_round_trip(self):
+        """ The position, the players and the search state come back as they were written"""
+        player = ComputerPlayer("HAL2000", transposition_table=TranspositionTable(1 << 12))
+        game_state = self.create_game(player)
+        move = player.get_actions(game_state, 4)
+        write_checkpoint(self.path, game_state, player)
+
+        with Checkpoint(self.path) as checkpoint:
+            restored = checkpoint.board()
+            restored_player = restored.player_1
+            self.assertEqual(restored.to_bytes(), game_state.to_bytes())
+            self.assertEqual(checkpoint.names, ["HAL2000", "Frank"])
+            self.assertIsInstance(restored_player, ComputerPlayer)
+            self.assertIsInstance(restored.player_2, HumanPlayer)
+            self.assertIs(restored.active_player, restored_player)
+            self.assertEqual(restored_player.depth_reached, 4)
+            self.assertEqual(restored_player.principal_variation, [move])
+            self.assertEqual(restored_player.best_score, player.best_score)
+            table = restored_player.transposition_table
+            self.assertEqual((table.size, table.generation, len(table)),
+                             (player.transposition_table.size, player.transposition_table.generation,
+                              len(player.transposition_table)))
+            self.assertCountEqual(table.entries(), player.transposition_table.entries())
+            self.assertEqual(restored_player.move_ordering.export_state(), player.move_ordering.export_state())
+
+    def test_resume_search(self):
+        """ The search of the restored position answers the depths of the checkpoint from its table"""
+        player = ComputerPlayer("HAL2000", transposition_table=TranspositionTable())
+        game_state = self.create_game(player, 8, 6)
+        move = player.get_actions(game_state, 6)
+        nodes = player.nodes_searched
+        write_checkpoint(self.path, game_state, player)
+
+        restored = Checkpoint(self.path).board()
+        self.assertEqual(restored.player_1.get_actions(restored, 6), move)
+        self.assertLess(restored.player_1.nodes_searched, nodes / 5)
+
+    def test_base_table(self):
+        """ Written slots hide the slots of the checkpoint, the entries and the size count both"""
+        player = ComputerPlayer("HAL2000", transposition_table=TranspositionTable(16))
+        game_state = self.create_game(player)
+        for key in (4, 21):
+            player.transposition_table.store(key, 2, 1.5, EXACT, [0, 1])
+        write_checkpoint(self.path, game_state, player)
+
+        table = Checkpoint(self.path).transposition_table()
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.probe(21), TTEntry(21, 2, 1.5, EXACT, [0, 1], 0))
+        self.assertIsNone(table.probe(3))
+        table.store(4, 3, -1.0, LOWER)
+        table.store(7, 1, 0.0, UPPER)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.probe(4).depth, 3)
+        self.assertCountEqual([entry.key for entry in table.entries()], [4, 7, 21])
+        table.clear()
+        self.assertEqual(len(table), 0)
+        self.assertIsNone(table.probe(21))
+
+    def test_no_search_state(self):
+        write_checkpoint(self.path, self.create_game(HumanPlayer("Dave")))
+        with Checkpoint(self.path) as checkpoint:
+            self.assertIsNone(checkpoint.transposition_table())
+            self.assertIsNone(checkpoint.best_score)
+            self.assertEqual(checkpoint.board().player_1.player_name, "Dave")
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as file:
+            file.write(b"ISOB" + bytes(64))
+        self.assertRaises(ValueError, Checkpoint, self.path)
+
+    def test_checkpointing_player(self):
+        """ The player writes checkpoints during its search, and one after it"""
+        player = CheckpointingPlayer("HAL2000", self.path, interval=0.0)
+        game_state = self.create_game(player, 8, 6)
+        move = player.get_actions(game_state, 4)
+        self.assertGreater(player.checkpoints, 1)
+        self.assertEqual(os.listdir(self.directory.name), ["game.isoc"])
+        with Checkpoint(self.path) as checkpoint:
+            self.assertEqual(checkpoint.board_bytes, game_state.to_bytes())
+            self.assertEqual((checkpoint.depth_reached, checkpoint.best_move), (4, move))
+
+    def test_game_manager(self):
+        """ A game of the GameManager goes on from its checkpoint with the computer player of the manager"""
+        manager = GameManager()
+        manager.create_game("medium")
+        computer_player = manager.game.player_2
+        manager.game.active_player = computer_player
+        manager.game.make_move(computer_player.get_actions(manager.game, 3))
+        manager.save_game(self.path)
+
+        computer_player = ComputerPlayer("HAL9000")
+        restored = GameManager(computer_player)
+        restored.load_game(self.path)
+        self.assertEqual(restored.game.to_bytes(), manager.game.to_bytes())
+        self.assertIs(restored.game.player_2, computer_player)
+        self.assertEqual(computer_player.depth_reached, 3)
+        self.assertEqual(restored.game.player_1.player_type, "Human")
+
+
+if __name__ == '__main__':
+    unittest.main()
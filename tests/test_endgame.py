@@ -0,0 +1,95 @@
+import random
+import unittest
+from backend.new_game import *
+from backend.endgame import EndgameSolver, reachable_cells
+
+
+class TestEndgame(unittest.TestCase):
+
+    def create_game(self):
+        """ A 4x4 board walled off by the second column: player 1 in the first column, player 2 on the right"""
+        player_1, player_2 = ComputerPlayer("test_pl_1"), ComputerPlayer("test_pl_2")
+        game_state = GameBoard(4, 4, player_1, player_2)
+        game_state.active_player = player_1
+        game_state.make_move([0, 0])
+        game_state.make_move([0, 3])
+        for y in range(4):
+            game_state.block_cell([y, 1])
+        return game_state
+
+    def test_reachable_cells(self):
+        """ The flood fill steps to all eight neighbours, but doesn't wrap around the edges of the board"""
+        self.assertEqual(reachable_cells(0, 0b111111110, 3, 3), 0b111111110)
+        self.assertEqual(reachable_cells(0, 0b100010000, 3, 3), 0b100010000)
+        # Cell 3 follows cell 2 on the bitboard, but starts the next row
+        self.assertEqual(reachable_cells(2, 0b1000, 3, 3), 0)
+
+    def test_regions(self):
+        """ The players of a walled off board each have their own region"""
+        game_state = self.create_game()
+        active_region, opponent_region = EndgameSolver().regions(game_state)
+        self.assertEqual(game_state.moves_from_mask(active_region), [[1, 0], [2, 0], [3, 0]])
+        self.assertEqual(len(game_state.moves_from_mask(opponent_region)), 7)
+
+        # Players that can reach a common cell aren't partitioned
+        game_state = GameBoard(4, 4, "test_pl_1", "test_pl_2")
+        game_state.active_player = "test_pl_1"
+        game_state.make_move([0, 0])
+        game_state.make_move([0, 3])
+        self.assertIsNone(EndgameSolver().regions(game_state))
+        self.assertIsNone(EndgameSolver().regions(GameBoard(4, 4, "test_pl_1", "test_pl_2")))
+
+    def test_solve(self):
+        """ The active player with the shorter path loses"""
+        game_state = self.create_game()
+        solver = EndgameSolver()
+        active_region, opponent_region = solver.regions(game_state)
+        self.assertEqual(solver.longest_path(game_state, game_state.get_cell(), active_region), 3)
+        self.assertEqual(solver.longest_path(game_state, game_state.get_cell(game_state.player_2), opponent_region), 7)
+        self.assertEqual(solver.solve(game_state, game_state.player_1), float("-inf"))
+        self.assertEqual(solver.solve(game_state, game_state.player_2), float("inf"))
+        self.assertEqual(solver.solved, 2)
+        self.assertIsNone(EndgameSolver(max_region_cells=6).solve(game_state, game_state.player_1))
+
+    def test_parity(self):
+        """ The solver agrees with a full search of every partitioned position of random games on small boards"""
+        rng = random.Random(15)
+        solver = EndgameSolver()
+        checked = 0
+        for _ in range(60):
+            player_1, player_2 = ComputerPlayer("test_pl_1"), ComputerPlayer("test_pl_2")
+            game_state = GameBoard(*rng.choice([(4, 4), (5, 4), (4, 5), (5, 5)]), player_1, player_2)
+            game_state.active_player = player_1
+            while not game_state.terminal_test():
+                if game_state.count_blanc() <= 14 and solver.regions(game_state) is not None:
+                    player = game_state.active_player
+                    player.alpha_beta_search(game_state)
+                    self.assertEqual(solver.solve(game_state, player), player.best_score)
+                    checked += 1
+                game_state.make_move(rng.choice(game_state.get_player_moves()))
+        self.assertGreater(checked, 50)
+
+    def test_search(self):
+        """ A search with the solver finds the same result as the full search, with fewer nodes"""
+        rng = random.Random(15)
+        for _ in range(10):
+            player_1, player_2 = ComputerPlayer("test_pl_1"), ComputerPlayer("test_pl_2")
+            game_state = GameBoard(5, 5, player_1, player_2)
+            game_state.active_player = player_1
+            while game_state.count_blanc() > 14:
+                game_state.make_move(rng.choice(game_state.get_player_moves()))
+            if game_state.terminal_test():
+                continue
+
+            full = game_state.active_player
+            full.alpha_beta_search(game_state)
+            solving = ComputerPlayer("test_pl_3", endgame_solver=EndgameSolver())
+            players = (solving, player_2) if full is player_1 else (player_1, solving)
+            solving_state = GameBoard.from_bytes(game_state.to_bytes(), *players)
+            solving.alpha_beta_search(solving_state)
+            self.assertEqual(solving.best_score, full.best_score)
+            self.assertLessEqual(solving.nodes_searched, full.nodes_searched)
+
+
+if __name__ == '__main__':
+    unittest.main()
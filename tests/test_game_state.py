@@ -48,48 +48,42 @@ class TestGameState(unittest.TestCase):
         """ Fill a small board with a few moves and check if the legal moves are correct"""
 
         self.game_state = GameBoard(3, 2, "test_pl_1", "test_pl_2")
-        self.game_state._active_player = self.game_state.player_1
-        self.game_state.position_player_1 = [1, 1]
+        self.game_state.active_player = self.game_state.player_1
+        position_player_1 = [1, 1]
         occupied_positions = [[0, 0], [0, 1], [1, 0], [1, 1], [1, 2]]
         for position in occupied_positions:
-            y = position[0]
-            x = position[1]
-            self.game_state._board[y][x] = True
+            self.game_state.block_cell(position)
 
-        self.assertEqual(self.game_state.get_legal_moves(self.game_state.position_player_1), [[0, 2]])
+        self.assertEqual(self.game_state.get_legal_moves(position_player_1), [[0, 2]])
 
     def test_legal_moves_medium_board(self):
         """ Fill a medium board with a few moves and check if the legal moves are correct"""
 
         self.game_state = GameBoard(5, 5, "test_pl_1", "test_pl_2")
-        self.game_state._active_player = self.game_state.player_1
-        self.game_state.position_player_1 = [3, 1]
+        self.game_state.active_player = self.game_state.player_1
+        position_player_1 = [3, 1]
         occupied_positions = [[1, 1], [1, 2], [1, 3], [2, 3], [3, 3], [3, 4]]
         for position in occupied_positions:
-            y = position[0]
-            x = position[1]
-            self.game_state._board[y][x] = True
+            self.game_state.block_cell(position)
 
         # Create a list of possible moves and sort it and run the test and sort the result
         possible_moves = sorted([[2, 0], [2, 1], [2, 2], [3, 0], [3, 2], [4, 0], [4, 1], [4, 2]])
-        self.assertEqual(sorted(self.game_state.get_legal_moves(self.game_state.position_player_1)), possible_moves)
+        self.assertEqual(sorted(self.game_state.get_legal_moves(position_player_1)), possible_moves)
 
     def test_legal_moves_large_board(self):
         """ Fill a large board with a few moves and check if the legal moves are correct"""
 
         self.game_state = GameBoard(8, 6, "test_pl_1", "test_pl_2")
-        self.game_state._active_player = self.game_state.player_1
-        self.game_state.position_player_1 = [3, 3]
+        self.game_state.active_player = self.game_state.player_1
+        position_player_1 = [3, 3]
         occupied_positions = [[3, 3], [4, 2], [4, 3], [5, 3], [5, 4], [4, 5], [4, 6], [3, 6], [2, 5]]
         for position in occupied_positions:
-            y = position[0]
-            x = position[1]
-            self.game_state._board[y][x] = True
+            self.game_state.block_cell(position)
 
         # Create a list of possible moves and sort it and run the test and sort the result
         possible_moves = sorted([[0, 0], [0, 3], [0, 6], [1, 1], [1, 3], [1, 5], [2, 2], [2, 3], [2, 4],
                                  [3, 0], [3, 1], [3, 2], [3, 4], [3, 5], [4, 4], [5, 5]])
-        self.assertEqual(sorted(self.game_state.get_legal_moves(self.game_state.position_player_1)), possible_moves)
+        self.assertEqual(sorted(self.game_state.get_legal_moves(position_player_1)), possible_moves)
 
     def test_computer_move(self):
         """ Test if the computer makes a move"""
@@ -103,9 +97,7 @@ class TestGameState(unittest.TestCase):
         self.game_state.positions[self.game_state.player_2] = [1, 1]
         occupied_positions = [[1, 0], [2, 1], [1, 1], [0, 1]]
         for position in occupied_positions:
-            y = position[0]
-            x = position[1]
-            self.game_state._board[y][x] = True
+            self.game_state.block_cell(position)
 
         move = computer_player1.minimax_decision(self.game_state)
         print(move)
@@ -123,9 +115,7 @@ class TestGameState(unittest.TestCase):
         self.game_state.positions[self.game_state.player_2] = [4, 1]
         occupied_positions = [[1, 0], [2, 1], [1, 1], [0, 1]]
         for position in occupied_positions:
-            y = position[0]
-            x = position[1]
-            self.game_state._board[y][x] = True
+            self.game_state.block_cell(position)
 
         move = computer_player1.minimax_decision(self.game_state, depth=2)
         print(move)
@@ -143,13 +133,13 @@ class TestGameState(unittest.TestCase):
         self.game_state.positions[self.game_state.player_2] = [4, 1]
         occupied_positions = [[1, 0], [2, 1], [1, 1], [0, 1]]
         for position in occupied_positions:
-            y = position[0]
-            x = position[1]
-            self.game_state._board[y][x] = True
+            self.game_state.block_cell(position)
 
         move = computer_player1.alpha_beta_search(self.game_state)
         print(move)
-        self.assertEqual(move, [3, 2])
+        # The three winning moves, which one is found first depends on the move ordering
+        self.assertIn(move, [[3, 2], [2, 2], [4, 3]])
+        self.assertEqual(computer_player1.best_score, float("inf"))
 
 
     def test_game_play(self):
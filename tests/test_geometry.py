@@ -0,0 +1,93 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+from backend.new_game import *
+from backend.geometry import BoardGeometry, MAX_BOARD_SIZE, board_size
+from backend.manager import GameManager
+
+
+class TestGeometry(unittest.TestCase):
+
+    def test_shared_per_size(self):
+        """ All boards of a size share one geometry, and its tables are the tables of the board"""
+        board = GameBoard(10, 10, "test_pl_1", "test_pl_2")
+        other = GameBoard(10, 10, "test_pl_1", "test_pl_2")
+        geometry = get_geometry(10, 10)
+        self.assertIs(board._geometry, geometry)
+        self.assertIs(other._geometry, geometry)
+        self.assertIs(board.clone()._geometry, geometry)
+        self.assertIs(board._rays, geometry.rays)
+        self.assertIs(board._shadows, geometry.shadows)
+        self.assertIs(zobrist_keys(10, 10), geometry.zobrist)
+        self.assertIsNot(get_geometry(10, 12), geometry)
+
+    def test_tables(self):
+        """ The tables agree with the coordinates of the cells"""
+        geometry = BoardGeometry(7, 4)
+        self.assertEqual(geometry.cells, 28)
+        self.assertEqual(geometry.coordinates[9], (1, 2))
+        for cell, (y, x) in enumerate(geometry.coordinates):
+            lines = {other for other, (other_y, other_x) in enumerate(geometry.coordinates)
+                     if other != cell and (y == other_y or x == other_x or abs(y - other_y) == abs(x - other_x))}
+            self.assertEqual({other for other in range(28) if geometry.line_masks[cell] >> other & 1}, lines)
+        # The center of a board with an even width lies between two columns
+        self.assertEqual(geometry.center_distances[1 * 7 + 3], 1)
+        self.assertEqual(len(geometry.symmetries), 4)
+        self.assertEqual(len(get_geometry(4, 4).symmetries), 8)
+
+    def test_zobrist_keys_are_stable(self):
+        """ The keys are drawn from the seed of the board size, the opening books depend on them"""
+        rng = random.Random(8 * 1000 + 6)
+        self.assertEqual(zobrist_keys(8, 6)[0][0], rng.getrandbits(64))
+
+    def test_board_size(self):
+        self.assertEqual(board_size("standard"), (8, 6))
+        self.assertEqual(board_size("xlarge"), (16, 16))
+        self.assertEqual(board_size("12x10"), (12, 10))
+        self.assertEqual(board_size((3, 1)), (3, 1))
+        self.assertRaises(ValueError, board_size, "enormous")
+        self.assertRaises(ValueError, board_size, "12x")
+        self.assertRaises(ValueError, board_size, (MAX_BOARD_SIZE + 1, 4))
+        self.assertRaises(ValueError, board_size, (0, 4))
+
+    def test_large_board(self):
+        """ Moves on a 16x16 board are generated from the shared tables and searched like on small boards"""
+        player = ComputerPlayer("HAL2000")
+        game_state = GameBoard(16, 16, player, HumanPlayer("Frank"))
+        game_state.active_player = player
+        game_state.make_move([0, 0])
+        game_state.make_move([15, 15])
+        # 15 cells on the row and the column, the diagonal ends before the opponent
+        self.assertEqual(len(game_state.get_player_moves()), 44)
+        self.assertIn([15, 0], game_state.get_player_moves())
+        move = player.get_actions(game_state, 2)
+        self.assertIn(move, game_state.get_player_moves())
+        game_state.make_move(move)
+        self.assertEqual(GameBoard.from_bytes(game_state.to_bytes(), player, HumanPlayer("Frank")).zobrist_hash(),
+                         game_state.zobrist_hash())
+
+    def test_create_game(self):
+        """ The GameManager creates the board of the given or the entered size"""
+        manager = GameManager()
+        manager.create_game("large")
+        self.assertEqual((manager.game._board_width, manager.game._board_height), (10, 10))
+        with mock.patch("builtins.input", side_effect=["enormous", "12x11"]), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            manager.create_game()
+        self.assertEqual((manager.game._board_width, manager.game._board_height), (12, 11))
+        self.assertIn("Invalid board", output.getvalue())
+
+    def test_human_decision_two_digit_rows(self):
+        """ Rows past 9 can be entered, input that isn't on the board is asked again"""
+        human_player = HumanPlayer("Frank")
+        game_state = GameBoard(12, 12, human_player, ComputerPlayer("HAL2000"))
+        game_state.active_player = human_player
+        with mock.patch("builtins.input", side_effect=["", "A", "A1x", "M1", "A13", "A0", "B11"]), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(human_player.human_decision(game_state), [10, 1])
+        self.assertEqual(output.getvalue().count("Invalid move"), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
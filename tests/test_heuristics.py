@@ -0,0 +1,68 @@
+import unittest
+from backend.new_game import *
+from backend.heuristics import *
+
+
+class TestHeuristics(unittest.TestCase):
+
+    def setUp(self):
+        """ A medium board where player 1 has 8 moves and player 2 has 1 move"""
+        self.player_1 = ComputerPlayer("HAL2000")
+        self.player_2 = HumanPlayer("Frank")
+        self.game_state = GameBoard(5, 5, self.player_1, self.player_2)
+        self.game_state.active_player = self.player_1
+        self.game_state.positions[self.player_1] = [3, 1]
+        self.game_state.positions[self.player_2] = [0, 4]
+        for position in [[1, 1], [1, 2], [1, 3], [2, 3], [3, 3], [3, 4], [3, 1], [0, 4], [0, 3], [2, 4]]:
+            self.game_state.block_cell(position)
+
+    def test_move_counting_heuristics(self):
+        """ The heuristics that count moves weigh the moves of both players"""
+        self.assertEqual(len(self.game_state.get_legal_moves([3, 1])), 8)
+        self.assertEqual(len(self.game_state.get_legal_moves([0, 4])), 1)
+
+        self.assertEqual(OwnMoves().score(self.game_state, self.player_1), 8)
+        self.assertEqual(OwnMoves().score(self.game_state, self.player_2), 1)
+        self.assertEqual(OwnMinusOpponentMoves().score(self.game_state, self.player_1), 7)
+        self.assertEqual(OwnMinusOpponentMoves().score(self.game_state, self.player_2), -7)
+        self.assertEqual(AggressiveMoves().score(self.game_state, self.player_1), 6)
+        self.assertEqual(DefensiveMoves().score(self.game_state, self.player_1), 15)
+        self.assertEqual(WeightedMoves(3, 0).score(self.game_state, self.player_2), 3)
+
+    def test_center_distance(self):
+        """ The player closer to the center scores higher"""
+        self.assertGreater(CenterDistance().score(self.game_state, self.player_1), 0)
+        self.assertLess(CenterDistance().score(self.game_state, self.player_2), 0)
+        self.assertEqual(center_distances(5, 5)[2 * 5 + 2], 0)
+        self.assertEqual(center_distances(8, 6)[0], center_distances(8, 6)[6 * 8 - 1])
+
+    def test_get_heuristic(self):
+        """ Heuristics can be created by name"""
+        for name in HEURISTICS:
+            self.assertEqual(str(get_heuristic(name)), name)
+        self.assertRaises(ValueError, get_heuristic, "unknown")
+
+    def test_search_with_every_heuristic(self):
+        """ The depth limited search plays a legal move with every heuristic"""
+        legal_moves = self.game_state.get_legal_moves([3, 1])
+        for name in HEURISTICS:
+            computer_player = ComputerPlayer("HAL2000", evaluation=get_heuristic(name))
+            self.game_state.player_1 = computer_player
+            self.game_state.positions = {computer_player: [3, 1], self.player_2: [0, 4]}
+            self.game_state.active_player = computer_player
+            self.assertIn(computer_player.alpha_beta_search(self.game_state, 3), legal_moves)
+
+    def test_computer_as_second_player(self):
+        """ The search maximizes the score of the computer player, also when it isn't player one"""
+        human_player = HumanPlayer("Frank")
+        computer_player = ComputerPlayer("HAL2000")
+        game_state = GameBoard(3, 2, human_player, computer_player)
+        game_state.active_player = computer_player
+        game_state.positions[human_player] = [0, 0]
+        game_state.positions[computer_player] = [1, 1]
+        for position in [[0, 0], [1, 1], [0, 2]]:
+            game_state.block_cell(position)
+
+        # Moving to [0, 1] isolates player one after its next move, every other move lets player one win
+        self.assertEqual(computer_player.alpha_beta_search(game_state), [0, 1])
+        self.assertEqual(computer_player.best_score, float("inf"))
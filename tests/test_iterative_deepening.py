@@ -0,0 +1,155 @@
+import contextlib
+import io
+import time
+import unittest
+from unittest import mock
+from backend.new_game import *
+from backend.manager import GameManager
+
+
+class TestIterativeDeepening(unittest.TestCase):
+
+    def create_game(self, computer_player, x_length=5, y_length=5):
+        human_player = HumanPlayer("Frank")
+        game_state = GameBoard(x_length, y_length, computer_player, human_player)
+        game_state.active_player = computer_player
+        game_state.positions[game_state.player_1] = [2, 3]
+        game_state.positions[game_state.player_2] = [4, 1]
+        for position in [[1, 0], [2, 1], [1, 1], [0, 1], [2, 3], [4, 1]]:
+            game_state.block_cell(position)
+        return game_state
+
+    def test_alpha_beta_value_matches_minimax(self):
+        """ The depth limited alpha-beta search finds the minimax value of the position at every depth"""
+        for depth in range(1, 5):
+            computer_player = ComputerPlayer("HAL2000")
+            game_state = self.create_game(computer_player)
+            computer_player.alpha_beta_search(game_state, depth)
+
+            # The minimax search gets an empty table, so it can't reuse the values of the alpha-beta search
+            computer_player.transposition_table.clear()
+            minimax_value = max(computer_player.min_value(game_state.clone().make_move(move), depth - 1)
+                                for move in game_state.get_legal_moves(game_state.positions[computer_player]))
+            self.assertEqual(computer_player.best_score, minimax_value)
+
+    def test_search_window_bounds(self):
+        """ With a window that doesn't hold the value, the search returns a bound on the right side of the window"""
+        computer_player = ComputerPlayer("HAL2000")
+        game_state = self.create_game(computer_player, 8, 6)
+        computer_player.alpha_beta_search(game_state, 4)
+        value = computer_player.best_score
+
+        for alpha, beta in [(value - 0.5, value + 0.5), (value + 1, value + 2), (value - 2, value - 1)]:
+            computer_player = ComputerPlayer("HAL2000")
+            game_state = self.create_game(computer_player, 8, 6)
+            computer_player.alpha_beta_search(game_state, 4, alpha, beta)
+            if value <= alpha:
+                self.assertLessEqual(computer_player.best_score, alpha)
+            elif value >= beta:
+                self.assertGreaterEqual(computer_player.best_score, beta)
+            else:
+                self.assertEqual(computer_player.best_score, value)
+        self.assertEqual(game_state.undo_count(), 0)
+
+    def test_aspiration_windows(self):
+        """ Narrow aspiration windows are searched again until they hold the value, the result doesn't change"""
+        results = []
+        for window in [None, 3, 0.001]:
+            computer_player = ComputerPlayer("HAL2000")
+            computer_player.aspiration_window = window
+            game_state = self.create_game(computer_player, 8, 6)
+            move = computer_player.get_actions(game_state, 5)
+            results.append((computer_player.best_score, computer_player.depth_reached))
+            self.assertIn(move, game_state.get_player_moves())
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+        # A window this narrow misses the value of most depths
+        self.assertGreater(computer_player.researches, 0)
+
+    def test_timeout_in_a_research_keeps_the_score(self):
+        """ A timeout while a window is searched again reports the score of the last finished depth"""
+        computer_player = ComputerPlayer("HAL2000")
+        game_state = self.create_game(computer_player, 8, 6)
+        search = computer_player.alpha_beta_search
+
+        def failing_search(state, depth, alpha=float("-inf"), beta=float("inf")):
+            if depth < 3:
+                return search(state, depth, alpha, beta)
+            # The window of depth 3 fails high, the research times out
+            computer_player.best_score = beta
+            raise SearchTimeout()
+
+        with mock.patch.object(computer_player, "alpha_beta_search", side_effect=failing_search):
+            move = computer_player.get_actions(game_state, time_limit_ms=1000)
+        self.assertEqual(computer_player.depth_reached, 2)
+        self.assertIn(move, game_state.get_player_moves())
+
+        sequential_player = ComputerPlayer("HAL2000")
+        sequential_player.alpha_beta_search(self.create_game(sequential_player, 8, 6), 2)
+        self.assertEqual(computer_player.best_score, sequential_player.best_score)
+
+    def test_depth_limited_search(self):
+        """ With a depth limit only, every depth up to the limit is searched"""
+        computer_player = ComputerPlayer("HAL2000")
+        game_state = self.create_game(computer_player)
+        move = computer_player.get_actions(game_state, 3)
+
+        self.assertIn(move, game_state.get_legal_moves(game_state.positions[computer_player]))
+        self.assertEqual(computer_player.depth_reached, 3)
+        self.assertGreater(computer_player.nodes_searched, 0)
+        self.assertEqual(computer_player.principal_variation[0], move)
+        self.assertLessEqual(len(computer_player.principal_variation), 3)
+
+    def test_time_limit(self):
+        """ On the standard board the search stops at the deadline with the move of the last completed depth"""
+        computer_player = ComputerPlayer("HAL2000")
+        game_state = self.create_game(computer_player, 8, 6)
+        board_before = (game_state._board, dict(game_state.positions), game_state.active_player)
+
+        start = time.perf_counter()
+        move = computer_player.get_actions(game_state, time_limit_ms=100)
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 1)
+        self.assertIn(move, game_state.get_legal_moves(game_state.positions[computer_player]))
+        self.assertGreaterEqual(computer_player.depth_reached, 1)
+        self.assertEqual((game_state._board, dict(game_state.positions), game_state.active_player), board_before)
+
+    def test_game_manager_move_within_time_limit(self):
+        """ The computer player of the console game moves within the time budget of the GameManager"""
+        manager = GameManager(time_limit_ms=200)
+        manager.create_game("standard")
+        computer_player = manager.game.player_2
+        manager.game.active_player = computer_player
+
+        start = time.perf_counter()
+        # The game stops when the human player is asked for the next move
+        with mock.patch.object(HumanPlayer, "human_decision", side_effect=KeyboardInterrupt), \
+                contextlib.redirect_stdout(io.StringIO()), self.assertRaises(KeyboardInterrupt):
+            manager.play_game()
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 2)
+        self.assertIsNotNone(manager.game.positions[computer_player])
+        self.assertIs(manager.game.active_player, manager.game.player_1)
+        self.assertGreaterEqual(computer_player.depth_reached, 1)
+
+    def test_search_stops_when_the_game_is_decided(self):
+        """ A position with a forced result isn't searched deeper than needed"""
+        computer_player = ComputerPlayer("HAL2000")
+        human_player = HumanPlayer("Frank")
+        game_state = GameBoard(3, 2, computer_player, human_player)
+        game_state.active_player = computer_player
+        game_state.positions[computer_player] = [0, 0]
+        game_state.positions[human_player] = [1, 2]
+        for position in [[0, 0], [1, 2], [1, 1]]:
+            game_state.block_cell(position)
+
+        move = computer_player.get_actions(game_state, time_limit_ms=1000)
+        self.assertIn(move, [[0, 1], [0, 2], [1, 0]])
+        self.assertLessEqual(computer_player.depth_reached, 3)
+
+    def test_search_limits_required(self):
+        """ Without a depth or a time limit the search could run forever"""
+        computer_player = ComputerPlayer("HAL2000")
+        self.assertRaises(ValueError, computer_player.get_actions, self.create_game(computer_player))
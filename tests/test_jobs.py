@@ -0,0 +1,160 @@
+import statistics
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from backend.jobs import JobManager, QueueFull, DONE, CANCELLED
+from backend.sessions import SessionStore, TurnError
+
+try:
+    from app import create_app
+except ImportError:
+    create_app = None
+
+
+class TestJobManager(unittest.TestCase):
+
+    def setUp(self):
+        self.store = SessionStore(opening_books=False)
+        self.jobs = JobManager(self.store, workers=1, max_queue=3)
+
+    def tearDown(self):
+        self.jobs.close()
+
+    def test_job_makes_the_computer_move(self):
+        """ The move of a finished job is made on the board of the game"""
+        session = self.store.create("medium", human_first=False)
+        job = self.jobs.submit(session, depth=3)
+        self.assertRaises(TurnError, self.jobs.submit, session)
+        self.assertIs(self.jobs.wait(job.job_id, 10), job)
+
+        self.assertEqual(job.status, DONE)
+        self.assertEqual(job.depth_reached, 3)
+        self.assertEqual(session.to_dict()["positions"]["computer"], job.move)
+        self.assertEqual(job.to_dict()["game"]["active"], "human")
+        self.assertIsNone(session.pending_job)
+        self.assertEqual(self.jobs.pending(), 0)
+        self.assertRaises(TurnError, self.jobs.submit, session)
+
+    def test_cancel(self):
+        """ Cancelled jobs stop before their time budget is used and don't make their move"""
+        sessions = [self.store.create("standard", human_first=False) for _ in range(2)]
+        jobs = [self.jobs.submit(session, time_limit_ms=5000) for session in sessions]
+        time.sleep(0.2)
+        start = time.perf_counter()
+        for job in jobs:
+            self.jobs.cancel(job.job_id)
+        for job in jobs:
+            self.jobs.wait(job.job_id, 10)
+        self.assertLess(time.perf_counter() - start, 3)
+
+        for job, session in zip(jobs, sessions):
+            self.assertEqual(job.status, CANCELLED)
+            self.assertIsNone(job.move)
+            self.assertEqual(session.to_dict()["blocked"], [])
+        # The game can search its move again
+        self.assertEqual(self.jobs.wait(self.jobs.submit(sessions[0], depth=1).job_id, 10).status, DONE)
+
+    def test_queue_limit(self):
+        """ No more than max_queue jobs are queued or running"""
+        sessions = [self.store.create("standard", human_first=False) for _ in range(4)]
+        jobs = [self.jobs.submit(session, time_limit_ms=5000) for session in sessions[:3]]
+        self.assertRaises(QueueFull, self.jobs.submit, sessions[3])
+        for job in jobs:
+            self.jobs.cancel(job.job_id)
+            self.jobs.wait(job.job_id, 10)
+        self.assertEqual(self.jobs.pending(), 0)
+        self.assertEqual(self.jobs.wait(self.jobs.submit(sessions[3], depth=1).job_id, 10).status, DONE)
+
+
+class DoneExecutor:
+    """ An executor whose futures are done when they are returned, with the first move and the first reply """
+
+    def __init__(self, session):
+        self.session = session
+        self.submitted = 0
+
+    def submit(self, function, cancel_slot, board_bytes, player_slot, *args):
+        self.submitted += 1
+        board = self.session.board.clone()
+        move = board.get_player_moves()[0]
+        board.make_move(move)
+        future = Future()
+        future.set_result((move, 1, 1, False, [move, board.get_player_moves()[0]]))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class TestDoneFutures(unittest.TestCase):
+
+    def test_submit_with_a_done_future(self):
+        """ A future that is done before its callback is added finishes the job without a deadlock"""
+        store = SessionStore(opening_books=False)
+        jobs = JobManager(store, workers=1, max_queue=3, ponder=True)
+        session = store.create("small", human_first=False)
+        executor = DoneExecutor(session)
+        jobs._executor = executor
+        jobs._cancel_flags = [0] * 3
+        jobs._deadlines = [0.0] * 3
+        result = []
+        thread = threading.Thread(target=lambda: result.append(jobs.submit(session)), daemon=True)
+        thread.start()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+        job = result[0]
+        self.assertEqual(job.status, DONE)
+        self.assertTrue(job.done_event.is_set())
+        self.assertEqual(session.to_dict()["positions"]["computer"], job.move)
+        # The ponder job of the reply was submitted and finished in the same thread
+        self.assertEqual(executor.submitted, 2)
+        self.assertIsNotNone(jobs._ponder_jobs[session.game_id].finished)
+        jobs.close()
+
+
+@unittest.skipUnless(create_app, "Flask is not installed")
+class TestRequestLatency(unittest.TestCase):
+
+    def test_latency_stays_flat_during_searches(self):
+        """ Requests are answered as fast while the workers search as when they are idle"""
+        store = SessionStore(opening_books=False)
+        with JobManager(store, workers=2, max_queue=16, max_time_limit_ms=5000) as jobs:
+            client = create_app(store, jobs).test_client()
+            game_id = client.post("/games", json={"board": "medium"}).get_json()["game_id"]
+            # The workers are started before the idle measurement
+            computer_game = client.post("/games", json={"board": "small", "first": "computer"}).get_json()
+            jobs.wait(client.post(f"/games/{computer_game['game_id']}/ai-move").get_json()["job_id"], 10)
+
+            def latencies(count):
+                result = []
+                for _ in range(count):
+                    start = time.perf_counter()
+                    self.assertEqual(client.get(f"/games/{game_id}").status_code, 200)
+                    result.append(time.perf_counter() - start)
+                return result
+
+            idle = latencies(200)
+
+            # Eight long searches, every submit returns at once
+            submit_latencies = []
+            job_ids = []
+            for _ in range(8):
+                searching_game = client.post("/games", json={"board": "standard", "first": "computer"}).get_json()
+                start = time.perf_counter()
+                response = client.post(f"/games/{searching_game['game_id']}/ai-move", json={"time_limit_ms": 2000})
+                submit_latencies.append(time.perf_counter() - start)
+                self.assertEqual(response.status_code, 202)
+                job_ids.append(response.get_json()["job_id"])
+
+            # The workers are busy with the searches now
+            time.sleep(0.3)
+            busy = latencies(200)
+            self.assertGreater(jobs.pending(), 0)
+            for job_id in job_ids:
+                jobs.cancel(job_id)
+
+        # A search takes two seconds, a request only a few milliseconds
+        self.assertLess(max(submit_latencies), 0.2)
+        self.assertLess(statistics.median(busy), statistics.median(idle) + 0.02)
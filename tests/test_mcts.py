@@ -0,0 +1,110 @@
+import contextlib
+import io
+import random
+import unittest
+from backend.new_game import *
+from backend.manager import GameManager
+from backend.mcts import MCTSPlayer, Node, rollout, random_cell, search_tree
+
+
+class TestMCTS(unittest.TestCase):
+
+    def create_game(self, player, x_length=5, y_length=5):
+        human_player = HumanPlayer("Frank")
+        game_state = GameBoard(x_length, y_length, player, human_player)
+        game_state.active_player = player
+        return game_state
+
+    def test_random_cell(self):
+        """ Only set bits are drawn, and every set bit is drawn"""
+        rng = random.Random(19)
+        cells = {random_cell(0b101001000, rng) for _ in range(200)}
+        self.assertEqual(cells, {3, 6, 8})
+
+    def test_rollout(self):
+        """ A rollout plays to the end without changing the board, the player that can't move loses"""
+        rng = random.Random(19)
+        game_state = self.create_game(HumanPlayer("HAL2000"))
+        game_state.make_move([0, 0])
+        game_state.make_move([4, 4])
+        before = game_state.to_bytes()
+        for policy in ("random", "mobility"):
+            self.assertIn(rollout(game_state, rng, policy), (0, 1))
+        self.assertEqual(game_state.to_bytes(), before)
+
+        # The only move of the first player leaves the second player without moves
+        game_state = GameBoard(3, 1, "test_pl_1", "test_pl_2")
+        game_state.active_player = "test_pl_1"
+        game_state.make_move([0, 0])
+        game_state.make_move([0, 2])
+        self.assertEqual(rollout(game_state, rng), 0)
+
+    def test_search_tree(self):
+        """ Every iteration is one visit of the root and the board is left as it was"""
+        game_state = self.create_game(HumanPlayer("HAL2000"))
+        game_state.make_move([2, 2])
+        root = Node(None, game_state._active ^ 1, None, game_state.get_player_moves())
+        self.assertEqual(search_tree(root, game_state, 500, None, 1.4, "random", random.Random(19)), 500)
+        self.assertEqual(root.visits, 500)
+        self.assertEqual(sum(child.visits for child in root.children), 500)
+        self.assertEqual(root.size(), 501)
+        self.assertEqual(game_state.undo_count(), 0)
+
+    def test_finds_the_winning_move(self):
+        """ Of the five moves of the player only [2, 1] wins with best play, the search finds it"""
+        player = MCTSPlayer("HAL2000", iterations=2000, time_limit_ms=None, seed=19)
+        game_state = GameBoard.from_bytes(bytes.fromhex("0404010d00040030b0"), HumanPlayer("Frank"), player)
+        self.assertEqual(len(game_state.get_player_moves()), 5)
+        self.assertEqual(player.get_actions(game_state), [2, 1])
+        self.assertEqual(player.playouts, 2000)
+        self.assertEqual(player.principal_variation[0], [2, 1])
+        self.assertGreater(player.best_score, 0.5)
+
+    def test_tree_reuse(self):
+        """ The next search starts from the subtree of the position after the own move and the reply"""
+        player = MCTSPlayer("HAL2000", iterations=3000, time_limit_ms=None, seed=19)
+        game_state = self.create_game(player)
+        game_state.make_move(player.get_actions(game_state))
+        reply = game_state.get_player_moves()[0]
+        game_state.make_move(reply)
+        expected = player.find_subtree(game_state)
+        self.assertIsNotNone(expected)
+        visits = expected.visits
+        player.get_actions(game_state)
+        self.assertEqual(player.reused_visits, visits)
+        self.assertEqual(player._root, expected)
+
+        # Without reuse, and for an unknown position, the search starts from scratch
+        self.assertIsNone(player.find_subtree(self.create_game(player, 8, 6)))
+        player = MCTSPlayer("HAL2000", iterations=100, time_limit_ms=None, reuse_tree=False)
+        player.get_actions(game_state)
+        player.get_actions(game_state)
+        self.assertEqual(player.reused_visits, 0)
+
+    def test_parallel(self):
+        """ The root moves of the worker trees are added up"""
+        with MCTSPlayer("HAL2000", iterations=200, time_limit_ms=None, workers=2, seed=19) as player:
+            game_state = self.create_game(player)
+            move = player.get_actions(game_state)
+            self.assertIn(move, game_state.get_player_moves())
+            self.assertEqual(player.playouts, 400)
+
+    def test_game_manager(self):
+        """ The GameManager plays with any computer player that has choose_move"""
+        player = MCTSPlayer("HAL2000", iterations=50, time_limit_ms=None)
+        manager = GameManager(player)
+        manager.game = GameBoard(3, 3, player, MCTSPlayer("HAL9000", iterations=50, time_limit_ms=None))
+        manager.game.active_player = player
+        manager.game.player_1.player_type = manager.game.player_2.player_type = "Computer"
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.play_game()
+        self.assertTrue(manager.game.terminal_test())
+
+    def test_invalid_limits(self):
+        self.assertRaises(ValueError, MCTSPlayer, "HAL2000", iterations=None, time_limit_ms=None)
+        self.assertRaises(ValueError, MCTSPlayer, "HAL2000", policy="greedy")
+        self.assertRaises(ValueError, MCTSPlayer, "HAL2000", workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
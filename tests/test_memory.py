@@ -0,0 +1,74 @@
+import tracemalloc
+import unittest
+from backend.new_game import *
+
+
+class TestBoardMemory(unittest.TestCase):
+
+    def create_game(self):
+        computer_player = ComputerPlayer("HAL2000")
+        game_state = GameBoard(8, 6, computer_player, HumanPlayer("Frank"))
+        game_state.active_player = computer_player
+        for move in [[2, 3], [4, 1], [1, 3], [4, 4]]:
+            game_state.make_move(move)
+        return computer_player, game_state
+
+    def test_board_has_no_dict(self):
+        """ The board keeps its attributes in __slots__ and its positions as cell indices"""
+        _, game_state = self.create_game()
+        self.assertFalse(hasattr(game_state, "__dict__"))
+        self.assertRaises(AttributeError, setattr, game_state, "position_player_1", [0, 0])
+        self.assertEqual(game_state._cells, [1 * 8 + 3, 4 * 8 + 4])
+        self.assertEqual(game_state.positions, {game_state.player_1: [1, 3], game_state.player_2: [4, 4]})
+
+    def test_bytes_per_board(self):
+        """ A clone of a standard board takes less than 320 bytes"""
+        _, game_state = self.create_game()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        boards = [game_state.clone() for _ in range(1000)]
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        self.assertEqual(len(boards), 1000)
+        self.assertLess(used / 1000, 320)
+
+    def test_search_memory_per_million_nodes(self):
+        """ Apart from the transposition table a search walks the tree on one board and needs no memory per node"""
+        computer_player, game_state = self.create_game()
+        computer_player.transposition_table = TranspositionTable(size=1)
+        tracemalloc.start()
+        computer_player.get_actions(game_state, 6)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        # Tens of thousands of nodes, but less than 64 KB at the peak: under 3 MB per million nodes
+        self.assertGreater(computer_player.nodes_searched, 20000)
+        self.assertLess(peak, 64 * 1024)
+        self.assertLess(peak / computer_player.nodes_searched * 1_000_000, 3_000_000)
+
+
+class TestPositionView(unittest.TestCase):
+
+    def test_positions_mapping(self):
+        """ positions behaves like the dictionary of positions it replaces"""
+        game_state = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+        game_state.active_player = "test_pl_1"
+        self.assertEqual(dict(game_state.positions), {"test_pl_1": None, "test_pl_2": None})
+
+        game_state.make_move([2, 2])
+        game_state.positions["test_pl_2"] = [0, 4]
+        self.assertEqual(game_state.positions["test_pl_1"], [2, 2])
+        self.assertEqual(game_state.positions.copy(), {"test_pl_1": [2, 2], "test_pl_2": [0, 4]})
+        self.assertEqual(list(game_state.positions), ["test_pl_1", "test_pl_2"])
+        self.assertRaises(KeyError, game_state.positions.__getitem__, "test_pl_3")
+        self.assertRaises(ValueError, game_state.positions.__setitem__, "test_pl_3", [0, 0])
+
+    def test_active_player(self):
+        """ The active player is stored as a slot but set and read as a player"""
+        game_state = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+        game_state.active_player = "test_pl_2"
+        self.assertEqual(game_state._active, 1)
+        game_state.change_initiative()
+        self.assertEqual(game_state.active_player, "test_pl_1")
+        self.assertRaises(ValueError, setattr, game_state, "active_player", "test_pl_3")
@@ -0,0 +1,81 @@
+import random
+import unittest
+from backend.new_game import *
+
+
+class TestMoveCache(unittest.TestCase):
+
+    def assertCacheMatches(self, game_state):
+        """ The cached moves of both players are the moves computed from scratch"""
+        for slot, player in enumerate((game_state.player_1, game_state.player_2)):
+            cell = game_state._cells[slot]
+            expected = game_state.cell_moves_mask(cell)
+            self.assertIn(game_state._moves[slot], (-1, expected))
+            self.assertEqual(game_state.slot_moves_mask(slot), expected)
+            self.assertEqual(game_state.mobility(player), expected.bit_count())
+            self.assertEqual(game_state.get_player_moves(player), game_state.cell_legal_moves(cell))
+        self.assertEqual(game_state.terminal_test(), game_state.cell_moves_mask(game_state.get_cell()) == 0)
+
+    def test_shadow_table(self):
+        """ Blocking a cell on a line takes the cell and the cells behind it away, cells off the line take nothing"""
+        shadows = shadow_table(8, 6)
+        # From [0, 0] the cell [0, 2] shadows [0, 3] to [0, 7]
+        self.assertEqual(shadows[0][2], sum(1 << x for x in range(2, 8)))
+        # [1, 2] isn't on a line with [0, 0]
+        self.assertEqual(shadows[0][1 * 8 + 2], 0)
+        # From [5, 7] the cell [3, 5] shadows the diagonal up to [0, 2]
+        self.assertEqual(shadows[5 * 8 + 7][3 * 8 + 5], (1 << 3 * 8 + 5) | (1 << 2 * 8 + 4) | (1 << 1 * 8 + 3) | (1 << 2))
+
+    def test_random_games(self):
+        """ Property: after any sequence of moves, undos, blocked cells and placements the cache is exact"""
+        rng = random.Random(18)
+        for _ in range(200):
+            x_length, y_length = rng.choice([(3, 2), (5, 5), (8, 6), (7, 4), (16, 16)])
+            game_state = GameBoard(x_length, y_length, "test_pl_1", "test_pl_2")
+            self.assertCacheMatches(game_state)
+            for _ in range(rng.randint(1, 60)):
+                action = rng.random()
+                moves = game_state.get_player_moves()
+                # As in the search, the moves of apply_move are taken back before the board is changed otherwise
+                if game_state.undo_count():
+                    if action < 0.5 and moves:
+                        game_state.apply_move(rng.choice(moves))
+                    else:
+                        game_state.undo_move()
+                elif action < 0.4 and moves:
+                    game_state.make_move(rng.choice(moves))
+                elif action < 0.6 and moves:
+                    game_state.apply_move(rng.choice(moves))
+                elif action < 0.75:
+                    # Any cell, most of them aren't legal and leave the board as it is
+                    game_state.make_move([rng.randrange(y_length), rng.randrange(x_length)])
+                elif action < 0.85:
+                    game_state.block_cell([rng.randrange(y_length), rng.randrange(x_length)])
+                elif action < 0.95:
+                    player = rng.choice(["test_pl_1", "test_pl_2"])
+                    game_state.positions[player] = [rng.randrange(y_length), rng.randrange(x_length)]
+                else:
+                    game_state = rng.choice([game_state.clone(),
+                                             GameBoard.from_bytes(game_state.to_bytes(), "test_pl_1", "test_pl_2")])
+                self.assertCacheMatches(game_state)
+
+    def test_undo_restores_cache(self):
+        """ Taking back moves restores the cache of the position"""
+        rng = random.Random(18)
+        game_state = GameBoard(8, 6, "test_pl_1", "test_pl_2")
+        for _ in range(6):
+            game_state.make_move(rng.choice(game_state.get_player_moves()))
+        game_state.mobility("test_pl_1")
+        game_state.mobility("test_pl_2")
+        cached = game_state._moves
+        for _ in range(5):
+            game_state.apply_move(rng.choice(game_state.get_player_moves()))
+            self.assertCacheMatches(game_state)
+        for _ in range(5):
+            game_state.undo_move()
+        self.assertEqual(game_state._moves, cached)
+        self.assertCacheMatches(game_state)
+
+
+if __name__ == '__main__':
+    unittest.main()
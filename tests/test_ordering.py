@@ -0,0 +1,94 @@
+import unittest
+from backend.new_game import *
+from backend.ordering import (MoveOrdering, MobilityOrdering, KillerHistoryOrdering, ORDERINGS, get_ordering,
+                              line_masks)
+
+
+class TestMoveOrdering(unittest.TestCase):
+
+    def create_game(self, computer_player):
+        human_player = HumanPlayer("Frank")
+        game_state = GameBoard(8, 6, human_player, computer_player)
+        game_state.active_player = computer_player
+        game_state.positions[human_player] = [4, 5]
+        game_state.positions[computer_player] = [2, 3]
+        for position in [[1, 1], [2, 5], [3, 3], [4, 2], [0, 6], [5, 7], [2, 3], [4, 5]]:
+            game_state.block_cell(position)
+        return game_state
+
+    def test_line_masks(self):
+        """ The lines of a corner are its row, its column and its diagonal"""
+        lines = line_masks(3, 3)
+        expected = sum(1 << cell for cell in [1, 2, 3, 6, 4, 8])
+        self.assertEqual(lines[0], expected)
+        # From the center every other cell is on a line
+        self.assertEqual(lines[4], 0b111101111)
+
+    def test_orderings_keep_the_moves(self):
+        """ Every ordering returns the same moves, with the move of the transposition table first"""
+        game_state = self.create_game(HumanPlayer("HAL2000"))
+        moves = game_state.get_player_moves()
+        for name in ORDERINGS:
+            ordering = get_ordering(name)
+            ordering.new_search(game_state)
+            ordered = ordering.order(game_state, moves, moves[-1])
+            self.assertEqual(ordered[0], moves[-1])
+            self.assertEqual(sorted(ordered), sorted(moves))
+        self.assertEqual(MoveOrdering().order(game_state, moves, None), moves)
+
+    def test_mobility_ordering(self):
+        """ The moves to the cells with the most open cells on their lines come first"""
+        game_state = self.create_game(HumanPlayer("HAL2000"))
+        lines = line_masks(8, 6)
+        open_cells = game_state._full_mask & ~game_state._board
+        room = [(lines[y * 8 + x] & open_cells).bit_count()
+                for y, x in MobilityOrdering().order(game_state, game_state.get_player_moves(), None)]
+        self.assertEqual(room, sorted(room, reverse=True))
+
+    def test_killers_and_history(self):
+        """ Moves that cut off the search come first, killers before history, and the history fades"""
+        game_state = self.create_game(HumanPlayer("HAL2000"))
+        moves = game_state.get_player_moves()
+        ordering = KillerHistoryOrdering(killers=2)
+        ordering.new_search(game_state)
+        ordering.cutoff(game_state, moves[-1], 3)
+        self.assertEqual(ordering.order(game_state, moves, None)[0], moves[-1])
+
+        # The killers are kept per ply, and only the last two
+        for move in moves[:3]:
+            ordering.cutoff(game_state, move, 1)
+        self.assertCountEqual(ordering.order(game_state, moves, None)[:2], [moves[2], moves[1]])
+        # At another ply only the history counts: 9 for the move at depth 3 against 1 for the others
+        game_state.apply_move(moves[0])
+        game_state.apply_move(game_state.get_player_moves()[0])
+        cell = moves[-1][0] * 8 + moves[-1][1]
+        self.assertEqual(ordering._history[game_state._active][cell], 9)
+        game_state.undo_move()
+        game_state.undo_move()
+
+        # A new search of the same position halves the history and keeps the killers, another position clears them
+        ordering.new_search(game_state)
+        self.assertEqual(ordering._history[game_state._active][cell], 4)
+        self.assertCountEqual(ordering.order(game_state, moves, None)[:2], [moves[2], moves[1]])
+        game_state.apply_move(moves[0])
+        ordering.new_search(game_state)
+        self.assertEqual(ordering._killers, {})
+
+    def test_same_value_fewer_nodes(self):
+        """ The orderings don't change the value of the search, the killers and history cut off most"""
+        results = {}
+        for name in ORDERINGS:
+            computer_player = ComputerPlayer("HAL2000", move_ordering=get_ordering(name))
+            game_state = self.create_game(computer_player)
+            computer_player.get_actions(game_state, 6)
+            results[name] = (computer_player.best_score, computer_player.nodes_searched)
+            self.assertEqual(game_state.undo_count(), 0)
+        self.assertEqual(len({score for score, _ in results.values()}), 1)
+        self.assertLess(results["killer_history"][1], results["transposition_table"][1])
+
+    def test_invalid_ordering(self):
+        self.assertRaises(ValueError, get_ordering, "random")
+
+
+if __name__ == '__main__':
+    unittest.main()
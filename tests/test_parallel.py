@@ -0,0 +1,130 @@
+import unittest
+from backend.new_game import *
+from backend.endgame import EndgameSolver
+from backend.ordering import MobilityOrdering
+from backend.parallel import ParallelComputerPlayer
+
+
+def worker_settings():
+    """ The endgame solver and the move ordering of the players of a worker process """
+    from backend import parallel
+    return [(type(player.endgame_solver), type(player.move_ordering)) for player in parallel._worker_players]
+
+
+def worker_generations():
+    """ The generations of the transposition tables of the players of a worker process """
+    from backend import parallel
+    return [player.transposition_table.generation for player in parallel._worker_players]
+
+
+class TestCompactBoard(unittest.TestCase):
+
+    def test_bytes_round_trip(self):
+        """ A position survives to_bytes and from_bytes, including its hash"""
+        board = GameBoard(8, 6, "test_pl_1", "test_pl_2")
+        board.active_player = board.player_1
+        for move in [[0, 0], [5, 7], [0, 5], [3, 7]]:
+            board.make_move(move)
+
+        data = board.to_bytes()
+        self.assertEqual(len(data), 7 + 6)
+        rebuilt_board = GameBoard.from_bytes(data, "test_pl_1", "test_pl_2")
+        self.assertEqual(rebuilt_board._board, board._board)
+        self.assertEqual(rebuilt_board.positions, board.positions)
+        self.assertEqual(rebuilt_board.active_player, board.active_player)
+        self.assertEqual(rebuilt_board.zobrist_hash(), board.zobrist_hash())
+
+    def test_unplaced_players(self):
+        """ Players that haven't moved yet are stored as well"""
+        board = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+        board.active_player = board.player_2
+        rebuilt_board = GameBoard.from_bytes(board.to_bytes(), "a", "b")
+        self.assertEqual(rebuilt_board.positions, {"a": None, "b": None})
+        self.assertEqual(rebuilt_board.active_player, "b")
+
+
+class TestParallelSearch(unittest.TestCase):
+
+    def create_game(self, computer_player):
+        human_player = HumanPlayer("Frank")
+        game_state = GameBoard(8, 6, human_player, computer_player)
+        game_state.active_player = computer_player
+        game_state.positions[human_player] = [4, 5]
+        game_state.positions[computer_player] = [2, 3]
+        for position in [[1, 1], [2, 5], [3, 3], [4, 2], [0, 6], [5, 7], [2, 3], [4, 5]]:
+            game_state.block_cell(position)
+        return game_state
+
+    def test_same_value_as_sequential_search(self):
+        """ The parallel search finds the same value as the sequential search and leaves the board unchanged"""
+        sequential_player = ComputerPlayer("HAL2000")
+        sequential_player.alpha_beta_search(self.create_game(sequential_player), 4)
+
+        with ParallelComputerPlayer("HAL2000", workers=2) as parallel_player:
+            game_state = self.create_game(parallel_player)
+            before = game_state.to_bytes()
+            move = parallel_player.alpha_beta_search(game_state, 4)
+
+            self.assertEqual(parallel_player.best_score, sequential_player.best_score)
+            self.assertIn(move, game_state.get_legal_moves([2, 3]))
+            self.assertEqual(game_state.to_bytes(), before)
+
+            # Iterative deepening runs every iteration on the pool
+            self.assertIn(parallel_player.get_actions(game_state, 3), game_state.get_legal_moves([2, 3]))
+            self.assertEqual(parallel_player.depth_reached, 3)
+
+    def test_both_slots_on_one_pool(self):
+        """ A search in the other slot doesn't reuse the values the workers scored for the opponent"""
+        human_player = HumanPlayer("Frank")
+        with ParallelComputerPlayer("HAL2000", workers=1) as parallel_player:
+            game_state = GameBoard(5, 5, human_player, parallel_player)
+            game_state.active_player = human_player
+            game_state.make_move([2, 2])
+            game_state.make_move([0, 1])
+            game_state.make_move(parallel_player.alpha_beta_search(game_state, 5))
+
+            # The position after the move, searched by the player in the slot of its opponent
+            child = GameBoard.from_bytes(game_state.to_bytes(), parallel_player, human_player)
+            move = parallel_player.alpha_beta_search(child, 4)
+
+        sequential_player = ComputerPlayer("HAL2000")
+        sequential_move = sequential_player.alpha_beta_search(
+            GameBoard.from_bytes(game_state.to_bytes(), sequential_player, human_player), 4)
+        self.assertEqual((move, parallel_player.best_score), (sequential_move, sequential_player.best_score))
+
+    def test_settings_reach_the_workers(self):
+        """ The workers search with the endgame solver and the move ordering of the player"""
+        with ParallelComputerPlayer("HAL2000", workers=1, endgame_solver=EndgameSolver(),
+                                    move_ordering=MobilityOrdering()) as parallel_player:
+            settings = parallel_player._executor.submit(worker_settings).result()
+        self.assertEqual(settings, [(EndgameSolver, MobilityOrdering)] * 2)
+
+    def test_workers_start_new_searches(self):
+        """ The tables of the workers age once per root search, not once per move"""
+        with ParallelComputerPlayer("HAL2000", workers=1) as parallel_player:
+            game_state = self.create_game(parallel_player)
+            before = parallel_player._executor.submit(worker_generations).result()
+            parallel_player.alpha_beta_search(game_state, 3)
+            parallel_player.alpha_beta_search(game_state, 4)
+            after = parallel_player._executor.submit(worker_generations).result()
+        slot = 0 if game_state.player_1 is parallel_player else 1
+        self.assertEqual(after[slot] - before[slot], 2)
+        self.assertEqual(after[1 - slot], before[1 - slot])
+
+    def test_window(self):
+        """ A search with a window finds the exact score inside the window and a bound outside of it"""
+        sequential_player = ComputerPlayer("HAL2000")
+        sequential_player.alpha_beta_search(self.create_game(sequential_player), 4)
+        score = sequential_player.best_score
+
+        with ParallelComputerPlayer("HAL2000", workers=2) as parallel_player:
+            game_state = self.create_game(parallel_player)
+            parallel_player.alpha_beta_search(game_state, 4, score - 2, score + 2)
+            self.assertEqual(parallel_player.best_score, score)
+            parallel_player.transposition_table.clear()
+            parallel_player.alpha_beta_search(game_state, 4, score - 4, score - 1)
+            self.assertGreaterEqual(parallel_player.best_score, score - 1)
+
+    def test_invalid_workers(self):
+        """ A parallel search needs at least one worker"""
+        self.assertRaises(ValueError, ParallelComputerPlayer, "HAL2000", 0)
@@ -0,0 +1,156 @@
+import contextlib
+import io
+import time
+import unittest
+from backend.new_game import *
+from backend.jobs import JobManager, DONE, CANCELLED
+from backend.manager import GameManager
+from backend.mcts import MCTSPlayer
+from backend.pondering import Ponderer, PonderStats
+from backend.sessions import SessionStore
+
+
+class TestPondering(unittest.TestCase):
+
+    def create_game(self, player, x_length=8, y_length=6):
+        human_player = HumanPlayer("Frank")
+        game_state = GameBoard(x_length, y_length, player, human_player)
+        game_state.active_player = player
+        return game_state
+
+    def play_first_move(self, mode="predicted"):
+        player = ComputerPlayer("HAL2000", transposition_table=TranspositionTable())
+        game_state = self.create_game(player)
+        game_state.make_move([2, 3])
+        game_state.make_move([3, 4])
+        ponderer = Ponderer(player, mode)
+        game_state.make_move(ponderer.get_actions(game_state, time_limit_ms=100))
+        self.assertGreater(len(player.principal_variation), 1)
+        ponderer.start(game_state)
+        return player, game_state, ponderer
+
+    def test_stats(self):
+        stats = PonderStats()
+        stats.record(True, 0.5)
+        stats.record(False, 2.0)
+        self.assertEqual(stats.to_dict(), {"ponders": 2, "hits": 1, "hit_rate": 0.5, "seconds_saved": 0.5,
+                                           "seconds_saved_per_move": 0.25})
+        self.assertEqual(PonderStats().to_dict()["hit_rate"], 0.0)
+
+    def test_ponder_hit(self):
+        """ After the predicted reply the pondering search goes on with the time budget of the move"""
+        player, game_state, ponderer = self.play_first_move()
+        time.sleep(0.3)
+        game_state.make_move(player.principal_variation[1])
+        start = time.perf_counter()
+        move = ponderer.get_actions(game_state, time_limit_ms=100)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertIn(move, game_state.get_player_moves())
+        self.assertEqual(player.principal_variation[0], move)
+        self.assertEqual(ponderer.stats.hits, 1)
+        self.assertGreaterEqual(ponderer.stats.seconds_saved, 0.3)
+        self.assertIsNone(ponderer._thread)
+
+    def test_ponder_miss(self):
+        """ Another reply stops pondering, leaves the board as it was and the player searches the move itself"""
+        player, game_state, ponderer = self.play_first_move()
+        searcher = ponderer._searcher
+        time.sleep(0.1)
+        reply = next(move for move in game_state.get_player_moves() if move != player.principal_variation[1])
+        game_state.make_move(reply)
+        before = game_state.to_bytes()
+        move = ponderer.get_actions(game_state, time_limit_ms=100)
+        self.assertIn(move, game_state.get_player_moves())
+        self.assertEqual(game_state.to_bytes(), before)
+        self.assertTrue(searcher.stop_event.is_set())
+        self.assertIsNone(ponderer._thread)
+        self.assertEqual(ponderer.stats.to_dict()["hits"], 0)
+        self.assertEqual(ponderer.stats.ponders, 1)
+
+    def test_ponder_all(self):
+        """ In the mode all every reply is searched"""
+        player, game_state, ponderer = self.play_first_move("all")
+        time.sleep(0.3)
+        game_state.make_move(game_state.get_player_moves()[-1])
+        move = ponderer.get_actions(game_state, time_limit_ms=100)
+        self.assertIn(move, game_state.get_player_moves())
+        self.assertEqual(ponderer.stats.hits, 1)
+        self.assertGreater(ponderer.stats.seconds_saved, 0)
+
+    def test_invalid_mode(self):
+        self.assertRaises(ValueError, Ponderer, ComputerPlayer("HAL2000"), "random")
+
+    def test_game_manager(self):
+        """ The GameManager ponders for its ComputerPlayer and stops at the end of the game"""
+        player = ComputerPlayer("HAL2000")
+        manager = GameManager(player, ponder="predicted", time_limit_ms=20)
+        manager.game = GameBoard(4, 4, player, MCTSPlayer("HAL9000", iterations=50, time_limit_ms=None))
+        manager.game.active_player = player
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.play_game()
+        self.assertTrue(manager.game.terminal_test())
+        self.assertIs(manager.ponderer.player, player)
+        self.assertIsNone(manager.ponderer._thread)
+        self.assertGreater(manager.ponderer.stats.ponders, 0)
+
+
+class TestPonderJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.store = SessionStore(opening_books=False)
+        self.jobs = JobManager(self.store, workers=1, max_queue=3, ponder=True)
+
+    def tearDown(self):
+        self.jobs.close()
+
+    def computer_move(self, session):
+        job = self.jobs.wait(self.jobs.submit(session, time_limit_ms=200).job_id, 10)
+        self.assertEqual(job.status, DONE)
+        self.assertGreater(len(job.principal_variation), 1)
+        return job
+
+    def test_ponder_hit(self):
+        """ The ponder job of the predicted reply becomes the job of the next computer move"""
+        session = self.store.create("standard", human_first=False)
+        job = self.computer_move(session)
+        ponder_job = self.jobs._ponder_jobs[session.game_id]
+        time.sleep(0.3)
+        session.human_move(job.principal_variation[1])
+        job = self.jobs.submit(session, time_limit_ms=200)
+        self.assertIs(job, ponder_job)
+        self.assertIs(self.jobs.wait(job.job_id, 10), job)
+        self.assertEqual(job.status, DONE)
+        self.assertEqual(session.to_dict()["positions"]["computer"], job.move)
+        stats = self.jobs.ponder_stats.to_dict()
+        self.assertEqual((stats["ponders"], stats["hits"]), (1, 1))
+        self.assertGreaterEqual(stats["seconds_saved"], 0.3)
+
+    def test_ponder_miss(self):
+        """ Another reply cancels the ponder job"""
+        session = self.store.create("standard", human_first=False)
+        job = self.computer_move(session)
+        ponder_job = self.jobs._ponder_jobs[session.game_id]
+        reply = next(move for move in session.board.get_player_moves() if move != job.principal_variation[1])
+        session.human_move(reply)
+        job = self.jobs.wait(self.jobs.submit(session, time_limit_ms=200).job_id, 10)
+        self.assertIsNot(job, ponder_job)
+        self.assertEqual(job.status, DONE)
+        self.assertTrue(ponder_job.done_event.wait(10))
+        self.assertEqual(ponder_job.status, CANCELLED)
+        self.assertIsNone(ponder_job.move)
+        self.assertEqual(self.jobs.ponder_stats.to_dict()["hits"], 0)
+
+    def test_computer_moves_come_first(self):
+        """ A ponder job gives way to the computer move of another game"""
+        session = self.store.create("standard", human_first=False)
+        self.computer_move(session)
+        ponder_job = self.jobs._ponder_jobs[session.game_id]
+        other = self.store.create("standard", human_first=False)
+        self.assertEqual(self.jobs.wait(self.jobs.submit(other, time_limit_ms=200).job_id, 10).status, DONE)
+        self.assertTrue(ponder_job.done_event.wait(10))
+        self.assertEqual(ponder_job.status, CANCELLED)
+        self.assertNotIn(session.game_id, self.jobs._ponder_jobs)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import random
+import tempfile
+import unittest
+from backend.new_game import *
+from backend.records import GameRecord, RecordWriter, read_games, replay, encode_varint, decode_cells
+from backend.sessions import SessionStore
+
+
+def random_game(x_length, y_length, rng, recorder_writer=None):
+    """ Plays a random game, recorded to the writer if one is given, and returns the final board"""
+    game_state = GameBoard(x_length, y_length, "test_pl_1", "test_pl_2")
+    game_state.active_player = rng.choice(["test_pl_1", "test_pl_2"])
+    if recorder_writer is not None:
+        recorder_writer.record(game_state)
+    while not game_state.terminal_test():
+        game_state.make_move(rng.choice(game_state.get_player_moves()))
+    return game_state
+
+
+class TestRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.rec")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_varints(self):
+        """ Cells up to 127 take one byte, larger cells two, and decode to the same cells"""
+        self.assertEqual(encode_varint(5), b"\x05")
+        self.assertEqual(encode_varint(200), b"\xc8\x01")
+        cells = [0, 126, 127, 200, 255]
+        self.assertEqual(decode_cells(b"".join(encode_varint(cell + 1) for cell in cells)), cells)
+        self.assertEqual(decode_cells(bytes([1, 5, 20])), [0, 4, 19])
+
+    def test_write_and_read(self):
+        """ The games come back in order, also from small chunks and boards with more than 127 cells"""
+        rng = random.Random(17)
+        records = [GameRecord(16, 16, 1, [255, 0, 17, 128, 254]), GameRecord(5, 5, 0, [12, 0, 6])]
+        records += [GameRecord(8, 6, rng.randint(0, 1), rng.sample(range(48), rng.randint(1, 48))) for _ in range(50)]
+        with RecordWriter(self.path) as writer:
+            for record in records[:10]:
+                writer.write_game(record)
+        # Games are appended to an existing file
+        with RecordWriter(self.path) as writer:
+            for record in records[10:]:
+                writer.write_game(record)
+
+        self.assertEqual(list(read_games(self.path)), records)
+        self.assertEqual(list(read_games(self.path, chunk_size=7)), records)
+        # A move takes one byte on the standard board
+        self.assertEqual(len(records[2].to_bytes()), 3 + len(records[2].cells) + 1)
+
+    def test_invalid_files(self):
+        """ A file of another format, or with a truncated last game, is refused"""
+        with open(self.path, "wb") as file:
+            file.write(b"not a record file")
+        self.assertRaises(ValueError, list, read_games(self.path))
+        self.assertRaises(ValueError, RecordWriter, self.path)
+
+        os.remove(self.path)
+        with RecordWriter(self.path) as writer:
+            writer.write_game(GameRecord(5, 5, 0, [12, 0, 6]))
+        with open(self.path, "ab") as file:
+            file.write(bytes([5, 5, 0, 13]))
+        games = read_games(self.path)
+        self.assertEqual(next(games), GameRecord(5, 5, 0, [12, 0, 6]))
+        self.assertRaises(ValueError, next, games)
+
+    def test_record_and_replay(self):
+        """ make_move records the games of the boards, replaying a game ends in the same position"""
+        rng = random.Random(17)
+        with RecordWriter(self.path) as writer:
+            boards = [random_game(*rng.choice([(5, 5), (8, 6), (3, 2)]), rng, writer) for _ in range(20)]
+            self.assertEqual(writer.games, 20)
+        self.assertTrue(all(board.recorder is None for board in boards))
+
+        for board, record in zip(boards, read_games(self.path)):
+            positions = list(board.clone() for board in replay(record, "test_pl_1", "test_pl_2"))
+            self.assertEqual(len(positions), len(record.cells) + 1)
+            self.assertEqual(positions[0].count_blanc(), record.x_length * record.y_length)
+            self.assertEqual(positions[-1].zobrist_hash(), board.zobrist_hash())
+            self.assertTrue(positions[-1].terminal_test())
+
+        self.assertRaises(ValueError, list, replay(GameRecord(5, 5, 0, [12, 12])))
+
+    def test_recorder(self):
+        """ Only boards at the start are recorded, the search clones aren't, abandoned games are written by finish"""
+        with RecordWriter(self.path) as writer:
+            game_state = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+            game_state.active_player = "test_pl_2"
+            recorder = writer.record(game_state)
+            game_state.make_move([2, 2])
+            game_state.clone().make_move([0, 0])
+            game_state.make_move([0, 0])
+            self.assertIsNone(game_state.clone().recorder)
+            self.assertRaises(ValueError, writer.record, game_state)
+            recorder.finish()
+            recorder.finish()
+            game_state.make_move([1, 1])
+        self.assertEqual(list(read_games(self.path)), [GameRecord(5, 5, 1, [12, 0])])
+
+    def test_sessions(self):
+        """ The games of a session store are recorded when they're over or deleted"""
+        with RecordWriter(self.path) as writer:
+            store = SessionStore(opening_books=False, records=writer)
+            session = store.create("medium", human_first=True)
+            session.human_move([2, 2])
+            session.computer_move(depth=1)
+            store.delete(session.game_id)
+            self.assertEqual(writer.games, 1)
+        record = next(read_games(self.path))
+        self.assertEqual((record.x_length, record.first_slot, record.cells[0]), (5, 0, 12))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from backend.sessions import SessionStore, GameNotFound, TurnError, SESSION_BYTES
+
+
+class FakeClock:
+    """ A clock that only moves when the test moves it """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSessionStore(unittest.TestCase):
+
+    def test_play_a_game(self):
+        """ Moves of both players are made on the stored board, out of turn moves are refused"""
+        store = SessionStore()
+        session = store.create("medium", human_first=True, player_name="Frank")
+        self.assertIs(store.get(session.game_id), session)
+        self.assertEqual(len(session.to_dict()["legal_moves"]), 25)
+
+        self.assertRaises(TurnError, session.computer_move, 2)
+        self.assertRaises(ValueError, session.human_move, [5, 5])
+        session.human_move([2, 2])
+        self.assertRaises(TurnError, session.human_move, [0, 0])
+        move = session.computer_move(2)
+        state = session.to_dict()
+        self.assertEqual(state["positions"], {"human": [2, 2], "computer": move})
+        self.assertEqual(sorted(state["blocked"]), sorted([[2, 2], move]))
+        self.assertEqual(state["active"], "human")
+
+        while not state["game_over"]:
+            if state["active"] == "human":
+                session.human_move(state["legal_moves"][0])
+            else:
+                session.computer_move(2)
+            state = session.to_dict()
+        self.assertIn(state["winner"], ["human", "computer"])
+        self.assertRaises(TurnError, session.human_move, [0, 0])
+
+    def test_invalid_board(self):
+        """ Boards are one of the named sizes or fit in 16 by 16"""
+        store = SessionStore()
+        self.assertRaises(ValueError, store.create, "huge")
+        self.assertRaises(ValueError, store.create, (17, 4))
+        self.assertEqual(store.create((7, 4)).to_dict()["width"], 7)
+
+    def test_lru_eviction(self):
+        """ The least recently used game is evicted when there are too many games"""
+        store = SessionStore(max_games=2)
+        first, second = store.create("small"), store.create("small")
+        store.get(first.game_id)
+        third = store.create("small")
+        self.assertRaises(GameNotFound, store.get, second.game_id)
+        self.assertIs(store.get(first.game_id), first)
+        self.assertIs(store.get(third.game_id), third)
+        self.assertEqual(store.stats()["evictions"]["lru"], 1)
+
+    def test_ttl_eviction(self):
+        """ Games that aren't used for ttl_seconds are evicted"""
+        clock = FakeClock()
+        store = SessionStore(ttl_seconds=60, clock=clock)
+        first = store.create("small")
+        clock.now = 30
+        second = store.create("small")
+        clock.now = 70
+        self.assertRaises(GameNotFound, store.get, first.game_id)
+        self.assertIs(store.get(second.game_id), second)
+        clock.now = 120
+        self.assertIs(store.get(second.game_id), second)
+        self.assertEqual(store.stats(), {"games": 1, "bytes": SESSION_BYTES,
+                                         "evictions": {"ttl": 1, "lru": 0, "memory": 0}})
+
+    def test_memory_eviction(self):
+        """ A game whose transposition table grows pushes the least recently used games out"""
+        store = SessionStore(max_bytes=3 * SESSION_BYTES, opening_books=False)
+        sessions = [store.create("medium", human_first=False) for _ in range(3)]
+        self.assertEqual(len(store), 3)
+        sessions[2].computer_move(3)
+        store.update(sessions[2])
+        self.assertLess(len(store), 3)
+        self.assertIs(store.get(sessions[2].game_id), sessions[2])
+        self.assertGreater(store.stats()["evictions"]["memory"], 0)
+
+    def test_delete(self):
+        """ A deleted game is gone and frees its memory"""
+        store = SessionStore()
+        session = store.create("small")
+        store.delete(session.game_id)
+        self.assertRaises(GameNotFound, store.get, session.game_id)
+        self.assertRaises(GameNotFound, store.delete, session.game_id)
+        self.assertEqual(store.stats()["bytes"], 0)
+
+    def test_opening_books(self):
+        """ The computer players of boards with an opening book use it, unless the store turns the books off"""
+        self.assertIsNotNone(SessionStore().create("medium").computer_player.opening_book)
+        self.assertIsNone(SessionStore().create("small").computer_player.opening_book)
+        self.assertIsNone(SessionStore(opening_books=False).create("medium").computer_player.opening_book)
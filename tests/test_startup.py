@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(code, modules):
+    """
+    Returns: The modules of the list that are loaded after running the code in a new interpreter
+    """
+    check = f"{code}\nimport sys\nprint(','.join(name for name in {modules!r} if name in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return [name for name in output.strip().split(",") if name]
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_engine_imports(self):
+        """ The engine and the modules the worker processes import load neither the web app, the process pools nor
+        the console game"""
+        heavy = ["flask", "multiprocessing", "concurrent.futures", "argparse", "backend.manager"]
+        for module in ("backend.new_game", "backend.mcts", "backend.parallel", "backend.tournament"):
+            self.assertEqual(loaded_modules(f"import {module}", heavy), [], module)
+
+    def test_engine_leaves_out_the_endgame_solver(self):
+        """ The endgame solver is only loaded by the modules that create one"""
+        self.assertEqual(loaded_modules("import backend.new_game", ["backend.endgame"]), [])
+
+    def test_game_manager_is_lazy(self):
+        """ The GameManager of backend.new_game is loaded on first use"""
+        code = "import backend.new_game as new_game\nassert new_game.GameManager.__module__ == 'backend.manager'"
+        self.assertEqual(loaded_modules(code, ["backend.manager"]), ["backend.manager"])
+
+
+if __name__ == '__main__':
+    unittest.main()
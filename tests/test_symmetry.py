@@ -0,0 +1,77 @@
+import unittest
+from backend.new_game import *
+from test_book import mirrored
+
+
+class TestSymmetries(unittest.TestCase):
+
+    def create_game(self):
+        game_state = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+        game_state.active_player = "test_pl_1"
+        for move in [[0, 1], [3, 3], [2, 1]]:
+            game_state.make_move(move)
+        return game_state
+
+    def test_symmetry_tables(self):
+        """ Square boards have eight symmetries, other boards four, and every symmetry is a permutation"""
+        self.assertEqual(len(symmetries(5, 5)), 8)
+        self.assertEqual(len(symmetries(8, 6)), 4)
+        for permutation, inverse in symmetries(8, 6) + symmetries(5, 5):
+            self.assertEqual(sorted(permutation), list(range(len(permutation))))
+            self.assertEqual([inverse[cell] for cell in permutation], list(range(len(permutation))))
+        # The left-right mirror image of the top left cell is the top right cell
+        self.assertEqual(symmetries(8, 6)[1][0][0], 7)
+
+    def test_canonical_hash(self):
+        """ Mirror images and rotations share their canonical hash, the hash of the identity is the Zobrist hash"""
+        game_state = self.create_game()
+        self.assertEqual(game_state.symmetric_hashes()[0], game_state.zobrist_hash())
+        key, symmetry = game_state.canonical_hash()
+        self.assertEqual(key, min(game_state.symmetric_hashes()))
+        for index in range(8):
+            self.assertEqual(mirrored(game_state, "test_pl_1", "test_pl_2", index).canonical_hash()[0], key)
+        game_state.make_move([1, 1])
+        self.assertNotEqual(game_state.canonical_hash()[0], key)
+
+    def test_canonical_moves(self):
+        """ A move mapped to the canonical form is the move in the canonical position, and maps back"""
+        game_state = self.create_game()
+        _, symmetry = game_state.canonical_hash()
+        canonical_state = mirrored(game_state, "test_pl_1", "test_pl_2", symmetry)
+        for move in game_state.get_player_moves():
+            canonical_move = game_state.to_canonical_move(move, symmetry)
+            self.assertIn(canonical_move, canonical_state.get_player_moves())
+            self.assertEqual(game_state.from_canonical_move(canonical_move, symmetry), move)
+
+    def test_unique_moves(self):
+        """ Only moves to different positions are left: an eighth of a square board, a quarter of the others"""
+        self.assertEqual(len(GameBoard(5, 5, "test_pl_1", "test_pl_2").unique_moves(
+            GameBoard(5, 5, "test_pl_1", "test_pl_2").get_all_blanc())), 6)
+        game_state = GameBoard(8, 6, "test_pl_1", "test_pl_2")
+        self.assertEqual(game_state.unique_moves(game_state.get_all_blanc()), [[0, 0], [0, 1], [0, 2], [0, 3],
+                                                                                 [1, 0], [1, 1], [1, 2], [1, 3],
+                                                                                 [2, 0], [2, 1], [2, 2], [2, 3]])
+        # The center of the 5x5 board keeps the symmetry of the board for the second player
+        game_state = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+        game_state.active_player = "test_pl_1"
+        game_state.make_move([2, 2])
+        self.assertEqual(game_state.unique_moves(game_state.get_player_moves()),
+                         [[0, 0], [0, 1], [0, 2], [1, 1], [1, 2]])
+        # Without symmetry all moves stay
+        game_state = self.create_game()
+        self.assertEqual(game_state.unique_moves(game_state.get_player_moves()), game_state.get_player_moves())
+
+    def test_search_result_unchanged(self):
+        """ Pruning the symmetric root moves gives the same move and value with fewer nodes"""
+        results = []
+        for prune in (False, True):
+            computer_player = ComputerPlayer("HAL2000")
+            computer_player.prune_symmetric_moves = prune
+            game_state = GameBoard(5, 5, computer_player, HumanPlayer("Frank"))
+            game_state.active_player = computer_player
+            move = computer_player.alpha_beta_search(game_state, 3)
+            results.append((move, computer_player.best_score, computer_player.nodes_searched,
+                            computer_player.minimax_decision(game_state, 2)))
+        self.assertEqual(results[0][:2], results[1][:2])
+        self.assertEqual(results[0][3], results[1][3])
+        self.assertLess(results[1][2], results[0][2])
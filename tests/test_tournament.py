@@ -0,0 +1,65 @@
+import unittest
+from backend.new_game import *
+from backend.tournament import PlayerConfig, play_game, run_tournament, schedule, wilson_interval, format_report
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_player_config(self):
+        """ A configuration is parsed from the command line and checked"""
+        config = PlayerConfig.parse("ab4:algorithm=alpha_beta,depth=4,heuristic=aggressive,endgame=true")
+        self.assertEqual((config.name, config.algorithm, config.depth, config.heuristic, config.endgame),
+                         ("ab4", "alpha_beta", 4, "aggressive", True))
+        self.assertIsInstance(config.create_player(5, 5), ComputerPlayer)
+        with self.assertRaises(ValueError):
+            PlayerConfig.parse("ab:algorithm=alpha_beta")
+        with self.assertRaises(ValueError):
+            PlayerConfig.parse("id:time_limit_ms=50,speed=1")
+        with self.assertRaises(ValueError):
+            PlayerConfig("id", heuristic="unknown", time_limit_ms=50)
+
+    def test_wilson_interval(self):
+        """ The interval holds the win rate, stays between 0 and 1 and narrows with more games"""
+        lower, upper = wilson_interval(7, 10)
+        self.assertLess(lower, 0.7)
+        self.assertGreater(upper, 0.7)
+        self.assertEqual(wilson_interval(10, 10)[1], 1.0)
+        self.assertEqual(wilson_interval(0, 10)[0], 0.0)
+        self.assertLess(wilson_interval(700, 1000)[1] - wilson_interval(700, 1000)[0], upper - lower)
+
+    def test_schedule(self):
+        """ Every pair plays every opening twice, with the sides swapped"""
+        configs = [PlayerConfig(name, depth=1) for name in ("a", "b", "c")]
+        tasks = schedule(configs, 4, 5, 5, 2, 0)
+        self.assertEqual(len(tasks), 12)
+        for first, second in zip(tasks[::2], tasks[1::2]):
+            self.assertEqual((first[0], first[1]), (second[1], second[0]))
+            self.assertEqual(first[5], second[5])
+
+    def test_play_game(self):
+        """ A game is played to the end, the same seed plays the same game"""
+        minimax = PlayerConfig("minimax", "minimax", depth=2)
+        alpha_beta = PlayerConfig("alpha_beta", "alpha_beta", depth=3)
+        result = play_game(minimax, alpha_beta, 5, 5, 2, 42)
+        self.assertIn(result["winner"], ("minimax", "alpha_beta"))
+        self.assertEqual(result["plies"], 2 + sum(result["moves"]))
+        self.assertEqual(play_game(minimax, alpha_beta, 5, 5, 2, 42)["plies"], result["plies"])
+
+    def test_run_tournament(self):
+        """ The summary adds up, in this process and on worker processes"""
+        configs = [PlayerConfig("minimax", "minimax", depth=1), PlayerConfig("alpha_beta", "alpha_beta", depth=2),
+                   PlayerConfig("iterative", depth=2, endgame=True)]
+        for workers in (1, 2):
+            summary = run_tournament(configs, "medium", games=4, workers=workers)
+            self.assertEqual(summary["games"], 12)
+            self.assertEqual(sum(player["wins"] for player in summary["players"].values()), 12)
+            self.assertTrue(all(player["games"] == 8 for player in summary["players"].values()))
+            self.assertEqual(summary["pairs"]["minimax"]["alpha_beta"] + summary["pairs"]["alpha_beta"]["minimax"], 4)
+            self.assertGreater(summary["games_per_second"], 0)
+        self.assertIn("games/s", format_report(summary))
+        with self.assertRaises(ValueError):
+            run_tournament([configs[0], configs[0]], workers=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import contextlib
+import io
+import json
+import unittest
+from backend.new_game import *
+from backend.tracing import SearchTracer, StatisticsTracer
+
+
+class TestSearchTracing(unittest.TestCase):
+
+    def create_game(self, computer_player):
+        human_player = HumanPlayer("Frank")
+        game_state = GameBoard(5, 5, human_player, computer_player)
+        game_state.active_player = computer_player
+        game_state.positions[human_player] = [0, 0]
+        game_state.positions[computer_player] = [2, 2]
+        for position in [[0, 0], [2, 2], [1, 3], [3, 1]]:
+            game_state.block_cell(position)
+        return game_state
+
+    def test_searches_are_silent(self):
+        """ The searches don't write to stdout, with or without a tracer"""
+        for tracer in [None, SearchTracer(), StatisticsTracer()]:
+            computer_player = ComputerPlayer("HAL2000", tracer=tracer)
+            game_state = self.create_game(computer_player)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                computer_player.minimax_decision(game_state, 3)
+                computer_player.alpha_beta_search(game_state, 3)
+                computer_player.get_actions(game_state, 3)
+            self.assertEqual(output.getvalue(), "")
+
+    def test_alpha_beta_statistics(self):
+        """ The collected nodes and cutoffs add up and the node count equals the count of the player"""
+        tracer = StatisticsTracer()
+        computer_player = ComputerPlayer("HAL2000", tracer=tracer)
+        game_state = self.create_game(computer_player)
+        computer_player.nodes_searched = 0
+        move = computer_player.alpha_beta_search(game_state, 4)
+
+        self.assertEqual(len(tracer.searches), 1)
+        search = tracer.searches[0]
+        self.assertEqual(search["algorithm"], "alpha_beta")
+        self.assertEqual(search["move"], move)
+        self.assertEqual(search["nodes"], computer_player.nodes_searched)
+        # The root isn't a node of the helpers, the search reaches ply 4
+        self.assertEqual(len(search["nodes_per_ply"]), 5)
+        self.assertEqual(search["nodes_per_ply"][0], 0)
+        # The position is symmetric along its diagonal, the mirrored root moves aren't searched. A root move that
+        # beats the null window of the principal variation search is searched again
+        root_moves = len(game_state.unique_moves(game_state.get_player_moves()))
+        self.assertGreaterEqual(search["nodes_per_ply"][1], root_moves)
+        self.assertLessEqual(search["nodes_per_ply"][1], root_moves + computer_player.researches)
+        self.assertGreater(search["cutoffs"], 0)
+        self.assertLessEqual(search["first_move_cutoffs"], search["cutoffs"])
+        self.assertGreater(search["branching_factor"], 1)
+        self.assertEqual(search["principal_variation"][0], move)
+        self.assertEqual(game_state.undo_count(), 0)
+
+    def test_iterative_deepening_statistics(self):
+        """ Iterative deepening is traced as one search with an entry per depth"""
+        tracer = StatisticsTracer()
+        computer_player = ComputerPlayer("HAL2000", tracer=tracer)
+        game_state = self.create_game(computer_player)
+        move = computer_player.get_actions(game_state, 3)
+
+        self.assertEqual(len(tracer.searches), 1)
+        search = tracer.searches[0]
+        self.assertEqual(search["algorithm"], "iterative_deepening")
+        self.assertEqual([iteration["depth"] for iteration in search["iterations"]], [1, 2, 3])
+        self.assertEqual(sum(iteration["nodes"] for iteration in search["iterations"]), search["nodes"])
+        self.assertEqual(search["iterations"][-1]["principal_variation"], computer_player.principal_variation)
+        self.assertEqual(search["move"], move)
+        self.assertFalse(search["timed_out"])
+
+    def test_timeout_closes_search(self):
+        """ A search that runs out of time is still recorded, and the next search is recorded on its own"""
+        tracer = StatisticsTracer()
+        computer_player = ComputerPlayer("HAL2000", tracer=tracer)
+        game_state = GameBoard(8, 6, computer_player, HumanPlayer("Frank"))
+        game_state.active_player = computer_player
+        computer_player.get_actions(game_state, time_limit_ms=1)
+        computer_player.get_actions(game_state, 1)
+
+        self.assertEqual(len(tracer.searches), 2)
+        self.assertTrue(tracer.searches[0]["timed_out"])
+        self.assertEqual(len(tracer.searches[1]["iterations"]), 1)
+
+    def test_json_export(self):
+        """ Every move is exported as a JSON object, won and lost scores included"""
+        tracer = StatisticsTracer()
+        computer_player = ComputerPlayer("HAL2000", tracer=tracer)
+        game_state = self.create_game(computer_player)
+        computer_player.minimax_decision(game_state, 2)
+        # A small board is searched to the end of the game
+        game_state = GameBoard(3, 2, computer_player, HumanPlayer("Frank"))
+        game_state.active_player = computer_player
+        game_state.make_move([0, 0])
+        game_state.make_move([1, 2])
+        computer_player.get_actions(game_state, 10)
+
+        exported = json.loads(tracer.to_json())
+        self.assertIn(exported["score"], ["inf", "-inf"])
+        self.assertEqual(exported["nodes_per_ply"], tracer.searches[-1]["nodes_per_ply"])
+
+        output = io.StringIO()
+        tracer.dump(output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual([json.loads(line)["algorithm"] for line in lines], ["minimax", "iterative_deepening"])
@@ -0,0 +1,128 @@
+import random
+import unittest
+from backend.new_game import *
+from backend.transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+
+class TestZobristHash(unittest.TestCase):
+
+    def rebuild(self, board):
+        """ Build the same position from scratch on a new board """
+        rebuilt_board = GameBoard(board._board_width, board._board_height, board.player_1, board.player_2)
+        for position in board.moves_from_mask(board._board):
+            rebuilt_board.block_cell(position)
+        rebuilt_board.positions = dict(board.positions)
+        rebuilt_board.active_player = board.active_player
+        return rebuilt_board
+
+    def test_incremental_hash_matches_rebuilt_board(self):
+        """ The hash kept up to date by make_move equals the hash of the same position built from scratch"""
+        rng = random.Random(3)
+        for _ in range(20):
+            board = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+            while not board.terminal_test():
+                board.make_move(rng.choice(board.get_legal_moves(board.positions[board.active_player])))
+                self.assertEqual(board.zobrist_hash(), self.rebuild(board).zobrist_hash())
+
+    def test_transpositions_have_the_same_hash(self):
+        """ The same position reached through a different move order has the same hash"""
+        board_1 = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+        board_1.active_player = board_1.player_1
+        board_2 = board_1.clone()
+        for move in [[0, 2], [4, 4], [2, 2], [4, 0], [2, 4]]:
+            board_1.make_move(move)
+        for move in [[2, 2], [4, 4], [0, 2], [4, 0], [2, 4]]:
+            board_2.make_move(move)
+
+        self.assertEqual(board_1.positions, board_2.positions)
+        self.assertEqual(board_1.zobrist_hash(), board_2.zobrist_hash())
+
+    def test_side_to_move_and_positions_change_the_hash(self):
+        """ Same blocked cells but another player to move, or players swapped, is another position"""
+        board = GameBoard(5, 5, "test_pl_1", "test_pl_2")
+        board.active_player = board.player_1
+        board.make_move([0, 0])
+        board.make_move([4, 4])
+        zobrist_hash = board.zobrist_hash()
+
+        board.change_initiative()
+        self.assertNotEqual(board.zobrist_hash(), zobrist_hash)
+        board.change_initiative()
+        board.positions = {board.player_1: [4, 4], board.player_2: [0, 0]}
+        self.assertNotEqual(board.zobrist_hash(), zobrist_hash)
+
+    def test_undo_restores_hash(self):
+        """ undo_move brings back the hash of the position before the move"""
+        board = GameBoard(8, 6, "test_pl_1", "test_pl_2")
+        hashes = []
+        for move in [[0, 0], [5, 7], [0, 5], [3, 7]]:
+            hashes.append(board.zobrist_hash())
+            board.apply_move(move)
+        while hashes:
+            board.undo_move()
+            self.assertEqual(board.zobrist_hash(), hashes.pop())
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_counters(self):
+        """ Probing counts hits, misses and collisions"""
+        table = TranspositionTable(size=4)
+        self.assertIsNone(table.probe(1))
+        table.store(1, 2, 10, EXACT, [0, 0])
+        self.assertEqual(table.probe(1).value, 10)
+        # Key 5 maps to the same slot as key 1
+        self.assertIsNone(table.probe(5))
+
+        self.assertEqual(table.stats()["hits"], 1)
+        self.assertEqual(table.stats()["misses"], 2)
+        self.assertEqual(table.stats()["collisions"], 1)
+
+    def test_replacement_policy(self):
+        """ A deeper entry of the current search is kept, entries of an earlier search are replaced"""
+        table = TranspositionTable(size=4)
+        table.store(1, 5, 10, LOWER)
+        table.store(5, 2, 20, UPPER)
+        self.assertEqual(table.probe(1).value, 10)
+
+        table.store(5, 6, 30, EXACT)
+        self.assertEqual(table.probe(5).value, 30)
+
+        table.new_search()
+        table.store(1, 1, 40, EXACT)
+        self.assertEqual(table.probe(1).value, 40)
+        self.assertEqual(len(table), 1)
+
+    def test_table_is_bounded(self):
+        """ The table never holds more positions than it has slots"""
+        table = TranspositionTable(size=8)
+        for key in range(100):
+            table.store(key, 1, key, EXACT)
+        self.assertEqual(len(table), 8)
+        self.assertRaises(ValueError, TranspositionTable, 0)
+
+
+class TestSearchWithTranspositionTable(unittest.TestCase):
+
+    def create_game(self, computer_player):
+        human_player = HumanPlayer("Frank")
+        game_state = GameBoard(5, 5, computer_player, human_player)
+        game_state.active_player = computer_player
+        game_state.positions[game_state.player_1] = [2, 3]
+        game_state.positions[game_state.player_2] = [4, 1]
+        for position in [[1, 0], [2, 1], [1, 1], [0, 1], [2, 3], [4, 1]]:
+            game_state.block_cell(position)
+        return game_state
+
+    def test_minimax_finds_transpositions(self):
+        """ A depth 5 minimax search reaches positions through different move orders and reuses them"""
+        computer_player = ComputerPlayer("HAL2000")
+        move = computer_player.minimax_decision(self.create_game(computer_player), depth=5)
+
+        stats = computer_player.transposition_table.stats()
+        self.assertGreater(stats["hits"], 0)
+        self.assertGreater(stats["stores"], 0)
+
+        # A search with a table too small to be of use finds the same move
+        other_player = ComputerPlayer("HAL2000", transposition_table=TranspositionTable(size=1))
+        self.assertEqual(other_player.minimax_decision(self.create_game(other_player), depth=5), move)